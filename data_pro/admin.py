@@ -17,6 +17,12 @@ from data_pro.models.vehicles import *
 from data_pro.models.transports import *
 from data_pro.models.AdminAuditLog import *
 from data_pro.models.office import *
+from data_pro.models.outbox import *
+from data_pro.models.client_stats import *
+from data_pro.models.jobs import *
+from data_pro.models.sequences import *
+from data_pro.models.superuser import *
+from data_pro.utils.pagination import EstimatedCountPaginator
 
 class CustomAdminSite(admin.AdminSite):
     site_header = 'Data-Pro Administration'
@@ -38,7 +44,7 @@ class CustomAdminSite(admin.AdminSite):
             'title': 'System Analytics',
             'stats': {
                 'clients': Client.objects.count(),
-                'customers': Customer.objects.count(),
+                'customers': ClientStats.for_client(None)['customers'],
                 'invoices': Invoice.objects.filter(status='pending').count(),
             }
         }
@@ -54,6 +60,23 @@ class CustomAdminSite(admin.AdminSite):
 
 admin_site = CustomAdminSite(name='system_admin')
 
+class LargeTableMixin:
+    """
+    Changelist settings for tables that grow with the customer base: no
+    second, unfiltered COUNT(*) and estimated page counts on PostgreSQL.
+    """
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+
+class CustomerLinkMixin:
+    """``customer_link`` column, with the customer joined into the changelist query"""
+    list_select_related = ('customer',)
+
+    def customer_link(self, obj):
+        url = reverse('system_admin:data_pro_customer_change', args=[obj.customer_id])
+        return format_html('<a href="{}">{}</a>', url, f"{obj.customer.first_name} {obj.customer.last_name}")
+    customer_link.short_description = 'Customer'
+
 class ClientInline(admin.StackedInline):
     model = Client
     can_delete = False
@@ -90,26 +113,33 @@ class CustomUserAdmin(BaseUserAdmin):
         'get_client_account'
     )
     list_filter = ('is_staff', 'is_superuser', 'is_active')
-    
+
+    def _client_account(self, obj):
+        # One lookup shared by the three client columns
+        return getattr(obj, 'client_account', None)
+
     def get_user_type(self, obj):
-        if hasattr(obj, 'client_account'):
-            return obj.client_account.get_user_type_display()
+        account = self._client_account(obj)
+        if account is not None:
+            return account.get_user_type_display()
         return _("N/A")
     get_user_type.short_description = _('User Type')
     
     def get_client_status(self, obj):
-        if hasattr(obj, 'client_account'):
-            return obj.client_account.get_status_display()
+        account = self._client_account(obj)
+        if account is not None:
+            return account.get_status_display()
         return _("N/A")
     get_client_status.short_description = _('Client Status')
     
     def get_client_account(self, obj):
-        if hasattr(obj, 'client_account'):
-            url = reverse('admin:data_pro_client_change', args=[obj.client_account.id])
+        account = self._client_account(obj)
+        if account is not None:
+            url = reverse('system_admin:data_pro_client_change', args=[account.id])
             return format_html(
                 '<a href="{}">{}</a>',
                 url,
-                obj.client_account.company_name
+                account.company_name
             )
         return "-"
     get_client_account.short_description = _('Client Organization')
@@ -145,8 +175,9 @@ class ClientAdmin(admin.ModelAdmin):
     )
 
 @admin.register(Customer, site=admin_site)
-class CustomerAdmin(admin.ModelAdmin):
+class CustomerAdmin(LargeTableMixin, admin.ModelAdmin):
     list_display = ('full_name', 'email', 'phone', 'client', 'status', 'created_at')
+    list_select_related = ('client',)
     list_filter = ('status', 'client', 'created_at')
     search_fields = ('first_name', 'last_name', 'email', 'phone')
     readonly_fields = ('created_at', 'updated_at')
@@ -183,26 +214,16 @@ class CustomerAdmin(admin.ModelAdmin):
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
 @admin.register(Invoice, site=admin_site)
-class InvoiceAdmin(admin.ModelAdmin):
+class InvoiceAdmin(LargeTableMixin, CustomerLinkMixin, admin.ModelAdmin):
     list_display = ('invoice_number', 'customer_link', 'amount', 'issue_date')
     list_filter = ('issue_date',)
     search_fields = ('invoice_number', 'customer__first_name', 'customer__last_name')
-    
-    def customer_link(self, obj):
-        url = reverse('system_admin:data_pro_customer_change', args=[obj.customer.id])
-        return format_html('<a href="{}">{}</a>', url, f"{obj.customer.first_name} {obj.customer.last_name}")
-    customer_link.short_description = 'Customer'
 
 @admin.register(TransportService, site=admin_site)
-class TransportServiceAdmin(admin.ModelAdmin):
+class TransportServiceAdmin(LargeTableMixin, CustomerLinkMixin, admin.ModelAdmin):
     list_display = ('id', 'customer_link', 'origin', 'destination', 'status')
     list_filter = ('status',)
     search_fields = ('customer__first_name', 'customer__last_name', 'origin')
-    
-    def customer_link(self, obj):
-        url = reverse('system_admin:data_pro_customer_change', args=[obj.customer.id])
-        return format_html('<a href="{}">{}</a>', url, f"{obj.customer.first_name} {obj.customer.last_name}")
-    customer_link.short_description = 'Customer'
 
 @admin.register(Vehicle, site=admin_site)
 class VehicleAdmin(admin.ModelAdmin):
@@ -210,25 +231,15 @@ class VehicleAdmin(admin.ModelAdmin):
     search_fields = ('make', 'model', 'license_plate')
 
 @admin.register(Visa, site=admin_site)
-class VisaAdmin(admin.ModelAdmin):
+class VisaAdmin(LargeTableMixin, CustomerLinkMixin, admin.ModelAdmin):
     list_display = ('visa_number', 'customer_link', 'issuing_country', 'status', 'expiry_date')
     list_filter = ('status', 'issuing_country')
     search_fields = ('visa_number', 'customer__first_name', 'customer__last_name', 'issuing_country')
-    
-    def customer_link(self, obj):
-        url = reverse('system_admin:data_pro_customer_change', args=[obj.customer.id])
-        return format_html('<a href="{}">{}</a>', url, f"{obj.customer.first_name} {obj.customer.last_name}")
-    customer_link.short_description = 'Customer'
 
 @admin.register(Passport, site=admin_site)
-class PassportAdmin(admin.ModelAdmin):
+class PassportAdmin(LargeTableMixin, CustomerLinkMixin, admin.ModelAdmin):
     list_display = ('passport_number', 'customer_link', 'issuing_country', 'expiry_date')
     search_fields = ('passport_number', 'customer__first_name', 'customer__last_name')
-    
-    def customer_link(self, obj):
-        url = reverse('system_admin:data_pro_customer_change', args=[obj.customer.id])
-        return format_html('<a href="{}">{}</a>', url, f"{obj.customer.first_name} {obj.customer.last_name}")
-    customer_link.short_description = 'Customer'
 
 @admin.register(Group, site=admin_site)
 class GroupAdmin(admin.ModelAdmin):
@@ -243,9 +254,84 @@ class OfficeAdmin(admin.ModelAdmin):
     search_fields = ('name', 'email', 'phone')
     ordering = ('name',)
 
-# Unregister and re-register User with our custom admin
-admin.site.unregister(User)
-admin.site.register(User, CustomUserAdmin)
+@admin.register(OutboundEmail, site=admin_site)
+class OutboundEmailAdmin(LargeTableMixin, admin.ModelAdmin):
+    list_display = ('subject', 'status', 'attempts', 'created_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('subject',)
+    readonly_fields = ('attempts', 'last_error', 'sent_at', 'created_at')
+
+@admin.register(BackgroundJob, site=admin_site)
+class BackgroundJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'status', 'initiated_by', 'processed', 'total_records', 'failed', 'created_at', 'completed_at')
+    list_filter = ('status', 'kind')
+    list_select_related = ('initiated_by',)
+    readonly_fields = (
+        'status', 'total_records', 'processed', 'successful', 'failed', 'result', 'error_log',
+        'attempts', 'worker', 'created_at', 'started_at', 'heartbeat_at', 'completed_at',
+    )
+
+@admin.register(ClientStats, site=admin_site)
+class ClientStatsAdmin(admin.ModelAdmin):
+    list_display = ('client', 'customers', 'visas', 'passports', 'transports', 'rebuilt_at', 'updated_at')
+    list_select_related = ('client',)
+    search_fields = ('client__company_name',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+@admin.register(ExpiryBucket, site=admin_site)
+class ExpiryBucketAdmin(admin.ModelAdmin):
+    list_display = ('client', 'kind', 'window_days', 'count', 'scanned_on')
+    list_filter = ('kind', 'window_days')
+    list_select_related = ('client',)
+    search_fields = ('client__company_name',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+@admin.register(Sequence, site=admin_site)
+class SequenceAdmin(admin.ModelAdmin):
+    list_display = ('client', 'name', 'format', 'last_value', 'updated_at')
+    list_filter = ('name',)
+    list_select_related = ('client',)
+    search_fields = ('client__company_name',)
+    readonly_fields = ('last_value',)
+
+    def has_add_permission(self, request):
+        return False
+
+@admin.register(SystemConfiguration, site=admin_site)
+class SystemConfigurationAdmin(admin.ModelAdmin):
+    list_display = ('key', 'config_type', 'value', 'last_modified', 'modified_by')
+    list_filter = ('config_type',)
+    search_fields = ('key', 'description')
+    readonly_fields = ('last_modified', 'modified_by')
+
+    def save_model(self, request, obj, form, change):
+        obj.modified_by = request.user
+        super().save_model(request, obj, form, change)
+
+@admin.register(SystemMaintenanceWindow, site=admin_site)
+class SystemMaintenanceWindowAdmin(admin.ModelAdmin):
+    list_display = ('title', 'start_time', 'end_time', 'is_active', 'created_by')
+    list_filter = ('is_active',)
+    search_fields = ('title', 'description')
+    readonly_fields = ('created_by', 'created_at')
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            obj.created_by = request.user
+        super().save_model(request, obj, form, change)
+
+# Register User with our custom admin on the site that is actually served
+admin_site.register(User, CustomUserAdmin)
 
 admin.site = admin_site
 admin.sites.site = admin_site
\ No newline at end of file
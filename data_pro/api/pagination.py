@@ -0,0 +1,58 @@
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from data_pro.utils.pagination import InvalidCursor, KeysetPaginator, estimated_count, keyset_ordering
+
+
+class OptInCursorPagination(PageNumberPagination):
+    """
+    Page-number pagination by default; requests that pass ``?cursor=``
+    (empty for the first page) get keyset pagination on the view's
+    ``keyset_ordering`` (default: model ordering plus ``id``) instead,
+    with no COUNT(*) unless ``?count=estimate`` or ``?count=exact`` asks.
+    """
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = self.cursor_query_param in request.query_params
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.queryset = queryset
+        ordering = getattr(view, 'keyset_ordering', None) or keyset_ordering(queryset.model)
+        paginator = KeysetPaginator(queryset, ordering, self.get_page_size(request) or self.page_size)
+        try:
+            self.cursor_page = paginator.page(request.query_params[self.cursor_query_param] or None)
+        except InvalidCursor:
+            raise NotFound('Invalid cursor.')
+        return list(self.cursor_page)
+
+    def _cursor_link(self, cursor):
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(remove_query_param(url, self.page_query_param), self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+        body = {
+            'next': self._cursor_link(self.cursor_page.next_cursor),
+            'previous': self._cursor_link(self.cursor_page.previous_cursor),
+        }
+        count_mode = self.request.query_params.get(self.count_query_param)
+        if count_mode == 'exact':
+            body['count'], body['count_exact'] = self.queryset.count(), True
+        elif count_mode == 'estimate':
+            body['count'], body['count_exact'] = estimated_count(self.queryset)
+        body['results'] = data
+        return Response(body)
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        schema['properties']['count_exact'] = {'type': 'boolean'}
+        return schema
@@ -7,9 +7,9 @@ class IsClientAdminOrReadOnly(permissions.BasePermission):
     def has_permission(self, request, view):
         if request.method in permissions.SAFE_METHODS:
             return True
-        return request.user.user_type in ['CLIENT_ADMIN', 'SUPERADMIN']
+        return request.user.is_superuser or getattr(request.user, 'user_type', None) in ['CLIENT_ADMIN', 'SUPERADMIN']
 
     def has_object_permission(self, request, view, obj):
         if request.method in permissions.SAFE_METHODS:
             return True
-        return request.user.user_type in ['CLIENT_ADMIN', 'SUPERADMIN']
\ No newline at end of file
+        return request.user.is_superuser or getattr(request.user, 'user_type', None) in ['CLIENT_ADMIN', 'SUPERADMIN']
\ No newline at end of file
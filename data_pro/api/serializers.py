@@ -1,3 +1,9 @@
+from copy import copy
+from datetime import timedelta
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.utils import timezone
 from rest_framework import serializers
 from data_pro.models.clients import *
 from data_pro.models.invoices import *
@@ -6,6 +12,7 @@ from data_pro.models.customers import *
 from data_pro.models.vehicles import *
 from data_pro.models.visas import *
 from data_pro.models.passports import *
+from data_pro.system.scheduling import VehicleSchedule
 
 class CustomerSerializer(serializers.ModelSerializer):
     class Meta:
@@ -36,4 +43,43 @@ class VehicleSerializer(serializers.ModelSerializer):
 class TransportServiceSerializer(serializers.ModelSerializer):
     class Meta:
         model = TransportService
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+    def validate(self, attrs):
+        # ModelSerializer skips Model.clean(), which rejects double bookings
+        booking = copy(self.instance) if self.instance else TransportService()
+        for field, value in attrs.items():
+            setattr(booking, field, value)
+        try:
+            VehicleSchedule().check(booking)
+        except DjangoValidationError as e:
+            raise serializers.ValidationError(e.message_dict)
+        return attrs
+
+
+class LocationPingSerializer(serializers.Serializer):
+    """One entry of POST /api/transports/pings/"""
+    # Devices with a fast clock must not pin current_location to the future
+    max_clock_skew = timedelta(minutes=5)
+    coordinate_places = Decimal('0.000001')
+
+    service = serializers.IntegerField(min_value=1)
+    recorded_at = serializers.DateTimeField(required=False)
+    # Floats, as GPS fixes come with more decimals than are stored
+    latitude = serializers.FloatField(min_value=-90, max_value=90, required=False)
+    longitude = serializers.FloatField(min_value=-180, max_value=180, required=False)
+    location = serializers.CharField(max_length=255, required=False, allow_blank=True)
+
+    def validate_recorded_at(self, value):
+        if value > timezone.now() + self.max_clock_skew:
+            raise serializers.ValidationError('Timestamp is in the future.')
+        return value
+
+    def validate(self, attrs):
+        if not attrs.get('location') and (attrs.get('latitude') is None or attrs.get('longitude') is None):
+            raise serializers.ValidationError('Give a location or both latitude and longitude.')
+        for field in ('latitude', 'longitude'):
+            if attrs.get(field) is not None:
+                attrs[field] = Decimal(str(attrs[field])).quantize(self.coordinate_places, ROUND_HALF_UP)
+        attrs.setdefault('recorded_at', timezone.now())
+        return attrs
@@ -4,6 +4,8 @@ from rest_framework.routers import DefaultRouter
 from . import views
 
 router = DefaultRouter()
+# Before the customers, whose routes at the root would take 'transports' for a pk
+router.register(r'transports', views.TransportServiceViewSet, basename='transports')
 router.register(r'', views.CustomerViewSet, basename='customers')
 
 # Custom endpoints for customer-related actions
@@ -1,8 +1,11 @@
 # data_pro/api/views.py
-from rest_framework import viewsets, permissions, status
+from rest_framework import viewsets, permissions, serializers, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.db import transaction
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from .pagination import OptInCursorPagination
 from .permissions import IsClientAdminOrReadOnly
 from .serializers import (
     CustomerSerializer,
@@ -10,7 +13,8 @@ from .serializers import (
     PassportSerializer,
     InvoiceSerializer,
     VehicleSerializer,
-    TransportServiceSerializer
+    TransportServiceSerializer,
+    LocationPingSerializer
 )
 from data_pro.models.clients import *
 from data_pro.models.invoices import *
@@ -19,21 +23,33 @@ from data_pro.models.customers import *
 from data_pro.models.vehicles import *
 from data_pro.models.visas import *
 from data_pro.models.passports import *
-import csv
-import io
-from django.http import HttpResponse
+from data_pro.system import tracking
+from data_pro.system.scheduling import VehicleSchedule
+from data_pro.system.jobs import enqueue
+from data_pro.system.reports import CUSTOMER_EXPORT_COLUMNS
+from data_pro.utils.csv_handlers import StreamingCSVExporter, wants_gzip
+from data_pro.views.jobs import job_response
 
 class BaseViewSet(viewsets.ModelViewSet):
     """
     Base ViewSet with common functionality for all models
     """
     permission_classes = [permissions.IsAuthenticated, IsClientAdminOrReadOnly]
-    
+    pagination_class = OptInCursorPagination
+    # Cursor pagination ordering; defaults to the model ordering plus id
+    keyset_ordering = None
+    query_budget = 6
+    # Lookup from the model to its Client; None for models shared by all clients
+    tenant_path = 'client'
+
+    def tenant_filters(self):
+        """Lookups limiting a CLIENT_ADMIN to their client's rows, in a form background jobs can replay"""
+        if self.tenant_path and getattr(self.request.user, 'user_type', None) == 'CLIENT_ADMIN':
+            return {f'{self.tenant_path}_id': self.request.user.client.pk}
+        return {}
+
     def get_queryset(self):
-        qs = super().get_queryset()
-        if self.request.user.user_type == 'CLIENT_ADMIN':
-            qs = qs.filter(created_by__client=self.request.user.client)
-        return qs
+        return super().get_queryset().filter(**self.tenant_filters())
 
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
@@ -68,59 +84,42 @@ class CustomerViewSet(BaseViewSet):
     
     @action(detail=False, methods=['post'])
     def import_csv(self, request):
-        """Handle CSV import of customers"""
+        """Queue a CSV import of customers; small files are imported before this answers"""
         try:
-            csv_file = request.FILES['file']
-            data_set = csv_file.read().decode('UTF-8')
-            io_string = io.StringIO(data_set)
-            next(io_string)  # Skip header
-            
-            for row in csv.reader(io_string):
-                Customer.objects.update_or_create(
-                    email=row[2],
-                    defaults={
-                        'name': row[1],
-                        'phone': row[3],
-                        'client': request.user.client
-                    }
-                )
-            return Response(
-                {'message': 'Customers imported successfully'},
-                status=status.HTTP_201_CREATED
+            job = enqueue(
+                'customer_import', request.user, request.FILES['file'],
+                client_id=None if request.user.is_superuser else request.user.client.pk,
+                batch_size=int(request.data.get('batch_size') or 0) or None,
             )
         except Exception as e:
             return Response(
                 {'error': str(e)},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        return job_response(job, 'Customer import')
 
     @action(detail=False, methods=['get'])
     def export_csv(self, request):
-        """Export customers as CSV"""
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="customers.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['ID', 'Name', 'Email', 'Phone'])
-        
+        """Export customers as CSV; ?background=1 queues it as a job instead"""
+        if request.query_params.get('background'):
+            job = enqueue(
+                'customer_export', request.user, columns='api', filters=self.tenant_filters(),
+                filename='customers.csv', gzip=wants_gzip(request),
+            )
+            return job_response(job, 'Customer export')
         queryset = self.filter_queryset(self.get_queryset())
-        for customer in queryset:
-            writer.writerow([
-                customer.id,
-                customer.name,
-                customer.email,
-                customer.phone
-            ])
-            
-        return response
+        exporter = StreamingCSVExporter(queryset, CUSTOMER_EXPORT_COLUMNS['api'])
+        return exporter.response('customers.csv', compress=wants_gzip(request))
 
 class VisaViewSet(BaseViewSet):
     queryset = Visa.objects.all()
     serializer_class = VisaSerializer
+    tenant_path = 'customer__client'
 
 class PassportViewSet(BaseViewSet):
     queryset = Passport.objects.all()
     serializer_class = PassportSerializer
+    tenant_path = 'customer__client'
 
 class InvoiceViewSet(BaseViewSet):
     queryset = Invoice.objects.all()
@@ -137,6 +136,7 @@ class InvoiceViewSet(BaseViewSet):
 class VehicleViewSet(BaseViewSet):
     queryset = Vehicle.objects.all()
     serializer_class = VehicleSerializer
+    tenant_path = None
     
     @action(detail=True, methods=['post'])
     def maintenance(self, request, pk=None):
@@ -145,9 +145,46 @@ class VehicleViewSet(BaseViewSet):
         vehicle.save()
         return Response({'status': 'maintenance'})
 
+    @action(detail=False, methods=['get'])
+    def available(self, request):
+        """Vehicles free from ?start= to ?end=, optionally of ?type= with at least ?capacity= seats"""
+        span = []
+        for name in ('start', 'end'):
+            value = parse_datetime(request.query_params.get(name, ''))
+            if value is None:
+                return Response(
+                    {'error': f'{name} must be an ISO 8601 date and time'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            span.append(timezone.make_aware(value) if timezone.is_naive(value) else value)
+        start, end = span
+        if end <= start:
+            return Response({'error': 'end must be after start'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            capacity = int(request.query_params.get('capacity') or 0)
+        except ValueError:
+            return Response({'error': 'capacity must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+        vehicles = VehicleSchedule().free_vehicles(
+            start, end, vehicle_type=request.query_params.get('type'), min_capacity=capacity
+        )
+        serializer = self.get_serializer(vehicles, many=True)
+        return Response(serializer.data)
+
 class TransportServiceViewSet(BaseViewSet):
     queryset = TransportService.objects.all()
     serializer_class = TransportServiceSerializer
+    bulk_status_max_ids = 10000
+    pings_max = 5000
+
+    # Validation locks the booked vehicle, so double-booking checks of it run one at a time
+    def create(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return super().create(request, *args, **kwargs)
+
+    def update(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return super().update(request, *args, **kwargs)
     
     @action(detail=False, methods=['get'])
     def active(self, request):
@@ -165,6 +202,78 @@ class TransportServiceViewSet(BaseViewSet):
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['post'])
+    def bulk_status(self, request):
+        """Move many transports to one status: {"ids": [...], "status": "..."}"""
+        ids = request.data.get('ids')
+        new_status = request.data.get('status')
+        if new_status not in dict(TransportService.STATUS_CHOICES):
+            return Response({'error': 'Invalid status'}, status=status.HTTP_400_BAD_REQUEST)
+        if not isinstance(ids, list) or not ids:
+            return Response({'error': 'ids must be a non-empty list'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > self.bulk_status_max_ids:
+            return Response(
+                {'error': f'At most {self.bulk_status_max_ids} ids per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            ids = [int(pk) for pk in ids]
+        except (TypeError, ValueError):
+            return Response({'error': 'ids must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+
+        results = TransportService.bulk_update_status(
+            ids, new_status, self.request.user, queryset=self.get_queryset()
+        )
+        # Bypasses the booking signals
+        VehicleSchedule.invalidate()
+        updated = sum(1 for result, _ in results.values() if result == 'updated')
+        return Response({
+            'status': new_status,
+            'updated': updated,
+            'failed': len(results) - updated,
+            'results': [
+                {'id': pk, 'result': result, 'previous_status': previous}
+                for pk, (result, previous) in results.items()
+            ],
+        })
+
+    @action(detail=False, methods=['post'])
+    def pings(self, request):
+        """
+        Record many location pings: {"pings": [{"service": id, "recorded_at": ...,
+        "latitude": ..., "longitude": ..., "location": ...}, ...]}.
+        Invalid pings are rejected one by one; the rest are stored.
+        """
+        pings = request.data.get('pings')
+        if not isinstance(pings, list) or not pings:
+            return Response({'error': 'pings must be a non-empty list'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(pings) > self.pings_max:
+            return Response(
+                {'error': f'At most {self.pings_max} pings per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        serializer = LocationPingSerializer()
+        valid, positions, rejected = [], [], []
+        for index, ping in enumerate(pings):
+            try:
+                valid.append(serializer.run_validation(ping))
+                positions.append(index)
+            except serializers.ValidationError as e:
+                rejected.append({'index': index, 'errors': e.detail})
+
+        stored, unknown, moved = tracking.ingest(valid, queryset=self.get_queryset())
+        rejected.extend(
+            {'index': positions[index], 'errors': {'service': ['Unknown transport service.']}}
+            for index in unknown
+        )
+        rejected.sort(key=lambda entry: entry['index'])
+        return Response({
+            'accepted': stored,
+            'rejected': rejected,
+            'services_updated': moved,
+        })
+
     @action(detail=True, methods=['post'])
     def track(self, request, pk=None):
         """Update transport's current location"""
@@ -176,7 +285,6 @@ class TransportServiceViewSet(BaseViewSet):
                 {'error': 'Location is required'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-            
-        transport.current_location = location
-        transport.save()
+
+        tracking.ingest([{'service': transport.pk, 'recorded_at': timezone.now(), 'location': location[:255]}])
         return Response({'location': location})
\ No newline at end of file
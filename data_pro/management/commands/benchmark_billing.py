@@ -0,0 +1,117 @@
+import time
+from datetime import timedelta
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from data_pro.models.invoices import Invoice
+from data_pro.models.transports import TransportService
+from data_pro.models.visas import Visa
+from data_pro.system.billing import BillingRun
+from data_pro.utils.seeding import BenchmarkDataGenerator
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Time a month-end BillingRun over delivered transport services, against '
+        'invoicing each customer with per-object saves. Seeded rows are rolled back afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--services', type=int, default=100000)
+        parser.add_argument('--customers', type=int, default=2000)
+        parser.add_argument(
+            '--loop-limit', type=int, default=10000,
+            help='Also time the per-object loop when there are at most this many services'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                generator = BenchmarkDataGenerator(1, options['customers'], tag='billing')
+                generator.generate()
+                client = generator.clients[0]
+                customers = list(client.customers.values_list('pk', flat=True))
+                period_end = timezone.localdate() - timedelta(days=1)
+
+                self.stdout.write(f"{'services':>9} {'mode':<12} {'seconds':>9} {'queries':>8} {'invoices':>9}")
+                self._seed(client, customers, options['services'], 'a')
+                expected = self._expected(client, period_end)
+                elapsed, queries, run = self._measure(lambda: BillingRun(client, period_end).run())
+                assert run['total'] == expected, (run['total'], expected)
+                self._report(options['services'], 'billing run', elapsed, queries, run['invoices'])
+
+                if options['services'] <= options['loop_limit']:
+                    self._seed(client, customers, options['services'], 'b')
+                    elapsed, queries, count = self._measure(lambda: self._loop(client, period_end))
+                    self._report(options['services'], 'per object', elapsed, queries, count)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _seed(self, client, customers, count, tag):
+        arrival = timezone.now() - timedelta(days=3)
+        TransportService.objects.bulk_create([
+            TransportService(
+                reference_number=f'BILL-{tag}-{i}', customer_id=customers[i % len(customers)], client=client,
+                origin='Mombasa', destination='Nairobi', status='delivered',
+                scheduled_departure=arrival - timedelta(hours=8), scheduled_arrival=arrival,
+                distance_km=Decimal('480.00'), estimated_duration_hours=Decimal('8.00'),
+                base_fare=Decimal(50 + i % 450), additional_charges=Decimal(i % 7) / 4, discount=Decimal(i % 3),
+            )
+            for i in range(count)
+        ], batch_size=2000)
+
+    def _expected(self, client, period_end):
+        """What the run must bill, summed row by row in Python with Decimal"""
+        run = BillingRun(client, period_end)
+        billable = run.billable()
+        per_customer = {}
+        for customer_id, base_fare, additional_charges, discount in billable[TransportService].values_list(
+            'customer_id', 'base_fare', 'additional_charges', 'discount'
+        ):
+            per_customer[customer_id] = per_customer.get(customer_id, 0) + base_fare + additional_charges - discount
+        for customer_id, total_cost in billable[Visa].values_list('customer_id', 'total_cost'):
+            per_customer[customer_id] = per_customer.get(customer_id, 0) + total_cost
+        rate, cent = run.tax_rate, Decimal('0.01')
+        return sum((amount + (amount * rate).quantize(cent, ROUND_HALF_UP) for amount in per_customer.values()), Decimal('0.00'))
+
+    def _loop(self, client, period_end):
+        services = TransportService.objects.filter(client=client, status='delivered', invoice__isnull=True)
+        by_customer = {}
+        for service in services:
+            by_customer.setdefault(service.customer_id, []).append(service)
+        for n, (customer_id, rows) in enumerate(by_customer.items()):
+            amount = sum((service.total_fare for service in rows), Decimal('0'))
+            invoice = Invoice.objects.create(
+                invoice_number=f'LOOP-{n}', client=client, customer_id=customer_id,
+                issue_date=period_end, due_date=period_end, amount=amount, tax=Decimal('0'), discount=Decimal('0'),
+            )
+            for service in rows:
+                service.invoice = invoice
+                service.save()
+        return len(by_customer)
+
+    def _measure(self, work):
+        # Counted with a wrapper, as the per-object loop overflows the query log
+        queries = 0
+
+        def count(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count):
+            started = time.perf_counter()
+            result = work()
+            elapsed = time.perf_counter() - started
+        return elapsed, queries, result
+
+    def _report(self, size, mode, elapsed, queries, invoices):
+        self.stdout.write(f'{size:>9} {mode:<12} {elapsed:>9.3f} {queries:>8} {invoices:>9}')
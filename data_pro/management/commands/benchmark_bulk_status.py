@@ -0,0 +1,93 @@
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from data_pro.api.views import TransportServiceViewSet
+from data_pro.models.transports import TransportService
+from data_pro.utils.seeding import BenchmarkDataGenerator
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Time POST /api/transports/bulk_status/ against per-object '
+        'update_status() calls at increasing id counts. Seeded rows are '
+        'rolled back afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='100,1000,10000', help='Comma separated id counts')
+        parser.add_argument(
+            '--loop-limit', type=int, default=1000,
+            help='Largest size also timed with one update_status() per service'
+        )
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options['sizes'].split(','))
+        try:
+            with transaction.atomic():
+                user = get_user_model().objects.create_superuser(
+                    'bulk-status-benchmark', 'bulk-status-benchmark@example.com', None
+                )
+                generator = BenchmarkDataGenerator(1, 1, tag='bulk-status')
+                generator.generate()
+                customer = generator.clients[0].customers.first()
+
+                self.stdout.write(f"{'ids':>8} {'mode':<14} {'seconds':>9} {'ids/s':>10} {'queries':>8}")
+                for size in sizes:
+                    ids = self._seed(customer, size, f'{size}a')
+                    self._report(size, 'bulk endpoint', *self._bulk(user, ids))
+                    if size <= options['loop_limit']:
+                        ids = self._seed(customer, size, f'{size}b')
+                        self._report(size, 'update_status', *self._loop(user, ids))
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _seed(self, customer, count, tag):
+        departure = timezone.now() + timedelta(days=1)
+        services = TransportService.objects.bulk_create([
+            TransportService(
+                reference_number=f'BULK-{tag}-{i}', customer=customer, client_id=customer.client_id,
+                origin='Mombasa', destination='Nairobi',
+                scheduled_departure=departure, scheduled_arrival=departure + timedelta(hours=8),
+                distance_km=Decimal('480.00'), estimated_duration_hours=Decimal('8.00'),
+                base_fare=Decimal('100.00'),
+            )
+            for i in range(count)
+        ], batch_size=2000)
+        return [service.pk for service in services]
+
+    def _bulk(self, user, ids):
+        view = TransportServiceViewSet.as_view({'post': 'bulk_status'})
+        request = APIRequestFactory().post(
+            '/api/transports/bulk_status/', {'ids': ids, 'status': 'in_transit'}, format='json'
+        )
+        force_authenticate(request, user)
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = view(request).render()
+            elapsed = time.perf_counter() - started
+        assert response.status_code == 200 and response.data['updated'] == len(ids), response.data
+        return elapsed, len(captured)
+
+    def _loop(self, user, ids):
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            for service in TransportService.objects.filter(pk__in=ids):
+                service.update_status('in_transit', user)
+            elapsed = time.perf_counter() - started
+        return elapsed, len(captured)
+
+    def _report(self, size, mode, elapsed, queries):
+        self.stdout.write(f'{size:>8} {mode:<14} {elapsed:>9.3f} {size / elapsed:>10.0f} {queries:>8}')
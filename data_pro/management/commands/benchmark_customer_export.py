@@ -0,0 +1,77 @@
+import resource
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from data_pro.models.clients import Client
+from data_pro.models.customers import Customer
+from data_pro.views.customers import CustomerExportView
+from data_pro.utils.csv_handlers import StreamingCSVExporter
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure memory and throughput of the streaming customer CSV export '
+        'at increasing table sizes. Seeded rows are rolled back afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', default='1000,10000,100000,1000000',
+            help='Comma separated row counts to export'
+        )
+        parser.add_argument('--gzip', action='store_true', help='Benchmark the gzip stream')
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options['sizes'].split(','))
+        try:
+            with transaction.atomic():
+                # bulk_create skips Client.save()/full_clean(), as seed data needs no validation
+                client, = Client.objects.bulk_create([Client(
+                    name='Benchmark', company_name='Benchmark Export Ltd',
+                    contact_person='Benchmark', phone='+100000000',
+                    email='benchmark-export@example.com', address_line1='-',
+                    city='-', state='-', postal_code='-',
+                )])
+                self.stdout.write(f"{'rows':>10} {'seconds':>10} {'rows/s':>12} {'py peak KiB':>12} {'max RSS KiB':>12}")
+                seeded = 0
+                for size in sizes:
+                    seeded += self._seed(client, size - seeded)
+                    self._run(client, size, options['gzip'])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _seed(self, client, count, batch_size=5000):
+        for start in range(0, count, batch_size):
+            Customer.objects.bulk_create([
+                Customer(
+                    client=client, first_name='Bench', last_name=str(start + i),
+                    email=f'bench{start + i}@example.com', phone='+100000000',
+                )
+                for i in range(min(batch_size, count - start))
+            ])
+        return count
+
+    def _run(self, client, size, compress):
+        exporter = StreamingCSVExporter(Customer.objects.filter(client=client), CustomerExportView.columns)
+        response = exporter.response('customers_export.csv', compress=compress)
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        for _chunk in response.streaming_content:
+            pass
+        elapsed = time.perf_counter() - started
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        self.stdout.write(
+            f'{size:>10} {elapsed:>10.2f} {size / elapsed:>12.0f} {peak // 1024:>12} {max_rss:>12}'
+        )
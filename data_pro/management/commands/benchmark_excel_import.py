@@ -0,0 +1,116 @@
+import time
+from datetime import date, timedelta
+from io import BytesIO
+
+import pandas as pd
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from data_pro.models.clients import Client
+from data_pro.models.customers import Customer
+from data_pro.models.passports import Passport
+from data_pro.models.visas import Visa
+from data_pro.utils.excel_handlers import ExcelImporter
+
+
+class _Rollback(Exception):
+    pass
+
+
+def visa_sheet(customer_ids, rows):
+    today = date.today()
+    return pd.DataFrame({
+        'visa_number': [f'BV{i:08d}' for i in range(rows)],
+        'customer_id': [customer_ids[i % len(customer_ids)] for i in range(rows)],
+        'visa_type': ['tourist'] * rows,
+        'issuing_country': ['France'] * rows,
+        'issue_date': [(today - timedelta(days=i % 400)).isoformat() for i in range(rows)],
+        'expiry_date': [(today + timedelta(days=i % 400 - 100)).isoformat() for i in range(rows)],
+        'duration_days': [90] * rows,
+        'unit_cost': [80.5] * rows,
+        'service_fee': [10.0] * rows,
+    })
+
+
+def passport_sheet(customer_ids, rows):
+    today = date.today()
+    return pd.DataFrame({
+        'passport_number': [f'BP{i:08d}' for i in range(rows)],
+        'customer': [customer_ids[i % len(customer_ids)] for i in range(rows)],
+        'issuing_country': ['Kenya'] * rows,
+        'issue_date': [today - timedelta(days=i % 3000) for i in range(rows)],
+        'expiry_date': [today + timedelta(days=i % 3000) for i in range(rows)],
+        'status': ['valid'] * rows,
+    })
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare rows/sec of the batched ExcelImporter against the previous '
+        'row-by-row path for Visa and Passport sheets. All writes are rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5000)
+        parser.add_argument('--customers', type=int, default=500)
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        user = get_user_model().objects.filter(is_superuser=True).first()
+        self.stdout.write(f"{'model':<10} {'path':<12} {'rows':>8} {'seconds':>9} {'rows/s':>10}")
+
+        for model, build_sheet in ((Visa, visa_sheet), (Passport, passport_sheet)):
+            for path in ('row-by-row', 'batched'):
+                try:
+                    with transaction.atomic():
+                        customer_ids = self._seed_customers(options['customers'])
+                        output = BytesIO()
+                        build_sheet(customer_ids, rows).to_excel(output, index=False)
+                        output.seek(0)
+
+                        started = time.perf_counter()
+                        if path == 'batched':
+                            ExcelImporter(model, user).import_from_excel(output)
+                        else:
+                            self._row_by_row(model, user, output)
+                        elapsed = time.perf_counter() - started
+                        raise _Rollback
+                except _Rollback:
+                    pass
+                self.stdout.write(
+                    f'{model.__name__:<10} {path:<12} {rows:>8} {elapsed:>9.2f} {rows / elapsed:>10.0f}'
+                )
+
+    def _seed_customers(self, count):
+        # bulk_create skips Client.save()/full_clean(), as seed data needs no validation
+        client, = Client.objects.bulk_create([Client(
+            name='Benchmark', company_name='Benchmark Excel Ltd',
+            contact_person='Benchmark', phone='+100000000',
+            email='benchmark-excel@example.com', address_line1='-',
+            city='-', state='-', postal_code='-',
+        )])
+        customers = Customer.objects.bulk_create([
+            Customer(client=client, first_name='Bench', last_name=str(i), phone='+100000000')
+            for i in range(count)
+        ])
+        return [customer.pk for customer in customers]
+
+    def _row_by_row(self, model, user, file):
+        """The pre-batching import path: per-row introspection, FK gets and save()"""
+        df = pd.read_excel(file)
+        for _, row in df.iterrows():
+            row_data = row.to_dict()
+            date_fields = [f.name for f in model._meta.get_fields()
+                           if f.get_internal_type() == 'DateField']
+            for field in date_fields:
+                if field in row_data and isinstance(row_data[field], str):
+                    row_data[field] = date.fromisoformat(row_data[field])
+            fk_fields = [f for f in model._meta.get_fields()
+                         if f.is_relation and f.many_to_one and not f.auto_created]
+            for field in fk_fields:
+                if field.name in row_data and pd.notna(row_data[field.name]):
+                    row_data[field.name] = field.related_model.objects.get(pk=int(row_data[field.name]))
+            obj = model(**row_data)
+            obj.created_by = user
+            obj.save()
@@ -0,0 +1,95 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from data_pro.models.clients import Client
+from data_pro.models.customers import Customer
+from data_pro.utils.search import get_backend, search
+
+FIRST_NAMES = ['James', 'Amina', 'Wei', 'Olga', 'Carlos', 'Priya', 'Kwame', 'Sofia', 'Hiro', 'Fatima']
+LAST_NAMES = ['Okafor', 'Schmidt', 'Nakamura', 'Haddad', 'Moreau', 'Kowalski', 'Mensah', 'Rossi', 'Iyer', 'Lindqvist']
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Time customer list searches through data_pro.utils.search against the '
+        'previous OR\'ed icontains filter. Seeded rows are rolled back afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--customers', type=int, default=1000000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument(
+            '--terms', default='Lindqvist,okafor,cust-0777,5550123,Amina Mensah',
+            help='Comma separated search terms'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Backend: {type(get_backend()).__name__}")
+        try:
+            with transaction.atomic():
+                started = time.perf_counter()
+                client = self._seed(options['customers'])
+                self.stdout.write(
+                    f"Seeded {options['customers']} customers in {time.perf_counter() - started:.1f}s"
+                )
+                queryset = Customer.objects.filter(client=client)
+
+                self.stdout.write(f"{'term':<16} {'rows':>7} {'icontains ms':>13} {'search ms':>10}")
+                for term in options['terms'].split(','):
+                    baseline, rows = self._time(self._icontains(queryset, term), options['repeat'])
+                    indexed, found = self._time(search(queryset, term), options['repeat'])
+                    note = '' if rows == found else f'  ({found} rows, matches per word)'
+                    self.stdout.write(f'{term:<16} {rows:>7} {baseline:>13.1f} {indexed:>10.1f}{note}')
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _seed(self, count):
+        # bulk_create skips Client.save()/full_clean(), as seed data needs no validation
+        client, = Client.objects.bulk_create([Client(
+            name='Benchmark', company_name='Benchmark Search Ltd',
+            contact_person='Benchmark', phone='+100000000',
+            email='benchmark-search@example.com', address_line1='-',
+            city='-', state='-', postal_code='-',
+        )])
+        batch = []
+        for i in range(count):
+            batch.append(Customer(
+                client=client,
+                first_name=FIRST_NAMES[i % len(FIRST_NAMES)],
+                last_name=LAST_NAMES[(i // len(FIRST_NAMES)) % len(LAST_NAMES)],
+                email=f'cust-{i:07d}@example.com',
+                phone=f'+1{i:09d}',
+            ))
+            if len(batch) == 10000:
+                Customer.objects.bulk_create(batch)
+                batch = []
+        Customer.objects.bulk_create(batch)
+        return client
+
+    def _icontains(self, queryset, term):
+        """The filter the list views used before data_pro.utils.search"""
+        return queryset.filter(
+            Q(first_name__icontains=term) |
+            Q(last_name__icontains=term) |
+            Q(email__icontains=term) |
+            Q(phone__icontains=term)
+        )
+
+    def _time(self, queryset, repeat):
+        # Time what the list view runs: the paginator count plus the first page
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            rows = queryset.count()
+            list(queryset.values_list('pk', flat=True)[:25])
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings), rows
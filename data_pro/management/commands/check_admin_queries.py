@@ -0,0 +1,92 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client as TestClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from data_pro.admin import admin_site
+from data_pro.models.outbox import OutboundEmail
+from data_pro.system import client_stats
+from data_pro.utils.seeding import BenchmarkDataGenerator
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Load every changelist of the system admin site with a few rows and '
+        'again with full pages, and fail if the query count grows with the '
+        'number of rows shown (an N+1 in a list column). Seeded rows are '
+        'rolled back afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--customers', type=int, default=300, help='Customers seeded for the full pages')
+
+    def handle(self, *args, **options):
+        failures = 0
+        try:
+            with transaction.atomic():
+                user = get_user_model().objects.create_superuser(
+                    'admin-query-check', 'admin-query-check@example.com', None
+                )
+                browser = TestClient()
+                browser.force_login(user)
+                # Per-process caches (system configuration, version counters)
+                # load on the first request; keep that out of the counts
+                browser.get(reverse(f'{admin_site.name}:index'))
+
+                self._seed(1, 3, 'admin-few')
+                few = self._measure(browser)
+                self._seed(5, options['customers'], 'admin-full')
+                full = self._measure(browser)
+
+                for label, before in few.items():
+                    after = full[label]
+                    if isinstance(before, str) or isinstance(after, str):
+                        failures += 1
+                        self.stdout.write(f"{self.style.ERROR('FAIL')} {label}: {after if isinstance(after, str) else before}")
+                    elif after != before:
+                        failures += 1
+                        self.stdout.write(f"{self.style.ERROR('FAIL')} {label}: {before} -> {after} queries")
+                    else:
+                        self.stdout.write(f"{self.style.SUCCESS('ok')}   {label}: {after} queries")
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        if failures:
+            raise CommandError(f'{failures} changelist(s) run more queries as rows are added')
+        self.stdout.write(self.style.SUCCESS('Every changelist runs a constant number of queries'))
+
+    def _seed(self, clients, customers, tag):
+        generator = BenchmarkDataGenerator(clients, customers, tag=tag)
+        generator.generate()
+        client_stats.rebuild()
+        User = get_user_model()
+        User.objects.bulk_create([User(username=f'{tag}-{i}') for i in range(customers // 2)])
+        OutboundEmail.objects.bulk_create([
+            OutboundEmail(subject=f'{tag} {i}', body='-', from_email='-', recipients=['x@example.com'])
+            for i in range(customers // 2)
+        ])
+
+    def _measure(self, browser):
+        """Query count of the first page of every changelist, or the error it raised"""
+        counts = {}
+        for model in admin_site._registry:
+            opts = model._meta
+            url = reverse(f'{admin_site.name}:{opts.app_label}_{opts.model_name}_changelist')
+            try:
+                with CaptureQueriesContext(connection) as captured:
+                    response = browser.get(url)
+            except Exception as e:
+                counts[opts.label] = f'{type(e).__name__}: {e}'
+                continue
+            if response.status_code != 200:
+                counts[opts.label] = f'HTTP {response.status_code}'
+            else:
+                counts[opts.label] = len(captured)
+        return counts
@@ -0,0 +1,137 @@
+import json
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from data_pro.models.client_stats import ClientStats
+from data_pro.models.customers import Customer
+from data_pro.models.invoices import Invoice
+from data_pro.models.passports import Passport, PassportExtension
+from data_pro.models.transports import Transport, TransportService
+from data_pro.models.vehicles import Vehicle
+from data_pro.models.visas import Visa
+from data_pro.utils.pagination import KeysetPaginator
+from data_pro.utils.seeding import BenchmarkDataGenerator
+
+
+class _Rollback(Exception):
+    pass
+
+
+def list_and_dashboard_queries(client_id):
+    """(label, queryset) for the hot list and dashboard queries of one tenant"""
+    today = timezone.now().date()
+    visa_page = KeysetPaginator(Visa.objects.all(), ('-issue_date', 'id'), 20)
+    visa_cursor = visa_page.page().next_cursor
+    return [
+        ('customer list', Customer.objects.filter(client_id=client_id).order_by('-created_at')[:25]),
+        ('customer api list', Customer.objects.order_by('-created_at', 'id')[:20]),
+        ('active customers', Customer.objects.filter(client_id=client_id, status='active').order_by().values('pk')),
+        ('customer import match', Customer.objects.filter(
+            client_id__in=[client_id], email__in=['plan-1@example.com']
+        ).order_by().values_list('client_id', 'email', 'id')),
+        ('visa list', Visa.objects.select_related('customer').order_by('-issue_date', 'id')[:20]),
+        ('visa list, cursor page', visa_page.queryset.filter(
+            visa_page._seek(*visa_page.decode(visa_cursor))
+        ).order_by('-issue_date', 'id')[:20]),
+        ('pending visas', Visa.objects.filter(
+            customer__client_id=client_id, status=Visa.Status.PROCESSING
+        ).order_by().values('pk')),
+        ('passport list', Passport.objects.select_related('customer').order_by('-issue_date', 'id')[:20]),
+        ('passport default ordering', Passport.objects.all()[:20]),
+        ('expiring passports', Passport.objects.filter(
+            expiry_date__range=(today, today + timedelta(days=30))
+        ).exclude(status='expired').order_by().values('pk')),
+        ('expiring passports, tenant', Passport.objects.filter(
+            customer__client_id=client_id, expiry_date__range=(today, today + timedelta(days=30))
+        ).order_by().values('pk')),
+        ('pending extensions', PassportExtension.objects.filter(released_date__isnull=True).order_by().values('pk')),
+        ('pending extensions, tenant', PassportExtension.objects.filter(
+            passport__customer__client_id=client_id, released_date__isnull=True
+        ).order_by().values('pk')),
+        ('recent invoices', Invoice.objects.filter(client_id=client_id).order_by('-issue_date')[:5]),
+        ('pending invoices', Invoice.objects.filter(status='sent').order_by().values('pk')),
+        ('active transports', Transport.objects.filter(status__in=['pending', 'in_progress']).order_by().values('pk')),
+        ('transport list', Transport.objects.all()[:20]),
+        ('transport services, tenant', TransportService.objects.filter(client_id=client_id, status='in_transit')[:20]),
+        ('available vehicles', Vehicle.objects.filter(status='available').order_by().values('pk')),
+        ('client stats', ClientStats.objects.filter(client_id=client_id)),
+    ]
+
+
+def plan_problems(queryset):
+    """Return ``(plan lines, problems)`` for the query behind ``queryset``"""
+    sql, params = queryset.query.sql_with_params()
+    problems = []
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+            plan = cursor.fetchone()[0]
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+            lines, nodes = [], [(plan[0]['Plan'], 0)]
+            while nodes:
+                node, depth = nodes.pop()
+                lines.append('  ' * depth + f"{node['Node Type']} {node.get('Relation Name', '')}".rstrip())
+                if node['Node Type'] == 'Seq Scan':
+                    problems.append(f"sequential scan of {node['Relation Name']}")
+                if node['Node Type'] == 'Sort':
+                    problems.append('sort without an index')
+                nodes.extend((child, depth + 1) for child in reversed(node.get('Plans', [])))
+        else:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            lines = [row[-1] for row in cursor.fetchall()]
+            for line in lines:
+                if line.startswith('SCAN ') and ' USING ' not in line:
+                    problems.append(f'sequential scan: {line}')
+                if line.startswith('USE TEMP B-TREE'):
+                    problems.append(f'sort without an index: {line}')
+    return lines, problems
+
+
+class Command(BaseCommand):
+    help = (
+        'EXPLAIN every list and dashboard query against a seeded database and '
+        'fail if any plan falls back to a sequential scan or an unindexed sort. '
+        'Seeded rows are rolled back afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=20)
+        parser.add_argument('--customers', type=int, default=5000, help='Customers across all clients')
+        parser.add_argument('--verbose-plans', action='store_true', help='Print every plan, not only failures')
+
+    def handle(self, *args, **options):
+        failures = 0
+        try:
+            with transaction.atomic():
+                client_id = self._seed(options['clients'], options['customers'])
+                with connection.cursor() as cursor:
+                    cursor.execute('ANALYZE')
+                    if connection.vendor == 'postgresql':
+                        # Tiny tables make a seq scan cheapest; only report
+                        # the ones no index could have served
+                        cursor.execute('SET LOCAL enable_seqscan = off')
+                        cursor.execute('SET LOCAL enable_sort = off')
+
+                for label, queryset in list_and_dashboard_queries(client_id):
+                    lines, problems = plan_problems(queryset)
+                    status = self.style.ERROR('FAIL') if problems else self.style.SUCCESS('ok')
+                    self.stdout.write(f'{status:<4} {label}')
+                    if problems or options['verbose_plans']:
+                        for line in lines:
+                            self.stdout.write(f'       {line}')
+                    failures += bool(problems)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        if failures:
+            raise CommandError(f'{failures} query plan(s) use a sequential scan or unindexed sort')
+        self.stdout.write(self.style.SUCCESS('All query plans use indexes'))
+
+    def _seed(self, client_count, customer_count):
+        generator = BenchmarkDataGenerator(client_count, customer_count, tag='plan')
+        generator.generate()
+        return generator.clients[0].pk
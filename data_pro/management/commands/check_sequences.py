@@ -0,0 +1,125 @@
+import threading
+import time
+import uuid
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, IntegrityError, connection, transaction
+
+from data_pro.models.customers import Customer
+from data_pro.models.invoices import Invoice
+from data_pro.models.sequences import Sequence
+from data_pro.system import sequences
+from data_pro.utils.seeding import BenchmarkDataGenerator
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Hammer one invoice number sequence from parallel writers, each inserting '
+        'single invoices and bulk blocks and rolling some transactions back, then '
+        'check that no insert collided and the committed numbers have no gaps. '
+        'The invoices and the sequence are deleted afterwards, as is the client '
+        'created to write under when the database has none.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=32)
+        parser.add_argument('--rounds', type=int, default=20, help='Transactions per writer')
+        parser.add_argument('--block', type=int, default=10, help='Invoices per bulk transaction')
+        parser.add_argument('--client', type=int, help='Client to write under; defaults to the first with customers')
+
+    def handle(self, *args, **options):
+        customer = Customer.objects.order_by('pk')
+        if options['client']:
+            customer = customer.filter(client_id=options['client'])
+        customer = customer.first()
+        token = uuid.uuid4().hex[:8]
+        scratch = None
+        if customer is None:
+            if options['client']:
+                raise CommandError(f"Client {options['client']} has no customers")
+            # The writers use their own connections, so this has to be committed
+            customer = scratch = self._scratch_customer(token)
+
+        name = f'check-{token}'
+        Sequence.objects.create(client_id=customer.client_id, name=name, format=f'CHK-{token}-{{number:06d}}')
+        self.stats = {'committed': 0, 'rolled_back': 0, 'collisions': 0, 'errors': 0}
+        self.lock = threading.Lock()
+        try:
+            writers = [
+                threading.Thread(target=self._write, args=(i, customer, name, options))
+                for i in range(options['writers'])
+            ]
+            started = time.perf_counter()
+            for writer in writers:
+                writer.start()
+            for writer in writers:
+                writer.join()
+            elapsed = time.perf_counter() - started
+
+            committed = self.stats['committed']
+            sequence = Sequence.objects.get(client_id=customer.client_id, name=name)
+            numbers = list(Invoice.objects.filter(invoice_number__startswith=f'CHK-{token}-').values_list('invoice_number', flat=True))
+            expected = {sequence.format_number(value) for value in range(1, committed + 1)}
+            gaps = len(expected - set(numbers))
+        finally:
+            Invoice.objects.filter(invoice_number__startswith=f'CHK-{token}-').delete()
+            Sequence.objects.filter(client_id=customer.client_id, name=name).delete()
+            if scratch is not None:
+                scratch.client.delete()
+
+        self.stdout.write(
+            f"{options['writers']} writers, {elapsed:.2f}s: {committed} invoices committed, "
+            f"{self.stats['rolled_back']} rolled back, {self.stats['collisions']} collisions, "
+            f"{self.stats['errors']} other errors, {gaps} gaps, last value {sequence.last_value}"
+        )
+        if self.stats['collisions'] or self.stats['errors'] or gaps or sequence.last_value != committed or len(numbers) != committed:
+            raise CommandError('Sequence check failed')
+        self.stdout.write(self.style.SUCCESS('No collisions and no gaps'))
+
+    def _scratch_customer(self, token):
+        client = BenchmarkDataGenerator(1, 0, tag=f'chk-{token}').create_clients()[0]
+        return Customer.objects.bulk_create([
+            Customer(client=client, customer_type='individual', first_name='Sequence', last_name='Check')
+        ])[0]
+
+    def _write(self, writer, customer, name, options):
+        today = date.today()
+
+        def invoice(number):
+            return Invoice(
+                invoice_number=number, client_id=customer.client_id, customer=customer,
+                issue_date=today, due_date=today, amount=0, tax=0, discount=0, total_amount=0,
+            )
+
+        try:
+            for round_ in range(options['rounds']):
+                bulk = round_ % 2
+                count = options['block'] if bulk else 1
+                try:
+                    with transaction.atomic():
+                        block = sequences.allocate(customer.client_id, name, count)
+                        if bulk:
+                            Invoice.objects.bulk_create([invoice(number) for number in block])
+                        else:
+                            invoice(next(iter(block))).save()
+                        # Every seventh transaction fails after taking its numbers
+                        if (writer + round_) % 7 == 0:
+                            raise _Rollback
+                except _Rollback:
+                    outcome = 'rolled_back'
+                except IntegrityError:
+                    outcome = 'collisions'
+                except DatabaseError as e:
+                    self.stderr.write(f'Writer {writer}: {e}')
+                    outcome = 'errors'
+                else:
+                    outcome = 'committed'
+                with self.lock:
+                    self.stats[outcome] += count if outcome in ('committed', 'rolled_back') else 1
+        finally:
+            connection.close()
@@ -0,0 +1,45 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from data_pro.models.clients import Client
+from data_pro.system.billing import BillingRun, last_month_end
+
+
+class Command(BaseCommand):
+    help = (
+        "Invoice every client's delivered transport services and released visas "
+        'not invoiced yet: one draft invoice per customer. Meant for month-end, e.g. from cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--client', type=int, action='append', dest='clients',
+            help='Only bill this client id (repeatable)'
+        )
+        parser.add_argument(
+            '--period-end', type=date.fromisoformat,
+            help='Last day billed (YYYY-MM-DD); defaults to the end of last month'
+        )
+
+    def handle(self, *args, **options):
+        period_end = options['period_end'] or last_month_end()
+        clients = Client.objects.order_by('pk')
+        if options['clients']:
+            clients = clients.filter(pk__in=options['clients'])
+
+        started = time.perf_counter()
+        invoiced = 0
+        for client in clients.iterator():
+            result = BillingRun(client, period_end).run()
+            if result['invoices']:
+                invoiced += result['invoices']
+                lines = ', '.join(f'{count} {name}' for name, count in result['lines'].items())
+                self.stdout.write(
+                    f"{client}: {result['invoices']} invoice(s) {result['first_number']}..{result['last_number']} "
+                    f"for {lines}, total {result['total']}"
+                )
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {invoiced} invoice(s) up to {period_end} in {time.perf_counter() - started:.2f}s'
+        ))
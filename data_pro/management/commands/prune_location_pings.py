@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from data_pro.system import tracking
+
+
+class Command(BaseCommand):
+    help = (
+        'Apply the location ping retention policy: keep recent pings at full '
+        'resolution, thin older ones to one per service per interval and delete '
+        'the oldest. Meant to run daily, e.g. from cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--keep-days', type=int, default=tracking.KEEP_DAYS,
+            help='Days of pings kept at full resolution'
+        )
+        parser.add_argument(
+            '--downsample-minutes', type=int, default=tracking.DOWNSAMPLE_MINUTES,
+            help='Keep one older ping per service per this many minutes (0 keeps all)'
+        )
+        parser.add_argument(
+            '--max-days', type=int, default=tracking.MAX_DAYS,
+            help='Delete pings older than this many days'
+        )
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        expired, downsampled = tracking.prune(
+            keep_days=options['keep_days'],
+            downsample_minutes=options['downsample_minutes'],
+            max_days=options['max_days'],
+            batch_size=options['batch_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {expired} expired and {downsampled} downsampled pings '
+            f'in {time.perf_counter() - started:.2f}s'
+        ))
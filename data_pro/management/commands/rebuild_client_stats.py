@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from data_pro.models.client_stats import ClientStats
+from data_pro.system import client_stats
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute the ClientStats rollup from the source tables, reporting '
+        'any counters that had drifted from the incremental signal updates.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--client', type=int, action='append', dest='clients',
+            help='Only rebuild this client id (repeatable)'
+        )
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Report drift without writing; exits non-zero if any is found'
+        )
+
+    def handle(self, *args, **options):
+        names = ClientStats.counter_names()
+        before = {row['client_id']: row for row in ClientStats.objects.values('client_id', *names)}
+
+        try:
+            with transaction.atomic():
+                written = client_stats.rebuild(options['clients'], include_shared=not options['clients'])
+                after = {row['client_id']: row for row in ClientStats.objects.values('client_id', *names)}
+                if options['check']:
+                    raise _Rollback
+        except _Rollback:
+            pass
+
+        drifted = 0
+        for client_id, row in after.items():
+            if options['clients'] and client_id not in options['clients']:
+                continue
+            old = before.get(client_id, dict.fromkeys(names, 0))
+            changes = [f'{name} {old[name]} -> {row[name]}' for name in names if old[name] != row[name]]
+            if changes:
+                drifted += 1
+                self.stdout.write(f"{client_id or 'shared'}: {', '.join(changes)}")
+
+        verb = 'Checked' if options['check'] else 'Rebuilt'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {written} row(s), {drifted} had drifted'))
+        if options['check'] and drifted:
+            raise SystemExit(1)
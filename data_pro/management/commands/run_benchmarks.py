@@ -0,0 +1,188 @@
+import json
+import math
+import re
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client as TestClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from rest_framework.settings import api_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from data_pro.api.views import BaseViewSet
+from data_pro.middleware.queries import QueryBudgetExceeded, budget_for
+from data_pro.system.metrics import DashboardMetrics
+
+
+class _Rollback(Exception):
+    pass
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    return values[max(0, math.ceil(pct / 100 * len(values)) - 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        'Time the main pages, exports and API lists against the current database '
+        '(see seed_benchmark_data) and report latency percentiles and query counts '
+        'per endpoint. Endpoints over their query_budget are reported as errors; '
+        'with --baseline, exit non-zero on a regression.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=20, help='Timed requests per endpoint')
+        parser.add_argument(
+            '--export-requests', type=int, default=3,
+            help='Timed requests for exports and other full-table endpoints'
+        )
+        parser.add_argument('--warmup', type=int, default=1, help='Untimed requests before timing')
+        parser.add_argument('--only', help='Regular expression; run only the endpoints it matches')
+        parser.add_argument('--json', dest='json_path', help='Write the results to this file')
+        parser.add_argument('--baseline', help='Results file of an earlier run to compare against')
+        parser.add_argument(
+            '--tolerance', type=float, default=0.5,
+            help='Allowed p95 slowdown against the baseline, as a fraction (default 0.5)'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                # Throwaway superuser; it and its sessions are rolled back with
+                # anything else the requests write
+                user = get_user_model().objects.create_superuser(
+                    'benchmark-runner', 'benchmark-runner@example.com', None
+                )
+                results = self._run_all(user, options)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        if options['json_path']:
+            with open(options['json_path'], 'w') as fh:
+                json.dump(results, fh, indent=2)
+        if options['baseline']:
+            self._compare(results, options['baseline'], options['tolerance'])
+
+    def endpoints(self, user):
+        """(heavy, query budget, request function) by name, for every benchmarked endpoint"""
+        browser = TestClient()
+        browser.force_login(user)
+        xhr = {'headers': {'X-Requested-With': 'XMLHttpRequest'}}
+
+        def page(name, heavy=False, **kwargs):
+            url = reverse(name)
+            budget = budget_for(resolve(url).func)
+            return heavy, budget, lambda: browser.get(url, kwargs.get('params'), **kwargs.get('extra', {}))
+
+        endpoints = {
+            'customer list': page('system:customer-list'),
+            'customer list, page 50': page('system:customer-list', params={'page': 50}),
+            'customer list, search': page('system:customer-list', params={'search': 'lindqvist'}),
+            'visa list xhr': page('system:visa-list', extra=xhr),
+            'visa list xhr, cursor': page('system:visa-list', params={'cursor': ''}, extra=xhr),
+            'passport list xhr': page('system:passport-list', extra=xhr),
+            'dashboard': page('dashboard'),
+            'visa export xlsx': page('system:visa-export', heavy=True),
+            'visa export csv': page('system:visa-export', heavy=True, params={'format': 'csv'}),
+            'customer export': page('system:customer-export', heavy=True),
+        }
+
+        factory = APIRequestFactory()
+        for viewset in sorted(BaseViewSet.__subclasses__(), key=lambda cls: cls.__name__):
+            view = viewset.as_view({'get': 'list'})
+            name = viewset.__name__.removesuffix('ViewSet').lower()
+            # Without PAGE_SIZE, page-number mode returns the whole table
+            for label, params, heavy in (
+                ('', {}, api_settings.PAGE_SIZE is None),
+                (', cursor', {'cursor': ''}, False),
+            ):
+                def call(view=view, params=params):
+                    request = factory.get('/api/', params)
+                    force_authenticate(request, user)
+                    return view(request).render()
+                endpoints[f'api {name} list{label}'] = (heavy, budget_for(view), call)
+        return endpoints
+
+    def _run_all(self, user, options):
+        only = re.compile(options['only']) if options['only'] else None
+        results = {}
+        self.stdout.write(
+            f"{'endpoint':<32} {'n':>4} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'queries':>8} {'budget':>7}"
+        )
+        for name, (heavy, budget, call) in self.endpoints(user).items():
+            if only and not only.search(name):
+                continue
+            count = options['export_requests'] if heavy else options['requests']
+            timings, queries = [], []
+            try:
+                with transaction.atomic():
+                    for _ in range(options['warmup']):
+                        self._request(call, budget)
+                    for _ in range(count):
+                        elapsed, query_count = self._request(call, budget)
+                        timings.append(elapsed)
+                        queries.append(query_count)
+            except Exception as e:
+                # A broken page should not hide the numbers of the others
+                results[name] = {'error': f'{type(e).__name__}: {e}'}
+                self.stdout.write(self.style.ERROR(f"{name:<32} {results[name]['error']}"))
+                continue
+            timings.sort()
+            results[name] = {
+                'requests': count,
+                'p50_ms': round(percentile(timings, 50), 2),
+                'p95_ms': round(percentile(timings, 95), 2),
+                'p99_ms': round(percentile(timings, 99), 2),
+                'max_ms': round(timings[-1], 2),
+                'queries': max(queries),
+                'budget': budget,
+            }
+            row = results[name]
+            self.stdout.write(
+                f"{name:<32} {count:>4} {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} "
+                f"{row['p99_ms']:>9.1f} {row['max_ms']:>9.1f} {row['queries']:>8} {budget or '-':>7}"
+            )
+        results['_dashboard_cache'] = DashboardMetrics.stats()
+        return results
+
+    def _request(self, call, budget):
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = call()
+            # Streaming bodies run their queries while being consumed
+            if response.streaming:
+                for _chunk in response.streaming_content:
+                    pass
+            elapsed = (time.perf_counter() - started) * 1000
+        if response.status_code != 200:
+            raise CommandError(f'HTTP {response.status_code}')
+        # Budgets also cover queries run while streaming, unlike the middleware
+        if budget is not None and len(captured) > budget:
+            raise QueryBudgetExceeded(f'{len(captured)} queries, budget is {budget}')
+        return elapsed, len(captured)
+
+    def _compare(self, results, path, tolerance):
+        with open(path) as fh:
+            baseline = json.load(fh)
+        regressions = []
+        for name, row in results.items():
+            old = baseline.get(name)
+            if name.startswith('_') or old is None or 'error' in old:
+                continue
+            if 'error' in row:
+                regressions.append(f"{name}: {row['error']}")
+                continue
+            if row['queries'] > old['queries']:
+                regressions.append(f"{name}: {old['queries']} -> {row['queries']} queries")
+            if row['p95_ms'] > old['p95_ms'] * (1 + tolerance):
+                regressions.append(f"{name}: p95 {old['p95_ms']:.1f} -> {row['p95_ms']:.1f} ms")
+        for line in regressions:
+            self.stdout.write(self.style.ERROR(line))
+        if regressions:
+            raise CommandError(f'{len(regressions)} regression(s) against {path}')
+        self.stdout.write(self.style.SUCCESS(f'No regressions against {path}'))
@@ -0,0 +1,82 @@
+import multiprocessing
+import signal
+import sys
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from data_pro.system import config
+from data_pro.system.jobs import Worker, purge
+
+
+def _work(kinds, loop, interval, name):
+    # SIGTERM unwinds like Ctrl-C, so the running job is requeued
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    config.warm()
+    worker = Worker(kinds, name)
+    try:
+        if loop:
+            worker.run_forever(interval)
+        else:
+            worker.run_pending()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        'Run queued background jobs (imports and exports) in a pool of worker '
+        'processes, writing progress and results back to each job row.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=1, help='Worker processes; 1 runs in this process')
+        parser.add_argument('--kind', action='append', dest='kinds', help='Only run jobs of this kind (repeatable)')
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep polling for jobs instead of exiting once the queue is drained'
+        )
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds between polls with --loop')
+        parser.add_argument(
+            '--purge-days', type=int, default=30,
+            help='Delete finished jobs and their files older than this many days first; 0 keeps them'
+        )
+
+    def handle(self, *args, **options):
+        if options['purge_days']:
+            purged = purge(timedelta(days=options['purge_days']))
+            if purged:
+                self.stdout.write(f'Purged {purged} finished job(s)')
+
+        if options['processes'] <= 1:
+            _work(options['kinds'], options['loop'], options['interval'], None)
+            return
+
+        # Forked children must not share this process's database connections
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        processes = [
+            context.Process(
+                target=_work, name=f'job-worker-{i}',
+                args=(options['kinds'], options['loop'], options['interval'], None),
+            )
+            for i in range(options['processes'])
+        ]
+        for process in processes:
+            process.start()
+        self.stdout.write(f"Started {len(processes)} worker process(es)")
+
+        def stop(signum, frame):
+            for process in processes:
+                process.terminate()
+        signal.signal(signal.SIGTERM, stop)
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            # Ctrl-C reaches the children too; they requeue their current job
+            for process in processes:
+                process.join()
@@ -0,0 +1,27 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from data_pro.system.expiries import WINDOWS, ExpiryScanner
+
+
+class Command(BaseCommand):
+    help = (
+        'Move visas and passports past their expiry date to the expired status '
+        'and rebuild the per-client expiring-soon buckets '
+        f"({'/'.join(map(str, WINDOWS))} days). Meant to run daily, e.g. from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=ExpiryScanner.batch_size)
+        parser.add_argument('--today', type=date.fromisoformat, help='Scan as of this date (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        scanner = ExpiryScanner(today=options['today'], batch_size=options['batch_size'])
+        for name, (expired, buckets) in scanner.run().items():
+            self.stdout.write(f'{name:<10} {expired:>8} expired  {buckets:>6} bucket rows')
+        self.stdout.write(self.style.SUCCESS(
+            f'Scanned expiries as of {scanner.today} in {time.perf_counter() - started:.2f}s'
+        ))
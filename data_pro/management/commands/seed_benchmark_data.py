@@ -0,0 +1,52 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from data_pro.system import client_stats
+from data_pro.system.metrics import DashboardMetrics
+from data_pro.utils.seeding import BenchmarkDataGenerator
+
+
+class Command(BaseCommand):
+    help = (
+        'Fill the database with synthetic clients, customers and their passports, '
+        'extensions, visas, invoices, vehicles, transports and transport services '
+        'for load testing. Customers are skewed towards a few large clients.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=50)
+        parser.add_argument('--customers', type=int, default=100000, help='Customers across all clients')
+        parser.add_argument(
+            '--skew', type=float, default=1.1,
+            help='Zipf exponent of customers per client; 0 spreads them evenly'
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Random seed, for repeatable data sets')
+        parser.add_argument('--tag', help='Suffix for unique columns; defaults to a timestamp')
+        parser.add_argument('--chunk-size', type=int, help='Customers generated per batch')
+
+    def handle(self, *args, **options):
+        generator = BenchmarkDataGenerator(
+            options['clients'], options['customers'], skew=options['skew'],
+            seed=options['seed'], tag=options['tag'], chunk_size=options['chunk_size'],
+        )
+        started = time.perf_counter()
+
+        def progress(done, counts):
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f'{done:>10} customers  {sum(counts.values()):>10} rows  {elapsed:>8.1f}s')
+
+        with transaction.atomic():
+            counts = generator.generate(progress)
+            # bulk_create bypasses the signals that keep the rollup current
+            client_stats.rebuild([client.pk for client in generator.clients], include_shared=True)
+        DashboardMetrics.invalidate()
+
+        for model, count in sorted(counts.items()):
+            self.stdout.write(f'{model:<20} {count:>10}')
+        largest = generator.clients[0]
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {sum(counts.values())} rows with tag {generator.tag!r} in '
+            f'{time.perf_counter() - started:.1f}s; largest client is #{largest.pk}'
+        ))
@@ -0,0 +1,37 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+
+from data_pro.utils.notifications import BatchedNotifier, outbox_stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Deliver emails queued in the outbox, batching them over a single SMTP '
+        'connection and retrying failures with exponential backoff.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BatchedNotifier.batch_size)
+        parser.add_argument('--max-attempts', type=int, default=BatchedNotifier.max_attempts)
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep polling the outbox instead of exiting once it is drained'
+        )
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds between polls with --loop')
+        parser.add_argument('--stats', action='store_true', help='Print queue depth and latency, then exit')
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            self.stdout.write(json.dumps(outbox_stats(), indent=2))
+            return
+
+        notifier = BatchedNotifier(options['batch_size'], options['max_attempts'])
+        while True:
+            sent, failed = notifier.drain()
+            if sent or failed:
+                self.stdout.write(f'Sent {sent} email(s), {failed} failed')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
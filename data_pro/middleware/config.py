@@ -0,0 +1,19 @@
+from data_pro.system.config import config_cache
+
+
+class SystemConfigMiddleware:
+    """
+    Brings this process's SystemConfiguration cache up to date before each
+    request: one read of the version counter, and a reload only after a
+    change. Views then read settings with get_config() without queries.
+
+    Goes before QueryInstrumentationMiddleware, so the read is not charged
+    to the view's query budget.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        config_cache.sync()
+        with config_cache.pinned():
+            return self.get_response(request)
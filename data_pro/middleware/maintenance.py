@@ -0,0 +1,58 @@
+import math
+
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+
+from data_pro.system.maintenance import MaintenanceSchedule
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+class MaintenanceMiddleware:
+    """
+    Sheds load during maintenance (an active SystemMaintenanceWindow, or
+    the ``maintenance_mode`` system setting): with MAINTENANCE_READ_ONLY
+    (the default) only writes are turned away, otherwise every request is.
+    Refused requests get a 503 with ``Retry-After`` set to the end of the
+    window, as JSON under /api/, before any view runs.
+
+    Superusers and the MAINTENANCE_EXEMPT_PATHS prefixes (the admin and
+    login pages by default) pass, so maintenance can be ended from the
+    site. The schedule is cached per process (see MaintenanceSchedule):
+    a request is checked with one cache read, and reads in read-only
+    mode are not checked at all.
+
+    Goes after AuthenticationMiddleware.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.read_only = getattr(settings, 'MAINTENANCE_READ_ONLY', True)
+        self.exempt_paths = tuple(getattr(settings, 'MAINTENANCE_EXEMPT_PATHS', ('/system-admin/', '/auth/')))
+
+    def __call__(self, request):
+        refused = self.refuse(request)
+        return refused or self.get_response(request)
+
+    def refuse(self, request):
+        if self.read_only and request.method in SAFE_METHODS:
+            return None
+        now = timezone.now()
+        active, window = MaintenanceSchedule.in_maintenance(now)
+        if not active or request.path.startswith(self.exempt_paths):
+            return None
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_superuser:
+            return None
+
+        message = 'The system is in maintenance' + ('; changes are disabled.' if self.read_only else '.')
+        if window is not None:
+            until = timezone.localtime(window.end)
+            message = f'{window.title}: {message} Back by {until:%Y-%m-%d %H:%M}.'
+        if request.path.startswith('/api/'):
+            response = JsonResponse({'detail': message, 'read_only': self.read_only}, status=503)
+        else:
+            response = HttpResponse(message, status=503, content_type='text/plain; charset=utf-8')
+        if window is not None:
+            response['Retry-After'] = str(max(math.ceil((window.end - now).total_seconds()), 1))
+        return response
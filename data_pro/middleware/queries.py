@@ -0,0 +1,165 @@
+import heapq
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r'\bIN \((?:%s|\?)(?:, (?:%s|\?))*\)')
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def fingerprint(sql):
+    """``sql`` with literals and IN lists collapsed, so repeats of one query compare equal"""
+    sql = _IN_LISTS.sub('IN (...)', _LITERALS.sub('?', sql))
+    return ' '.join(sql.split())
+
+
+def query_budget(budget):
+    """Declare the query budget of a function view; class-based views set ``query_budget``"""
+    def decorator(view_func):
+        view_func.query_budget = budget
+        return view_func
+    return decorator
+
+
+def budget_for(view_func):
+    """The ``query_budget`` of a view function, its view class or DRF view, or None"""
+    for target in (view_func, getattr(view_func, 'view_class', None), getattr(view_func, 'cls', None)):
+        budget = getattr(target, 'query_budget', None)
+        if budget is not None:
+            return budget
+    return None
+
+
+class QueryStats:
+    """
+    ``connection.execute_wrapper`` hook counting and timing every query,
+    grouped by fingerprint, and keeping the ``slowest_kept`` slowest.
+    """
+    slowest_kept = 5
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+        self._slowest = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            self.count += 1
+            self.duration += elapsed
+            self.fingerprints[fingerprint(sql)] += 1
+            entry = (elapsed, self.count, sql)
+            if len(self._slowest) < self.slowest_kept:
+                heapq.heappush(self._slowest, entry)
+            else:
+                heapq.heappushpop(self._slowest, entry)
+
+    @contextmanager
+    def record(self):
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self))
+            yield self
+
+    def duplicates(self):
+        """``{fingerprint: count}`` of queries run more than once, most repeated first"""
+        return {sql: count for sql, count in self.fingerprints.most_common() if count > 1}
+
+    def slowest(self):
+        return [(round(elapsed, 2), sql) for elapsed, _, sql in sorted(self._slowest, reverse=True)]
+
+    def as_dict(self):
+        return {
+            'queries': self.count,
+            'sql_ms': round(self.duration, 2),
+            'duplicates': self.duplicates(),
+            'slowest': self.slowest(),
+        }
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Records the queries of every request and reports them:
+
+    - a ``Server-Timing`` header (``db`` and ``app`` durations), when
+      QUERY_TIMING_HEADER is set (default: DEBUG)
+    - a log record on ``data_pro.middleware.queries`` carrying the stats
+      in ``extra['query_stats']``; WARNING when a view exceeds its
+      ``query_budget`` or one fingerprint repeats QUERY_DUPLICATE_THRESHOLD
+      times (a likely N+1), DEBUG otherwise
+    - QueryBudgetExceeded when over budget and QUERY_BUDGET_ENFORCE is set,
+      so tests fail on new N+1 queries
+
+    Queries run while a streaming response is consumed are logged, but
+    come after the headers and are never enforced.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = QueryStats()
+        started = time.perf_counter()
+        request.query_budget = None
+        with stats.record():
+            response = self.get_response(request)
+
+        if response.streaming and not response.is_async:
+            response.streaming_content = self._stream(
+                request, response, response.streaming_content, stats, started
+            )
+        else:
+            self._report(request, response, stats, started, enforce=True)
+        if getattr(settings, 'QUERY_TIMING_HEADER', settings.DEBUG):
+            response['Server-Timing'] = (
+                f'db;dur={stats.duration:.2f};desc="{stats.count} queries", '
+                f'app;dur={(time.perf_counter() - started) * 1000:.2f}'
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = budget_for(view_func)
+
+    def _stream(self, request, response, content, stats, started):
+        with stats.record():
+            yield from content
+        self._report(request, response, stats, started, enforce=False)
+
+    def _report(self, request, response, stats, started, enforce):
+        data = stats.as_dict()
+        data.update(
+            method=request.method,
+            path=request.path,
+            status=response.status_code,
+            total_ms=round((time.perf_counter() - started) * 1000, 2),
+            budget=request.query_budget,
+        )
+        over_budget = request.query_budget is not None and stats.count > request.query_budget
+        threshold = getattr(settings, 'QUERY_DUPLICATE_THRESHOLD', 5)
+        repeated = max(stats.fingerprints.values(), default=0) >= threshold
+
+        level = logging.WARNING if over_budget or repeated else logging.DEBUG
+        logger.log(
+            level, '%s %s: %d queries in %.1f ms (budget %s, %d duplicated)',
+            request.method, request.path, stats.count, stats.duration,
+            request.query_budget, len(data['duplicates']), extra={'query_stats': data},
+        )
+        if over_budget and enforce and getattr(settings, 'QUERY_BUDGET_ENFORCE', False):
+            raise QueryBudgetExceeded(
+                f'{request.method} {request.path} ran {stats.count} queries, '
+                f'budget is {request.query_budget}; duplicates: {data["duplicates"]}'
+            )
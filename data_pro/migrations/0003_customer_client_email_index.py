@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_pro', '0002_customer_customer_type_customer_nationality_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['client', 'email'], name='data_pro_cu_client__113d35_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_pro', '0004_outboundemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClientStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('customers', models.IntegerField(default=0, verbose_name='Customers')),
+                ('active_customers', models.IntegerField(default=0, verbose_name='Active Customers')),
+                ('visas', models.IntegerField(default=0, verbose_name='Visas')),
+                ('pending_visas', models.IntegerField(default=0, verbose_name='Pending Visas')),
+                ('approved_visas', models.IntegerField(default=0, verbose_name='Approved Visas')),
+                ('passports', models.IntegerField(default=0, verbose_name='Passports')),
+                ('pending_passports', models.IntegerField(default=0, verbose_name='Passports In Process')),
+                ('pending_extensions', models.IntegerField(default=0, verbose_name='Pending Extensions')),
+                ('transports', models.IntegerField(default=0, verbose_name='Transports')),
+                ('active_transports', models.IntegerField(default=0, verbose_name='Active Transports')),
+                ('available_vehicles', models.IntegerField(default=0, verbose_name='Available Vehicles')),
+                ('rebuilt_at', models.DateTimeField(blank=True, null=True, verbose_name='Rebuilt At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('client', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='data_pro.client', verbose_name='Client Organization')),
+            ],
+            options={
+                'verbose_name': 'Client Statistics',
+                'verbose_name_plural': 'Client Statistics',
+            },
+        ),
+    ]
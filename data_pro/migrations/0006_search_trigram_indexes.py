@@ -0,0 +1,41 @@
+from django.db import migrations
+
+# Columns searched by data_pro.utils.search, which filters with icontains,
+# i.e. UPPER(column::text) LIKE UPPER(%s) on PostgreSQL
+TRIGRAM_COLUMNS = {
+    'data_pro_customer': ('first_name', 'last_name', 'organization_name', 'email', 'phone'),
+    'data_pro_visa': ('visa_number',),
+    'data_pro_passport': ('passport_number', 'issuing_country'),
+}
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # SQLite gets FTS5 tables from the post_migrate hook instead
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for table, columns in TRIGRAM_COLUMNS.items():
+        for column in columns:
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS {table}_{column}_trgm '
+                f'ON {table} USING gin ((UPPER({column}::text)) gin_trgm_ops)'
+            )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table, columns in TRIGRAM_COLUMNS.items():
+        for column in columns:
+            schema_editor.execute(f'DROP INDEX IF EXISTS {table}_{column}_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_pro', '0005_client_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_pro', '0006_search_trigram_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='visa',
+            name='data_pro_vi_custome_dba12a_idx',
+        ),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['client', 'status'], name='data_pro_cu_client__18a96c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['client', '-created_at'], name='data_pro_cu_client__43aa43_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['-created_at', 'id'], name='data_pro_cu_created_493a61_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['client', '-issue_date'], name='data_pro_in_client__7c11a1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['client', 'status'], name='data_pro_in_client__af15f6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['status'], name='data_pro_in_status_a2e160_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='passport',
+            index=models.Index(fields=['customer', 'expiry_date'], name='data_pro_pa_custome_c4f5c2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='passport',
+            index=models.Index(fields=['customer', 'status'], name='data_pro_pa_custome_b7316e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='passport',
+            index=models.Index(fields=['-expiry_date'], name='data_pro_pa_expiry__54cb09_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='passport',
+            index=models.Index(fields=['-issue_date', 'id'], name='data_pro_pa_issue_d_6ead9f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='passportextension',
+            index=models.Index(fields=['passport', '-apply_date'], name='data_pro_pa_passpor_c0106e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='passportextension',
+            index=models.Index(condition=models.Q(('released_date__isnull', True)), fields=['passport'], name='passportext_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transport',
+            index=models.Index(fields=['customer', 'status'], name='data_pro_tr_custome_f6d164_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transport',
+            index=models.Index(fields=['status'], name='data_pro_tr_status_91aca9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transport',
+            index=models.Index(fields=['-pickup_time'], name='data_pro_tr_pickup__b60937_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transportservice',
+            index=models.Index(fields=['client', 'status', '-scheduled_departure'], name='data_pro_tr_client__fcfc66_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['status'], name='data_pro_ve_status_24ad3c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='visa',
+            index=models.Index(fields=['customer', 'status'], name='data_pro_vi_custome_10954e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='visa',
+            index=models.Index(fields=['-issue_date', 'id'], name='data_pro_vi_issue_d_65b706_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_pro', '0008_background_job'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExpiryBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('visa', 'Visa'), ('passport', 'Passport')], max_length=10, verbose_name='Kind')),
+                ('window_days', models.PositiveSmallIntegerField(verbose_name='Window (Days)')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Count')),
+                ('scanned_on', models.DateField(verbose_name='Scanned On')),
+            ],
+            options={
+                'verbose_name': 'Expiry Bucket',
+                'verbose_name_plural': 'Expiry Buckets',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='passport',
+            index=models.Index(fields=['status', 'expiry_date'], name='data_pro_pa_status_5b1e35_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='visa',
+            index=models.Index(fields=['status', 'expiry_date'], name='data_pro_vi_status_3ac873_idx'),
+        ),
+        migrations.AddField(
+            model_name='expirybucket',
+            name='client',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='expiry_buckets', to='data_pro.client', verbose_name='Client Organization'),
+        ),
+        migrations.AddConstraint(
+            model_name='expirybucket',
+            constraint=models.UniqueConstraint(fields=('client', 'kind', 'window_days'), name='expirybucket_unique_window'),
+        ),
+    ]
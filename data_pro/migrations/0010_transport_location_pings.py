@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_pro', '0009_expiry_buckets'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transportservice',
+            name='location_updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='TransportLocationPing',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('recorded_at', models.DateTimeField()),
+                ('latitude', models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True)),
+                ('longitude', models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True)),
+                ('location', models.CharField(blank=True, default='', max_length=255)),
+                ('service', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='location_pings', to='data_pro.transportservice')),
+            ],
+            options={
+                'ordering': ['service', 'recorded_at'],
+                'indexes': [models.Index(fields=['service', 'recorded_at'], name='data_pro_tr_service_dca77d_idx'), models.Index(fields=['recorded_at'], name='data_pro_tr_recorde_1329bc_idx')],
+            },
+        ),
+    ]
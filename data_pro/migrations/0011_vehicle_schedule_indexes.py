@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:10
+
+from django.db import migrations, models
+
+# Booking table -> (start column, end column, statuses holding the vehicle),
+# as in data_pro.system.scheduling.BOOKINGS
+BOOKING_TABLES = {
+    'data_pro_transport': ('pickup_time', 'dropoff_time', ('pending', 'in_progress')),
+    'data_pro_transportservice': ('scheduled_departure', 'scheduled_arrival', ('scheduled', 'in_transit', 'on_hold')),
+}
+
+
+def create_range_indexes(apps, schema_editor):
+    # Elsewhere VehicleSchedule keeps an in-memory interval index instead
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    for table, (start, end, statuses) in BOOKING_TABLES.items():
+        live = ', '.join(f"'{status}'" for status in statuses)
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {table}_vehicle_span '
+            f'ON {table} USING gist (vehicle_id, '
+            f"TSTZRANGE(LEAST({start}, {end}), GREATEST({start}, {end}), '[)')) "
+            f'WHERE status IN ({live})'
+        )
+
+
+def drop_range_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table in BOOKING_TABLES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {table}_vehicle_span')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_pro', '0010_transport_location_pings'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['vehicle_type', 'capacity'], name='data_pro_ve_vehicle_6cee2f_idx'),
+        ),
+        migrations.RunPython(create_range_indexes, drop_range_indexes),
+    ]
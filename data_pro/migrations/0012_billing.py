@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_pro', '0011_vehicle_schedule_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='invoice',
+            name='period_end',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='transportservice',
+            name='invoice',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='transport_services', to='data_pro.invoice'),
+        ),
+        migrations.AddField(
+            model_name='visa',
+            name='invoice',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='visas', to='data_pro.invoice', verbose_name='Invoice'),
+        ),
+        migrations.CreateModel(
+            name='Sequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=30, verbose_name='Name')),
+                ('last_value', models.BigIntegerField(default=0, verbose_name='Last Value')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sequences', to='data_pro.client', verbose_name='Client Organization')),
+            ],
+            options={
+                'verbose_name': 'Sequence',
+                'verbose_name_plural': 'Sequences',
+                'constraints': [models.UniqueConstraint(fields=('client', 'name'), name='unique_client_sequence')],
+            },
+        ),
+    ]
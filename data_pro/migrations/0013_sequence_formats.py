@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_pro', '0012_billing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sequence',
+            name='format',
+            field=models.CharField(blank=True, help_text='Python format string using {client}, {number} and {year}; blank uses the SEQUENCE_FORMATS default for the name', max_length=100, verbose_name='Format'),
+        ),
+        migrations.AlterField(
+            model_name='invoice',
+            name='invoice_number',
+            field=models.CharField(blank=True, max_length=50, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='transportservice',
+            name='reference_number',
+            field=models.CharField(blank=True, max_length=50, unique=True),
+        ),
+    ]
@@ -0,0 +1,92 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_pro', '0013_sequence_formats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BulkUserImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('csv_file', models.FileField(upload_to='bulk_imports/')),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('PROCESSING', 'Processing'), ('COMPLETED', 'Completed'), ('FAILED', 'Failed')], default='PENDING', max_length=20)),
+                ('total_records', models.PositiveIntegerField(default=0)),
+                ('successful', models.PositiveIntegerField(default=0)),
+                ('failed', models.PositiveIntegerField(default=0)),
+                ('error_log', models.TextField(blank=True)),
+                ('send_welcome_email', models.BooleanField(default=True)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('initiated_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bulk_imports', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Bulk User Import Job',
+                'verbose_name_plural': 'Bulk User Import Jobs',
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='AdminNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('message', models.TextField()),
+                ('severity', models.CharField(choices=[('INFO', 'Information'), ('WARNING', 'Warning'), ('CRITICAL', 'Critical')], default='INFO', max_length=10)),
+                ('is_read', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('recipients', models.ManyToManyField(limit_choices_to={'groups__name__in': ['SuperAdmin', 'ClientAdmin']}, related_name='admin_notifications', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Admin Notification',
+                'verbose_name_plural': 'Admin Notifications',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['is_read'], name='data_pro_ad_is_read_8dffde_idx'), models.Index(fields=['severity'], name='data_pro_ad_severit_569c47_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SystemConfiguration',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('config_type', models.CharField(choices=[('GENERAL', 'General Settings'), ('SECURITY', 'Security Settings'), ('EMAIL', 'Email Settings'), ('MAINTENANCE', 'Maintenance Settings')], default='GENERAL', max_length=20)),
+                ('key', models.CharField(max_length=100, unique=True)),
+                ('value', models.JSONField()),
+                ('description', models.TextField(blank=True)),
+                ('last_modified', models.DateTimeField(auto_now=True)),
+                ('modified_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'System Configuration',
+                'verbose_name_plural': 'System Configurations',
+                'ordering': ['config_type', 'key'],
+                'constraints': [models.UniqueConstraint(fields=('config_type', 'key'), name='unique_config_key_per_type')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SystemMaintenanceWindow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField()),
+                ('start_time', models.DateTimeField()),
+                ('end_time', models.DateTimeField()),
+                ('is_active', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'System Maintenance Window',
+                'verbose_name_plural': 'System Maintenance Windows',
+                'ordering': ['-start_time'],
+                'constraints': [models.CheckConstraint(condition=models.Q(('end_time__gt', models.F('start_time'))), name='end_time_after_start_time')],
+            },
+        ),
+    ]
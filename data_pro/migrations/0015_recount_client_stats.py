@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:05
+
+from django.db import migrations
+
+
+def recount(apps, schema_editor):
+    # Rows written so far counted visas in a 'pending' status that does not
+    # exist, so pending_visas was always 0; recount every client
+    from data_pro.system import client_stats
+
+    client_stats.rebuild(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_pro', '0014_system_configuration'),
+    ]
+
+    operations = [
+        migrations.RunPython(recount, migrations.RunPython.noop),
+    ]
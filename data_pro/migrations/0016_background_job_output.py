@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_pro', '0015_recount_client_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='backgroundjob',
+            name='output_file',
+            field=models.FileField(blank=True, upload_to='jobs/output/', verbose_name='Output File'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:40
+
+from django.db import migrations
+
+
+def seed(apps, schema_editor):
+    # Numbers written before the sequences existed were chosen by callers;
+    # start every counter after the highest of them
+    from data_pro.system import sequences
+
+    sequences.seed(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_pro', '0016_background_job_output'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:55
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_pro', '0017_seed_sequences'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='systemmaintenancewindow',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,52 @@
+from django.http import JsonResponse
+
+from data_pro.utils.pagination import InvalidCursor, KeysetPaginator, estimated_count, keyset_ordering
+
+
+class KeysetPaginationMixin:
+    """
+    Opt-in cursor pagination for the XHR JSON list responses.
+
+    An AJAX request carrying ``?cursor=`` (empty for the first page) is
+    paginated with KeysetPaginator on ``keyset_ordering`` instead of
+    Django's Paginator: ``paginator`` is None in the context and
+    ``page_obj`` is a KeysetPage. ``?count=estimate`` or ``?count=exact``
+    adds a total; by default none is computed.
+    """
+    keyset_ordering = None
+
+    def uses_cursor(self):
+        return (
+            self.request.headers.get('X-Requested-With') == 'XMLHttpRequest'
+            and 'cursor' in self.request.GET
+        )
+
+    def get_keyset_ordering(self, queryset):
+        return self.keyset_ordering or keyset_ordering(queryset.model)
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.uses_cursor():
+            return super().paginate_queryset(queryset, page_size)
+        paginator = KeysetPaginator(queryset, self.get_keyset_ordering(queryset), page_size)
+        page = paginator.page(self.request.GET['cursor'] or None)
+        return None, page, page.object_list, page.has_other_pages()
+
+    def cursor_page_data(self, context):
+        """Cursor links (and the optional total) to merge into the JSON response"""
+        page = context['page_obj']
+        data = {
+            'next_cursor': page.next_cursor,
+            'previous_cursor': page.previous_cursor,
+        }
+        count_mode = self.request.GET.get('count')
+        if count_mode == 'exact':
+            data['count'], data['count_exact'] = self.get_queryset().count(), True
+        elif count_mode == 'estimate':
+            data['count'], data['count_exact'] = estimated_count(self.get_queryset())
+        return data
+
+    def get(self, request, *args, **kwargs):
+        try:
+            return super().get(request, *args, **kwargs)
+        except InvalidCursor:
+            return JsonResponse({'error': 'Invalid cursor'}, status=400)
@@ -0,0 +1,35 @@
+from data_pro.utils.rows import json_response
+
+
+class JSONRowsMixin:
+    """
+    Serves XHR list requests from ``row_serializer`` (a RowSerializer):
+    the page is fetched as values() rows and written straight to JSON
+    under ``rows_key``, with the page-number or cursor pagination fields.
+    Goes before KeysetPaginationMixin in the bases.
+    """
+    row_serializer = None
+    rows_key = 'rows'
+
+    def is_xhr(self):
+        return self.request.headers.get('X-Requested-With') == 'XMLHttpRequest'
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.is_xhr():
+            queryset = self.row_serializer.values(queryset)
+        return super().paginate_queryset(queryset, page_size)
+
+    def render_to_response(self, context, **response_kwargs):
+        if not self.is_xhr():
+            return super().render_to_response(context, **response_kwargs)
+        data = {self.rows_key: self.row_serializer.serialize(context['object_list'])}
+        paginator = context['paginator']
+        if paginator is None:
+            data.update(self.cursor_page_data(context))
+        else:
+            data.update(
+                count=paginator.count,
+                page=context['page_obj'].number,
+                total_pages=paginator.num_pages,
+            )
+        return json_response(data)
@@ -0,0 +1,99 @@
+from django.db import models
+from django.db.models import Q, Sum
+from django.utils.translation import gettext_lazy as _
+
+
+class ClientStats(models.Model):
+    """
+    Per-client rollup of the dashboard counters, kept current by the
+    signals in data_pro.signals and reconciled by rebuild_client_stats.
+
+    The row with no client holds counters that are not tenant scoped
+    (vehicles).
+    """
+    client = models.OneToOneField(
+        'data_pro.Client',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='stats',
+        verbose_name=_('Client Organization')
+    )
+    customers = models.IntegerField(_('Customers'), default=0)
+    active_customers = models.IntegerField(_('Active Customers'), default=0)
+    visas = models.IntegerField(_('Visas'), default=0)
+    pending_visas = models.IntegerField(_('Pending Visas'), default=0)
+    approved_visas = models.IntegerField(_('Approved Visas'), default=0)
+    passports = models.IntegerField(_('Passports'), default=0)
+    pending_passports = models.IntegerField(_('Passports In Process'), default=0)
+    pending_extensions = models.IntegerField(_('Pending Extensions'), default=0)
+    transports = models.IntegerField(_('Transports'), default=0)
+    active_transports = models.IntegerField(_('Active Transports'), default=0)
+    available_vehicles = models.IntegerField(_('Available Vehicles'), default=0)
+    rebuilt_at = models.DateTimeField(_('Rebuilt At'), null=True, blank=True)
+    updated_at = models.DateTimeField(_('Updated At'), auto_now=True)
+
+    def __str__(self):
+        return f"Stats for {self.client or 'all clients'}"
+
+    class Meta:
+        verbose_name = _('Client Statistics')
+        verbose_name_plural = _('Client Statistics')
+
+    @classmethod
+    def counter_names(cls):
+        return [
+            field.name for field in cls._meta.concrete_fields
+            if isinstance(field, models.IntegerField) and not field.primary_key
+        ]
+
+    @classmethod
+    def for_client(cls, client_id):
+        """
+        Counters of one client plus the shared (vehicle) counters, read by
+        primary key; ``client_id=None`` sums every client instead.
+        """
+        names = cls.counter_names()
+        if client_id is None:
+            totals = cls.objects.aggregate(**{name: Sum(name) for name in names})
+            return {name: totals[name] or 0 for name in names}
+
+        counters = dict.fromkeys(names, 0)
+        rows = cls.objects.filter(Q(client_id=client_id) | Q(client__isnull=True)).values('client_id', *names)
+        for row in rows:
+            if row['client_id'] is None:
+                counters['available_vehicles'] = row['available_vehicles']
+            else:
+                counters.update({name: row[name] for name in names if name != 'available_vehicles'})
+        return counters
+
+
+class ExpiryBucket(models.Model):
+    """
+    Per-client count of live visas or passports expiring within
+    ``window_days`` of ``scanned_on``, written by scan_expiries.
+    """
+    class Kind(models.TextChoices):
+        VISA = 'visa', _('Visa')
+        PASSPORT = 'passport', _('Passport')
+
+    client = models.ForeignKey(
+        'data_pro.Client',
+        on_delete=models.CASCADE,
+        related_name='expiry_buckets',
+        verbose_name=_('Client Organization')
+    )
+    kind = models.CharField(_('Kind'), max_length=10, choices=Kind.choices)
+    window_days = models.PositiveSmallIntegerField(_('Window (Days)'))
+    count = models.PositiveIntegerField(_('Count'), default=0)
+    scanned_on = models.DateField(_('Scanned On'))
+
+    def __str__(self):
+        return f"{self.client}: {self.count} {self.kind}(s) expiring within {self.window_days} days"
+
+    class Meta:
+        verbose_name = _('Expiry Bucket')
+        verbose_name_plural = _('Expiry Buckets')
+        constraints = [
+            models.UniqueConstraint(fields=['client', 'kind', 'window_days'], name='expirybucket_unique_window'),
+        ]
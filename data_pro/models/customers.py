@@ -82,4 +82,10 @@ class Customer(models.Model):
     class Meta:
         verbose_name = _('Customer')
         verbose_name_plural = _('Customers')
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['client', 'email']),
+            models.Index(fields=['client', 'status']),
+            models.Index(fields=['client', '-created_at']),
+            models.Index(fields=['-created_at', 'id']),
+        ]
\ No newline at end of file
@@ -10,7 +10,8 @@ class Invoice(models.Model):
         ('cancelled', 'Cancelled'),
     )
     
-    invoice_number = models.CharField(max_length=50, unique=True)
+    # Left blank, it is taken from the client's invoice sequence on save
+    invoice_number = models.CharField(max_length=50, unique=True, blank=True)
     client = models.ForeignKey(Client, on_delete=models.CASCADE, related_name='invoices')
     customer = models.ForeignKey(Customer, on_delete=models.CASCADE, related_name='invoices')
     issue_date = models.DateField()
@@ -21,6 +22,8 @@ class Invoice(models.Model):
     total_amount = models.DecimalField(max_digits=10, decimal_places=2)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='draft')
     notes = models.TextField(blank=True, null=True)
+    # Set on invoices generated by a billing run, to the last day it covers
+    period_end = models.DateField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -28,4 +31,9 @@ class Invoice(models.Model):
         return self.invoice_number
 
     class Meta:
-        ordering = ['-issue_date']
\ No newline at end of file
+        ordering = ['-issue_date']
+        indexes = [
+            models.Index(fields=['client', '-issue_date']),
+            models.Index(fields=['client', 'status']),
+            models.Index(fields=['status']),
+        ]
\ No newline at end of file
@@ -0,0 +1,63 @@
+from django.contrib.auth import get_user_model
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+User = get_user_model()
+
+
+class BackgroundJob(models.Model):
+    """Long-running import or export, queued for the run_workers command"""
+    class StatusChoices(models.TextChoices):
+        PENDING = 'PENDING', _('Pending')
+        PROCESSING = 'PROCESSING', _('Processing')
+        COMPLETED = 'COMPLETED', _('Completed')
+        FAILED = 'FAILED', _('Failed')
+        CANCELLED = 'CANCELLED', _('Cancelled')
+
+    kind = models.CharField(_('Kind'), max_length=50)
+    initiated_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='background_jobs'
+    )
+    input_file = models.FileField(_('Input File'), upload_to='jobs/', blank=True)
+    output_file = models.FileField(_('Output File'), upload_to='jobs/output/', blank=True)
+    params = models.JSONField(_('Parameters'), default=dict, blank=True)
+    status = models.CharField(
+        _('Status'),
+        max_length=20,
+        choices=StatusChoices.choices,
+        default=StatusChoices.PENDING
+    )
+    total_records = models.PositiveIntegerField(_('Total Records'), default=0)
+    processed = models.PositiveIntegerField(_('Processed'), default=0)
+    successful = models.PositiveIntegerField(_('Successful'), default=0)
+    failed = models.PositiveIntegerField(_('Failed'), default=0)
+    result = models.JSONField(_('Result'), default=dict, blank=True)
+    error_log = models.TextField(_('Error Log'), blank=True)
+    cancel_requested = models.BooleanField(_('Cancel Requested'), default=False)
+    attempts = models.PositiveSmallIntegerField(_('Attempts'), default=0)
+    worker = models.CharField(_('Worker'), max_length=100, blank=True)
+    created_at = models.DateTimeField(_('Created At'), auto_now_add=True)
+    started_at = models.DateTimeField(_('Started At'), null=True, blank=True)
+    heartbeat_at = models.DateTimeField(_('Heartbeat At'), null=True, blank=True)
+    completed_at = models.DateTimeField(_('Completed At'), null=True, blank=True)
+
+    class Meta:
+        verbose_name = _('Background Job')
+        verbose_name_plural = _('Background Jobs')
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.id} - {self.get_status_display()}"
+
+    @property
+    def finished(self):
+        return self.status in (
+            self.StatusChoices.COMPLETED, self.StatusChoices.FAILED, self.StatusChoices.CANCELLED
+        )
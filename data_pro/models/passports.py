@@ -36,6 +36,14 @@ class Passport(models.Model):
         ordering = ['-expiry_date']
         verbose_name = _('Passport')
         verbose_name_plural = _('Passports')
+        indexes = [
+            models.Index(fields=['customer', 'expiry_date']),
+            models.Index(fields=['customer', 'status']),
+            models.Index(fields=['-expiry_date']),
+            # scan_expiries: live statuses past their expiry date
+            models.Index(fields=['status', 'expiry_date']),
+            models.Index(fields=['-issue_date', 'id']),
+        ]
 
     def __str__(self):
         return f"{self.passport_number} ({self.issuing_country})"
@@ -77,6 +85,15 @@ class PassportExtension(models.Model):
         ordering = ['-apply_date']
         verbose_name = _('Passport Extension')
         verbose_name_plural = _('Passport Extensions')
+        indexes = [
+            models.Index(fields=['passport', '-apply_date']),
+            # Pending extensions are a small, hot subset of the table
+            models.Index(
+                fields=['passport'],
+                condition=models.Q(released_date__isnull=True),
+                name='passportext_pending_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"Extension for {self.passport.passport_number} ({self.get_duration_display()})"
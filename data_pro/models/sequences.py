@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class Sequence(models.Model):
+    """
+    Per-client counter behind generated document numbers, handed out by
+    data_pro.system.sequences.
+    """
+    client = models.ForeignKey(
+        'data_pro.Client',
+        on_delete=models.CASCADE,
+        related_name='sequences',
+        verbose_name=_('Client Organization')
+    )
+    name = models.CharField(_('Name'), max_length=30)
+    last_value = models.BigIntegerField(_('Last Value'), default=0)
+    format = models.CharField(
+        _('Format'),
+        max_length=100,
+        blank=True,
+        help_text=_('Python format string using {client}, {number} and {year}; '
+                    'blank uses the SEQUENCE_FORMATS default for the name')
+    )
+    updated_at = models.DateTimeField(_('Updated At'), auto_now=True)
+
+    def __str__(self):
+        return f"{self.client} {self.name}: {self.last_value}"
+
+    @staticmethod
+    def default_format(name):
+        return getattr(settings, 'SEQUENCE_FORMATS', {}).get(name, f'{name.upper()}-{{client}}-{{number:06d}}')
+
+    def format_number(self, value):
+        return (self.format or self.default_format(self.name)).format(
+            client=self.client_id, number=value, year=timezone.localdate().year
+        )
+
+    class Meta:
+        verbose_name = _('Sequence')
+        verbose_name_plural = _('Sequences')
+        constraints = [
+            models.UniqueConstraint(fields=['client', 'name'], name='unique_client_sequence'),
+        ]
@@ -3,52 +3,9 @@ from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
 
-User = get_user_model()
+from data_pro.models.AdminAuditLog import AdminAuditLog
 
-class AdminAuditLog(models.Model):
-    """Tracks all administrative actions performed by superusers"""
-    class ActionTypes(models.TextChoices):
-        USER_CREATE = 'USER_CREATE', _('User Creation')
-        USER_EDIT = 'USER_EDIT', _('User Modification')
-        USER_DELETE = 'USER_DELETE', _('User Deletion')
-        CLIENT_CREATE = 'CLIENT_CREATE', _('Client Creation')
-        CLIENT_EDIT = 'CLIENT_EDIT', _('Client Modification')
-        CLIENT_DELETE = 'CLIENT_DELETE', _('Client Deletion')
-        SYSTEM_CONFIG = 'SYSTEM_CONFIG', _('System Configuration Change')
-
-    admin = models.ForeignKey(
-        User,
-        on_delete=models.SET_NULL,
-        null=True,
-        related_name='admin_actions'
-    )
-    action_type = models.CharField(
-        max_length=20,
-        choices=ActionTypes.choices
-    )
-    target_user = models.ForeignKey(
-        User,
-        on_delete=models.SET_NULL,
-        null=True,
-        blank=True,
-        related_name='admin_actions_against'
-    )
-    description = models.TextField()
-    ip_address = models.GenericIPAddressField()
-    timestamp = models.DateTimeField(auto_now_add=True)
-
-    class Meta:
-        verbose_name = _('Admin Audit Log')
-        verbose_name_plural = _('Admin Audit Logs')
-        ordering = ['-timestamp']
-        indexes = [
-            models.Index(fields=['admin']),
-            models.Index(fields=['action_type']),
-            models.Index(fields=['timestamp']),
-        ]
-
-    def __str__(self):
-        return f"{self.admin} - {self.get_action_type_display()} at {self.timestamp}"
+User = get_user_model()
 
 class SystemConfiguration(models.Model):
     """Stores system-wide configuration settings"""
@@ -171,6 +128,7 @@ class SystemMaintenanceWindow(models.Model):
         null=True
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = _('System Maintenance Window')
@@ -178,7 +136,7 @@ class SystemMaintenanceWindow(models.Model):
         ordering = ['-start_time']
         constraints = [
             models.CheckConstraint(
-                check=models.Q(end_time__gt=models.F('start_time')),
+                condition=models.Q(end_time__gt=models.F('start_time')),
                 name='end_time_after_start_time'
             )
         ]
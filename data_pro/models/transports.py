@@ -1,9 +1,11 @@
 from django.db import models
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from .customers import *
 from .vehicles import *
 from .clients import *
+from .invoices import Invoice
 
 User = get_user_model()
 
@@ -17,7 +19,8 @@ class TransportService(models.Model):
     )
 
     # Core transport information
-    reference_number = models.CharField(max_length=50, unique=True)
+    # Left blank, these are taken from the client's sequences on save
+    reference_number = models.CharField(max_length=50, unique=True, blank=True)
     customer = models.ForeignKey(Customer, on_delete=models.CASCADE, related_name='transport_services')
     vehicle = models.ForeignKey(Vehicle, on_delete=models.SET_NULL, null=True, blank=True, related_name='assigned_transports')
     
@@ -25,6 +28,7 @@ class TransportService(models.Model):
     origin = models.CharField(max_length=255)
     destination = models.CharField(max_length=255)
     current_location = models.CharField(max_length=255, blank=True, null=True)
+    location_updated_at = models.DateTimeField(null=True, blank=True)
     
     # Timing information
     scheduled_departure = models.DateTimeField()
@@ -44,6 +48,7 @@ class TransportService(models.Model):
     base_fare = models.DecimalField(max_digits=10, decimal_places=2)
     additional_charges = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
     discount = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
+    invoice = models.ForeignKey(Invoice, on_delete=models.SET_NULL, null=True, blank=True, related_name='transport_services')
     
     # Additional details
     special_instructions = models.TextField(blank=True, null=True)
@@ -73,20 +78,24 @@ class TransportService(models.Model):
     def is_completed(self):
         return self.status == 'delivered'
 
+    # Status -> statuses it may move to
+    VALID_TRANSITIONS = {
+        'scheduled': ['in_transit', 'cancelled', 'on_hold'],
+        'in_transit': ['delivered', 'cancelled', 'on_hold'],
+        'on_hold': ['in_transit', 'cancelled'],
+    }
+    # Status -> timestamp set when a service enters it
+    TRANSITION_TIMESTAMPS = {
+        'in_transit': 'actual_departure',
+        'delivered': 'actual_arrival',
+    }
+
     def update_status(self, new_status, user=None):
         """Helper method to safely update transport status"""
-        valid_transitions = {
-            'scheduled': ['in_transit', 'cancelled', 'on_hold'],
-            'in_transit': ['delivered', 'cancelled', 'on_hold'],
-            'on_hold': ['in_transit', 'cancelled'],
-        }
-        
-        if new_status in valid_transitions.get(self.status, []):
+        if new_status in self.VALID_TRANSITIONS.get(self.status, []):
             self.status = new_status
-            if new_status == 'in_transit':
-                self.actual_departure = timezone.now()
-            elif new_status == 'delivered':
-                self.actual_arrival = timezone.now()
+            if new_status in self.TRANSITION_TIMESTAMPS:
+                setattr(self, self.TRANSITION_TIMESTAMPS[new_status], timezone.now())
             
             if user:
                 self.updated_by = user
@@ -94,6 +103,56 @@ class TransportService(models.Model):
             return True
         return False
 
+    def clean(self):
+        from data_pro.system.scheduling import VehicleSchedule
+        VehicleSchedule().check(self)
+
+    @classmethod
+    def sources_of(cls, new_status):
+        """Statuses from which ``new_status`` may be entered"""
+        return [status for status, targets in cls.VALID_TRANSITIONS.items() if new_status in targets]
+
+    @classmethod
+    def bulk_update_status(cls, ids, new_status, user=None, queryset=None):
+        """
+        update_status() for many services: the current statuses are read
+        with one query and every valid transition applied with one
+        ``UPDATE ... WHERE status IN (<valid sources>)``, so a service
+        changed by someone else in between is left alone and reported as
+        a conflict. Returns ``{id: (result, previous status)}`` in the order of ``ids``, where
+        result is 'updated', 'invalid_transition', 'conflict' or 'not_found'.
+        """
+        queryset = cls.objects.all() if queryset is None else queryset
+        ids = list(dict.fromkeys(ids))
+        current = dict(queryset.filter(pk__in=ids).values_list('pk', 'status'))
+        sources = cls.sources_of(new_status)
+
+        results = {pk: ('not_found', None) for pk in ids if pk not in current}
+        valid = []
+        for pk, status in current.items():
+            if status in sources:
+                valid.append(pk)
+            else:
+                results[pk] = ('invalid_transition', status)
+        if not valid:
+            return {pk: results[pk] for pk in ids}
+
+        now = timezone.now()
+        values = {'status': new_status, 'updated_at': now}
+        if new_status in cls.TRANSITION_TIMESTAMPS:
+            values[cls.TRANSITION_TIMESTAMPS[new_status]] = now
+        if user:
+            values['updated_by'] = user
+        updated = queryset.filter(pk__in=valid, status__in=sources).update(**values)
+
+        if updated == len(valid):
+            results.update((pk, ('updated', current[pk])) for pk in valid)
+        else:
+            # Some rows moved meanwhile: ours are the ones now stamped with our update
+            ours = set(queryset.filter(pk__in=valid, status=new_status, updated_at=now).values_list('pk', flat=True))
+            results.update((pk, ('updated' if pk in ours else 'conflict', current[pk])) for pk in valid)
+        return {pk: results[pk] for pk in ids}
+
     class Meta:
         ordering = ['-scheduled_departure']
         verbose_name = 'Transport Service'
@@ -102,6 +161,38 @@ class TransportService(models.Model):
             models.Index(fields=['reference_number']),
             models.Index(fields=['status']),
             models.Index(fields=['scheduled_departure']),
+            models.Index(fields=['client', 'status', '-scheduled_departure']),
+        ]
+
+
+class TransportLocationPing(models.Model):
+    """
+    One position report of a transport service. Append-only: rows are
+    written with bulk_create by data_pro.system.tracking and only ever
+    removed by prune_location_pings.
+    """
+    service = models.ForeignKey(TransportService, on_delete=models.CASCADE, related_name='location_pings', db_index=False)
+    recorded_at = models.DateTimeField()
+    latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    location = models.CharField(max_length=255, blank=True, default='')
+
+    def __str__(self):
+        return f"{self.service_id} @ {self.recorded_at:%Y-%m-%d %H:%M:%S}"
+
+    @property
+    def label(self):
+        """What the ping sets as the service's current_location"""
+        if self.location:
+            return self.location
+        return f"{self.latitude},{self.longitude}"
+
+    class Meta:
+        ordering = ['service', 'recorded_at']
+        indexes = [
+            # Serves the per-service history and the retention scan
+            models.Index(fields=['service', 'recorded_at']),
+            models.Index(fields=['recorded_at']),
         ]
 
 class Transport(models.Model):
@@ -128,5 +219,14 @@ class Transport(models.Model):
     def __str__(self):
         return f"Transport #{self.id} - {self.customer}"
 
+    def clean(self):
+        from data_pro.system.scheduling import VehicleSchedule
+        VehicleSchedule().check(self)
+
     class Meta:
-        ordering = ['-pickup_time']
\ No newline at end of file
+        ordering = ['-pickup_time']
+        indexes = [
+            models.Index(fields=['customer', 'status']),
+            models.Index(fields=['status']),
+            models.Index(fields=['-pickup_time']),
+        ]
\ No newline at end of file
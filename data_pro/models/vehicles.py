@@ -30,4 +30,8 @@ class Vehicle(models.Model):
         return f"{self.make} {self.model} ({self.license_plate})"
 
     class Meta:
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status']),
+            models.Index(fields=['vehicle_type', 'capacity']),
+        ]
\ No newline at end of file
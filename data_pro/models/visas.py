@@ -93,6 +93,14 @@ class Visa(models.Model):
         blank=True,
         verbose_name=_('Released Date')
     )
+    invoice = models.ForeignKey(
+        'data_pro.Invoice',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='visas',
+        verbose_name=_('Invoice')
+    )
     handed_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.SET_NULL,
@@ -166,7 +174,10 @@ class Visa(models.Model):
         ordering = ['-issue_date']
         indexes = [
             models.Index(fields=['visa_number']),
-            models.Index(fields=['customer']),
             models.Index(fields=['status']),
             models.Index(fields=['expiry_date']),
+            # scan_expiries: live statuses past their expiry date
+            models.Index(fields=['status', 'expiry_date']),
+            models.Index(fields=['customer', 'status']),
+            models.Index(fields=['-issue_date', 'id']),
         ]
\ No newline at end of file
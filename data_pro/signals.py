@@ -1,26 +1,34 @@
-from django.db.models.signals import post_save, pre_save, post_delete, pre_delete
+from django.core.management import call_command
+from django.db.models.signals import post_save, pre_save, post_delete, pre_delete, post_migrate
+from django.db import transaction
 from django.dispatch import receiver
-from django.core.mail import send_mail
 from django.template.loader import render_to_string
-from django.conf import settings
+from data_pro.models.clients import  *
 from data_pro.models.customers import  *
 from data_pro.models.visas import  *
 from data_pro.models.passports import  *
 from data_pro.models.invoices import  *
 from data_pro.models.vehicles import  *
 from data_pro.models.transports import  *
-from data_pro.models.user import *
+from data_pro.utils.notifications import queue_email
+from data_pro.system.metrics import DashboardMetrics, client_id_for
+from data_pro.system import client_stats, sequences
+from data_pro.system.reports import visa_report
+from data_pro.system.scheduling import VehicleSchedule
+from data_pro.system.config import ConfigCache
+from data_pro.system.maintenance import MaintenanceSchedule
+from data_pro.models.superuser import SystemConfiguration, SystemMaintenanceWindow
+from data_pro.utils.search import SQLiteFTSSearchBackend, get_backend
 from django.contrib.auth import get_user_model
 User = get_user_model()  # Use Django
 
 
 # User Signals
-@receiver(post_save, sender=CustomUser)
+@receiver(post_save, sender=User)
 def user_post_save(sender, instance, created, **kwargs):
     """
     Signal for post-save actions on User model.
     - Send welcome email to new users
-    - Create related profile if needed
     """
     if created:
         # Send welcome email
@@ -28,58 +36,19 @@ def user_post_save(sender, instance, created, **kwargs):
         message = render_to_string('emails/welcome_email.txt', {
             'user': instance,
         })
-        send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL,
-            [instance.email],
-            fail_silently=True,
-        )
-
-        # Log user creation
-        print(f"New user created: {instance.username}")
-
-@receiver(pre_save, sender=CustomUser)
+        queue_email(subject, message, [instance.email])
+
+@receiver(pre_save, sender=User)
 def user_pre_save(sender, instance, **kwargs):
     """
     Signal for pre-save actions on User model.
     - Normalize email
     - Set default values
     """
-    if not instance.user_type:
+    if hasattr(instance, 'user_type') and not instance.user_type:
         instance.user_type = 'USER'
-    instance.email = instance.email.lower()
-
-# Client Signals
-@receiver(post_save, sender=Client)
-def client_post_save(sender, instance, created, **kwargs):
-    """
-    Signal for post-save actions on Client model.
-    - Create default admin user for new clients
-    - Send notification emails
-    """
-    if created:
-        # Create client admin user
-        admin_username = f"{instance.company_name.lower().replace(' ', '_')}_admin"
-        admin_email = f"admin@{instance.company_name.lower().replace(' ', '')}.com"
-        
-        admin_user = CustomUser.objects.create_user(
-            username=admin_username,
-            email=admin_email,
-            password=CustomUser.objects.make_random_password(),
-            user_type='CLIENT_ADMIN'
-        )
-        instance.user = admin_user
-        instance.save()
-
-@receiver(pre_delete, sender=Client)
-def client_pre_delete(sender, instance, **kwargs):
-    """
-    Signal for pre-delete actions on Client model.
-    - Clean up related users
-    """
-    if instance.user:
-        instance.user.delete()
+    if instance.email:
+        instance.email = instance.email.lower()
 
 # Customer Signals
 @receiver(post_save, sender=Customer)
@@ -94,13 +63,7 @@ def customer_post_save(sender, instance, created, **kwargs):
         message = render_to_string('emails/customer_welcome.txt', {
             'customer': instance,
         })
-        send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL,
-            [instance.email],
-            fail_silently=True,
-        )
+        queue_email(subject, message, [instance.email])
 
 # Invoice Signals
 @receiver(post_save, sender=Invoice)
@@ -115,13 +78,7 @@ def invoice_post_save(sender, instance, created, **kwargs):
         message = render_to_string('emails/new_invoice.txt', {
             'invoice': instance,
         })
-        send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL,
-            [instance.customer.email],
-            fail_silently=True,
-        )
+        queue_email(subject, message, [instance.customer.email])
 
 @receiver(pre_save, sender=Invoice)
 def invoice_pre_save(sender, instance, **kwargs):
@@ -129,9 +86,24 @@ def invoice_pre_save(sender, instance, **kwargs):
     Signal for pre-save actions on Invoice model.
     - Calculate totals
     - Set default values
+    - Number from the client's invoice sequence when left blank
     """
     if not instance.total_amount:
         instance.total_amount = instance.amount + instance.tax - instance.discount
+    if not instance.invoice_number:
+        instance.invoice_number = sequences.next_number(instance.client_id, 'invoice')
+
+# Transport Service Signals
+@receiver(pre_save, sender=TransportService)
+def transport_service_pre_save(sender, instance, **kwargs):
+    """
+    Signal for pre-save actions on TransportService model.
+    - Reference number and, for new services, tracking code from the client's sequences when left blank
+    """
+    if not instance.reference_number:
+        instance.reference_number = sequences.next_number(instance.client_id, 'transport_reference')
+    if instance._state.adding and not instance.tracking_code:
+        instance.tracking_code = sequences.next_number(instance.client_id, 'tracking_code')
 
 # Transport Signals
 @receiver(post_save, sender=Transport)
@@ -175,10 +147,121 @@ def visa_post_save(sender, instance, created, **kwargs):
         message = render_to_string('emails/visa_status_update.txt', {
             'visa': instance,
         })
-        send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL,
-            [instance.customer.email],
-            fail_silently=True,
-        )
\ No newline at end of file
+        queue_email(subject, message, [instance.customer.email])
+
+# Client Statistics Signals
+@receiver([pre_save, pre_delete], sender=Customer)
+@receiver([pre_save, pre_delete], sender=Visa)
+@receiver([pre_save, pre_delete], sender=Passport)
+@receiver([pre_save, pre_delete], sender=PassportExtension)
+@receiver([pre_save, pre_delete], sender=Vehicle)
+@receiver([pre_save, pre_delete], sender=Transport)
+def client_stats_pre_change(sender, instance, **kwargs):
+    """
+    Signal for pre-save and pre-delete actions on models counted in ClientStats.
+    - Record the counters the stored row currently counts toward
+    """
+    client_stats.remember(sender, instance)
+
+@receiver(post_save, sender=Customer)
+@receiver(post_save, sender=Visa)
+@receiver(post_save, sender=Passport)
+@receiver(post_save, sender=PassportExtension)
+@receiver(post_save, sender=Vehicle)
+@receiver(post_save, sender=Transport)
+def client_stats_post_save(sender, instance, **kwargs):
+    """
+    Signal for post-save actions on models counted in ClientStats.
+    - Increment/decrement the owning client's counters on create and status change
+    """
+    client_stats.saved(sender, instance)
+
+@receiver(post_delete, sender=Customer)
+@receiver(post_delete, sender=Visa)
+@receiver(post_delete, sender=Passport)
+@receiver(post_delete, sender=PassportExtension)
+@receiver(post_delete, sender=Vehicle)
+@receiver(post_delete, sender=Transport)
+def client_stats_post_delete(sender, instance, **kwargs):
+    """
+    Signal for post-delete actions on models counted in ClientStats.
+    - Decrement the owning client's counters
+    """
+    client_stats.deleted(sender, instance)
+
+# Dashboard Metrics Signals
+@receiver([post_save, post_delete], sender=Customer)
+@receiver([post_save, post_delete], sender=Visa)
+@receiver([post_save, post_delete], sender=Passport)
+@receiver([post_save, post_delete], sender=PassportExtension)
+@receiver([post_save, post_delete], sender=Vehicle)
+@receiver([post_save, post_delete], sender=Transport)
+def dashboard_metrics_changed(sender, instance, **kwargs):
+    """
+    Signal for changes to models counted on the dashboards.
+    - Invalidate the cached counters of the affected tenant
+    """
+    DashboardMetrics.invalidate(client_id_for(instance))
+
+# Report Cache Signals
+@receiver([post_save, post_delete], sender=Customer)
+@receiver([post_save, post_delete], sender=Visa)
+def visa_report_changed(sender, instance, **kwargs):
+    """
+    Signal for changes to rows in the visa export.
+    - Rebuild the affected tenant's recently downloaded exports once committed
+    """
+    client_id = client_id_for(instance)
+    transaction.on_commit(lambda: visa_report.schedule_refresh(client_id))
+
+# Vehicle Schedule Signals
+@receiver([post_save, post_delete], sender=Transport)
+@receiver([post_save, post_delete], sender=TransportService)
+def vehicle_schedule_changed(sender, instance, **kwargs):
+    """
+    Signal for changes to vehicle bookings.
+    - Rebuild the in-memory schedule index once committed
+    """
+    transaction.on_commit(VehicleSchedule.invalidate)
+
+# System Configuration Signals
+@receiver([post_save, post_delete], sender=SystemConfiguration)
+def system_configuration_changed(sender, instance, **kwargs):
+    """
+    Signal for changes to system configuration.
+    - Make every process reload its cached settings once committed
+    """
+    transaction.on_commit(ConfigCache.invalidate)
+
+# Maintenance Window Signals
+@receiver([post_save, post_delete], sender=SystemMaintenanceWindow)
+def maintenance_window_changed(sender, instance, **kwargs):
+    """
+    Signal for changes to maintenance windows.
+    - Make every process reload its maintenance schedule once committed
+    """
+    transaction.on_commit(MaintenanceSchedule.invalidate)
+
+# Search Index Signals
+@receiver(post_migrate)
+def search_index_post_migrate(sender, using='default', **kwargs):
+    """
+    Signal for post-migrate actions on the data_pro app.
+    - Create or repair the SQLite FTS5 search tables and their sync triggers
+    """
+    if sender.name != 'data_pro':
+        return
+    backend = get_backend(using)
+    if isinstance(backend, SQLiteFTSSearchBackend):
+        backend.install()
+
+# Cache Table Signals
+@receiver(post_migrate)
+def cache_table_post_migrate(sender, using='default', **kwargs):
+    """
+    Signal for post-migrate actions on the data_pro app.
+    - Create the table of the database cache backend, if one is configured
+    """
+    if sender.name != 'data_pro':
+        return
+    call_command('createcachetable', database=using, verbosity=0)
@@ -0,0 +1,148 @@
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import DecimalField, Exists, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Round
+from django.utils import timezone
+
+from data_pro.models.invoices import Invoice
+from data_pro.models.transports import TransportService
+from data_pro.models.visas import Visa
+from data_pro.system import sequences
+
+INVOICE_SEQUENCE = 'invoice'
+
+MONEY = DecimalField(max_digits=12, decimal_places=2)
+CENT = Decimal('0.01')
+
+# Billable model -> its invoice line amount as a database expression
+# (TransportService.total_fare, and the total_cost Visa.save() stores)
+LINE_AMOUNTS = {
+    TransportService: F('base_fare') + F('additional_charges') - F('discount'),
+    Visa: F('total_cost'),
+}
+
+
+def last_month_end(today=None):
+    today = today or timezone.localdate()
+    return today.replace(day=1) - timedelta(days=1)
+
+
+class BillingRun:
+    """
+    Invoices one client's delivered transport services and released
+    visas that no invoice covers yet, up to ``period_end`` (by default
+    the end of last month): one draft invoice per customer.
+
+    Nothing is summed in Python. The invoices are written with
+    bulk_create and numbered from the client's invoice Sequence. Each
+    billable table is then linked to them with one UPDATE, and their
+    amounts, tax (BILLING_TAX_RATE) and totals are computed with two more
+    UPDATEs from correlated SUM subqueries over the linked rows. The
+    query count does not grow with the number of billed rows.
+
+    The run is one transaction and holds the sequence lock throughout, so
+    invoice numbers stay gap-free and runs for one client never overlap.
+    """
+
+    def __init__(self, client, period_end=None, issue_date=None):
+        self.client = client
+        self.period_end = period_end or last_month_end()
+        self.issue_date = issue_date or timezone.localdate()
+        self.tax_rate = Decimal(str(getattr(settings, 'BILLING_TAX_RATE', 0)))
+        self.payment_terms = timedelta(days=getattr(settings, 'BILLING_PAYMENT_TERMS_DAYS', 30))
+
+    def billable(self):
+        """``{model: rows of the client due on this run}``"""
+        until = timezone.make_aware(datetime.combine(self.period_end + timedelta(days=1), time.min))
+        return {
+            TransportService: TransportService.objects.filter(
+                client=self.client, status='delivered', invoice__isnull=True,
+            ).filter(
+                Q(actual_arrival__lt=until) | Q(actual_arrival__isnull=True, scheduled_arrival__lt=until)
+            ),
+            Visa: Visa.objects.filter(
+                customer__client=self.client, status=Visa.Status.RELEASED, invoice__isnull=True,
+            ).filter(
+                Q(released_date__lte=self.period_end) | Q(released_date__isnull=True)
+            ),
+        }
+
+    @staticmethod
+    def _billed(model):
+        """Sum of the ``model`` lines of the outer invoice"""
+        lines = (
+            model.objects.filter(invoice=OuterRef('pk')).order_by().values('invoice')
+            .annotate(total=Sum(LINE_AMOUNTS[model], output_field=MONEY)).values('total')
+        )
+        return Coalesce(Subquery(lines, output_field=MONEY), Value(Decimal('0.00')), output_field=MONEY)
+
+    @transaction.atomic
+    def run(self):
+        """Returns ``{'invoices', 'lines': {model name: count}, 'total', 'first_number', 'last_number'}``"""
+        sequence = sequences.lock(self.client, INVOICE_SEQUENCE)
+        billable = self.billable()
+        customer_ids = set()
+        for queryset in billable.values():
+            customer_ids.update(queryset.order_by().values_list('customer_id', flat=True).distinct())
+        result = {
+            'invoices': 0,
+            'lines': {model._meta.model_name: 0 for model in billable},
+            'total': Decimal('0.00'),
+            'first_number': None,
+            'last_number': None,
+        }
+        if not customer_ids:
+            return result
+
+        first = sequence.last_value + 1
+        invoices = Invoice.objects.bulk_create([
+            Invoice(
+                invoice_number=sequence.format_number(first + i), client=self.client, customer_id=customer_id,
+                issue_date=self.issue_date, due_date=self.issue_date + self.payment_terms,
+                amount=0, tax=0, discount=0, total_amount=0, period_end=self.period_end,
+                notes=f'Transport services and visas up to {self.period_end:%d %b %Y}',
+            )
+            for i, customer_id in enumerate(sorted(customer_ids))
+        ], batch_size=1000)
+        pks = [invoice.pk for invoice in invoices]
+        # Manual invoices never have period_end, and the sequence lock keeps other runs out of the range
+        ours = Invoice.objects.filter(client=self.client, period_end=self.period_end, pk__range=(min(pks), max(pks)))
+
+        for model, queryset in billable.items():
+            result['lines'][model._meta.model_name] = queryset.update(
+                invoice=Subquery(ours.filter(customer=OuterRef('customer_id')).values('pk')[:1])
+            )
+        ours.update(amount=Round(sum((self._billed(model) for model in LINE_AMOUNTS), Value(Decimal('0.00'))), 2))
+        tax = Round(F('amount') * Value(self.tax_rate, output_field=MONEY), 2)
+        ours.update(tax=tax, total_amount=F('amount') + tax - F('discount'))
+
+        # Customers whose rows changed status since they were counted end up with nothing to bill
+        has_lines = Q()
+        for model in LINE_AMOUNTS:
+            has_lines |= Exists(model.objects.filter(invoice=OuterRef('pk')))
+        empty = set(ours.exclude(has_lines).values_list('pk', flat=True))
+        kept = len(invoices) - len(empty)
+        if empty:
+            self._close_gaps(sequence, invoices, empty, first)
+
+        sequence.last_value = first + kept - 1
+        sequence.save(update_fields=['last_value', 'updated_at'])
+        result.update(
+            invoices=kept,
+            total=(ours.aggregate(total=Sum('total_amount'))['total'] or Decimal('0')).quantize(CENT),
+            first_number=sequence.format_number(first) if kept else None,
+            last_number=sequence.format_number(sequence.last_value) if kept else None,
+        )
+        return result
+
+    def _close_gaps(self, sequence, invoices, empty, first):
+        """Drop the empty invoices and renumber the last ones into their numbers"""
+        Invoice.objects.filter(pk__in=empty).delete()
+        kept = len(invoices) - len(empty)
+        holes = [i for i, invoice in enumerate(invoices[:kept]) if invoice.pk in empty]
+        movers = [invoice for invoice in invoices[kept:] if invoice.pk not in empty]
+        for i, invoice in zip(holes, movers):
+            Invoice.objects.filter(pk=invoice.pk).update(invoice_number=sequence.format_number(first + i))
@@ -0,0 +1,252 @@
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from data_pro.models.client_stats import ClientStats
+from data_pro.models.clients import Client
+from data_pro.models.customers import Customer
+from data_pro.models.passports import Passport, PassportExtension
+from data_pro.models.transports import Transport
+from data_pro.models.vehicles import Vehicle
+from data_pro.models.visas import Visa
+from data_pro.system.metrics import TENANT_PATHS, client_id_for, remember_client_id
+
+# ClientStats counter -> field conditions a row must meet to be counted.
+# A condition value of None means "is null", a tuple means "is one of".
+COUNTERS = {
+    Customer: {
+        'customers': {},
+        'active_customers': {'status': 'active'},
+    },
+    Visa: {
+        'visas': {},
+        'pending_visas': {'status': Visa.Status.PROCESSING},
+        'approved_visas': {'status': Visa.Status.APPROVED},
+    },
+    Passport: {
+        'passports': {},
+        'pending_passports': {'status': 'in_process'},
+    },
+    PassportExtension: {
+        'pending_extensions': {'released_date': None},
+    },
+    Transport: {
+        'transports': {},
+        'active_transports': {'status': ('pending', 'in_progress')},
+    },
+    Vehicle: {
+        'available_vehicles': {'status': 'available'},
+    },
+}
+
+
+def _q(conditions):
+    lookups = {}
+    for field, value in conditions.items():
+        if value is None:
+            lookups[f'{field}__isnull'] = True
+        elif isinstance(value, tuple):
+            lookups[f'{field}__in'] = value
+        else:
+            lookups[field] = value
+    return Q(**lookups)
+
+
+def _matches(values, conditions):
+    for field, value in conditions.items():
+        if isinstance(value, tuple):
+            if values[field] not in value:
+                return False
+        elif values[field] != value:
+            return False
+    return True
+
+
+def _fields(model):
+    return {field for conditions in COUNTERS[model].values() for field in conditions}
+
+
+def _link(model):
+    """Attname of the first hop of the model's tenant path, e.g. ``customer_id``"""
+    path = TENANT_PATHS.get(model)
+    return f"{path.split('__')[0]}_id" if path else None
+
+
+def _state(model, values, client_id):
+    return client_id, values.get(_link(model)), {
+        name for name, conditions in COUNTERS[model].items() if _matches(values, conditions)
+    }
+
+
+def _apply(client_id, deltas, create=True):
+    """
+    Add ``deltas`` to the client's row. Callers run after the change is
+    written, so a missing row is created by a recount, which already
+    includes it, rather than from zero.
+    """
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    rows = ClientStats.objects.filter(client_id=client_id)
+    updates = {name: F(name) + delta for name, delta in deltas.items()}
+    if not rows.update(**updates) and create:
+        if client_id is None:
+            rebuild(client_ids=[], include_shared=True)
+        else:
+            rebuild(client_ids=[client_id])
+
+
+def remember(model, instance):
+    """pre_save / pre_delete: record which counters the stored row counts toward"""
+    if instance._state.adding or instance.pk is None:
+        instance._client_stats = None
+        return
+    fields = _fields(model)
+    link = _link(model)
+    lookups = {'tenant': F(f'{TENANT_PATHS[model]}_id')} if model in TENANT_PATHS else {}
+    values = model.objects.filter(pk=instance.pk).values(*fields, *([link] if link else []), **lookups).first()
+    if values is None:
+        instance._client_stats = None
+        return
+    instance._client_stats = _state(model, values, values.get('tenant'))
+    # The owner of the stored parent; the instance may already point at another
+    remember_client_id(instance, values.get('tenant'), values.get(link))
+
+
+def saved(model, instance):
+    """post_save: move the instance between counters after a create or status change"""
+    previous = getattr(instance, '_client_stats', None)
+    values = {field: getattr(instance, field) for field in _fields(model)}
+    link = _link(model)
+    if link:
+        values[link] = getattr(instance, link)
+
+    client_id = client_id_for(instance)
+    current = _state(model, values, client_id)
+
+    if previous is None:
+        _apply(client_id, dict.fromkeys(current[2], 1))
+    elif previous[0] == client_id:
+        _apply(client_id, {
+            **dict.fromkeys(previous[2] - current[2], -1),
+            **dict.fromkeys(current[2] - previous[2], 1),
+        })
+    else:
+        _apply(previous[0], dict.fromkeys(previous[2], -1))
+        _apply(client_id, dict.fromkeys(current[2], 1))
+    instance._client_stats = current
+
+
+def deleted(model, instance):
+    """post_delete: drop the instance from the counters recorded by remember()"""
+    previous = getattr(instance, '_client_stats', None)
+    if previous is not None:
+        # Never recreate a row here: a cascading Client delete removes it too
+        _apply(previous[0], dict.fromkeys(previous[2], -1), create=False)
+    instance._client_stats = None
+
+
+def transitioned(model, rows, field, value):
+    """
+    Counter updates for rows moved to ``field=value`` by QuerySet.update(),
+    which skips the signals. ``rows`` are ``(client_id, old value)`` pairs;
+    counters with conditions on other fields are left alone.
+    """
+    if model not in COUNTERS:
+        return
+    counters = {
+        name: conditions for name, conditions in COUNTERS[model].items()
+        if field in conditions and set(conditions) == {field}
+    }
+    after = {name for name, conditions in counters.items() if _matches({field: value}, conditions)}
+    deltas = {}
+    for client_id, old in rows:
+        before = {name for name, conditions in counters.items() if _matches({field: old}, conditions)}
+        client_deltas = deltas.setdefault(client_id, {})
+        for name in before - after:
+            client_deltas[name] = client_deltas.get(name, 0) - 1
+        for name in after - before:
+            client_deltas[name] = client_deltas.get(name, 0) + 1
+    for client_id, client_deltas in deltas.items():
+        _apply(client_id, client_deltas)
+
+
+def _resolve(model, apps):
+    """``model``, or its historical version in ``apps`` when run from a migration"""
+    return model if apps is None else apps.get_model(model._meta.label)
+
+
+def recount(model, client_ids=None, apps=None):
+    """Counter values of one model grouped by client, from a single GROUP BY query"""
+    annotations = {
+        name: Count('pk', filter=_q(conditions)) if conditions else Count('pk')
+        for name, conditions in COUNTERS[model].items()
+    }
+    path = TENANT_PATHS.get(model)
+    model = _resolve(model, apps)
+    if path is None:
+        return {None: model.objects.aggregate(**annotations)}
+    queryset = model.objects.all()
+    if client_ids is not None:
+        queryset = queryset.filter(**{f'{path}_id__in': client_ids})
+    return {
+        row.pop('tenant'): row
+        for row in queryset.order_by().values(tenant=F(f'{path}_id')).annotate(**annotations)
+    }
+
+
+@transaction.atomic
+def rebuild(client_ids=None, include_shared=None, apps=None):
+    """
+    Recompute ClientStats rows from the source tables and return how many
+    were written. ``client_ids=None`` rebuilds every client and the shared
+    row; otherwise only those clients (and the shared row if asked).
+    Migrations pass their ``apps``.
+    """
+    if include_shared is None:
+        include_shared = client_ids is None
+    stats_model = _resolve(ClientStats, apps)
+    clients = _resolve(Client, apps).objects.all()
+    if client_ids is not None:
+        clients = clients.filter(pk__in=client_ids)
+    client_ids = list(clients.values_list('pk', flat=True))
+
+    now = timezone.now()
+    rows = {client_id: stats_model(client_id=client_id, rebuilt_at=now) for client_id in client_ids}
+    shared = stats_model(rebuilt_at=now)
+    for model in COUNTERS:
+        if model in TENANT_PATHS:
+            for client_id, counters in recount(model, client_ids, apps).items():
+                if client_id in rows:
+                    for name, value in counters.items():
+                        setattr(rows[client_id], name, value)
+        elif include_shared:
+            for name, value in recount(model, apps=apps)[None].items():
+                setattr(shared, name, value)
+
+    stats_model.objects.bulk_create(
+        list(rows.values()),
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['client'],
+        update_fields=ClientStats.counter_names() + ['rebuilt_at', 'updated_at'],
+    )
+    written = len(rows)
+    if include_shared:
+        shared_fields = {name: getattr(shared, name) for name in ClientStats.counter_names()}
+        stats_model.objects.update_or_create(
+            client=None, defaults={**shared_fields, 'rebuilt_at': now}
+        )
+        written += 1
+    return written
+
+
+def rebuild_for(model, pks):
+    """Rebuild the rows touched by objects written without signals, e.g. by bulk_create"""
+    if model not in COUNTERS or not pks:
+        return 0
+    path = TENANT_PATHS.get(model)
+    if path is None:
+        return rebuild(client_ids=[], include_shared=True)
+    client_ids = set(model.objects.filter(pk__in=pks).values_list(f'{path}_id', flat=True))
+    return rebuild(client_ids=client_ids)
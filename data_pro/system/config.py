@@ -0,0 +1,207 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError
+
+from data_pro.models.superuser import SystemConfiguration
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+# Marks keys known to have no row; stored in the LRU like a value
+_ABSENT = object()
+
+_TRUE = {'1', 'true', 'yes', 'on'}
+_FALSE = {'0', 'false', 'no', 'off', ''}
+
+
+class ConfigCache:
+    """
+    Read-through cache of SystemConfiguration values, one per process.
+
+    Values live in an LRU of SYSTEM_CONFIG_CACHE_SIZE keys (absent keys
+    included, so defaults cost no query either). It is stamped with a
+    version counter in the shared cache, which the SystemConfiguration
+    signals bump on every committed save and delete. sync() compares the
+    two and, when they differ, reloads every key with one query;
+    SystemConfigMiddleware calls it at the start of each request, so a
+    change reaches every worker by its next request, and pins the values
+    for the rest of the request, so it reads the counter exactly once.
+    Lookups outside requests call it at most every ``check_interval``
+    seconds. A lookup itself is a dict read.
+
+    A miss stores into the LRU it was read for, so a value read from the
+    database before a reload can never land in the reloaded one.
+    """
+    version_key = 'system-config:version'
+    check_interval = 1.0
+
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize or getattr(settings, 'SYSTEM_CONFIG_CACHE_SIZE', 1024)
+        self._lock = threading.Lock()
+        self._values = OrderedDict()
+        self._version = None
+        self._checked = 0.0
+        self._local = threading.local()
+
+    @classmethod
+    def invalidate(cls):
+        try:
+            cache.incr(cls.version_key)
+        except ValueError:
+            cache.set(cls.version_key, 1, None)
+
+    def sync(self):
+        """Reload everything if the version counter moved since the last load"""
+        self._checked = time.monotonic()
+        version = cache.get_or_set(self.version_key, 1, None)
+        if version != self._version:
+            self.prefetch(version)
+
+    def prefetch(self, version=None):
+        """Load every key (up to ``maxsize``, most recently changed first) with one query"""
+        if version is None:
+            version = cache.get_or_set(self.version_key, 1, None)
+        rows = (
+            SystemConfiguration.objects.order_by('-last_modified')
+            .values_list('key', 'value')[:self.maxsize]
+        )
+        values = OrderedDict(reversed(list(rows)))
+        with self._lock:
+            self._values = values
+            self._version = version
+            self._checked = time.monotonic()
+        return len(values)
+
+    @contextmanager
+    def pinned(self):
+        """No version checks from lookups in this thread inside the block"""
+        self._local.pinned = True
+        try:
+            yield
+        finally:
+            self._local.pinned = False
+
+    def get(self, key, default=None):
+        if not getattr(self._local, 'pinned', False) and time.monotonic() - self._checked > self.check_interval:
+            self.sync()
+        values = self._values
+        value = values.get(key, _MISSING)
+        if value is not _MISSING:
+            try:
+                values.move_to_end(key)
+            except KeyError:
+                # Evicted by another thread in between
+                pass
+        else:
+            # Not in the LRU: evicted, or never loaded because absent
+            row = SystemConfiguration.objects.filter(key=key).values_list('value').first()
+            value = _ABSENT if row is None else row[0]
+            with self._lock:
+                values[key] = value
+                if len(values) > self.maxsize:
+                    values.popitem(last=False)
+        return default if value is _ABSENT else value
+
+    def clear(self):
+        with self._lock:
+            self._values = OrderedDict()
+            self._version = None
+
+
+config_cache = ConfigCache()
+
+
+def get_config(key, default=None):
+    """The value of the SystemConfiguration ``key``, or ``default`` when it has no row"""
+    return config_cache.get(key, default)
+
+
+def _typed(key, default, convert):
+    value = config_cache.get(key, _MISSING)
+    if value is _MISSING:
+        return default
+    try:
+        return convert(value)
+    except (TypeError, ValueError):
+        logger.warning('System configuration %r has an unusable value: %r', key, value)
+        return default
+
+
+def _bool(value):
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise ValueError(value)
+
+
+def _int(value):
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError(value)
+    return int(value)
+
+
+def get_bool(key, default=False):
+    """``key`` as a bool; JSON booleans, 0/1 and 'true'/'false'/'yes'/'no'/'on'/'off' are understood"""
+    return _typed(key, default, _bool)
+
+
+def get_int(key, default=0):
+    return _typed(key, default, _int)
+
+
+def get_float(key, default=0.0):
+    return _typed(key, default, float)
+
+
+def get_str(key, default=''):
+    return _typed(key, default, str)
+
+
+def get_list(key, default=()):
+    """``key`` as a list; a comma-separated string is split"""
+    def as_list(value):
+        if isinstance(value, str):
+            return [item.strip() for item in value.split(',') if item.strip()]
+        if not isinstance(value, (list, tuple)):
+            raise TypeError(value)
+        return list(value)
+    return _typed(key, list(default), as_list)
+
+
+class SystemSettings:
+    """The settings of the system settings form, typed and with their defaults"""
+
+    @property
+    def site_name(self):
+        return get_str('site_name', 'Data-Pro')
+
+    @property
+    def maintenance_mode(self):
+        return get_bool('maintenance_mode', False)
+
+    @property
+    def session_timeout(self):
+        """Minutes, clamped to the 5-1440 the form allows"""
+        return min(max(get_int('session_timeout', 30), 5), 1440)
+
+
+system_settings = SystemSettings()
+
+
+def warm():
+    """Prefetch at worker start; a database that is not up yet only postpones it to the first request"""
+    try:
+        return config_cache.prefetch()
+    except DatabaseError as e:
+        logger.warning('System configuration not prefetched: %s', e)
+        return 0
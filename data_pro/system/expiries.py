@@ -0,0 +1,108 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from data_pro.models.client_stats import ExpiryBucket
+from data_pro.models.passports import Passport
+from data_pro.models.visas import Visa
+from data_pro.system import client_stats
+from data_pro.system.metrics import TENANT_PATHS, DashboardMetrics
+from data_pro.system.reports import visa_report
+
+# Model -> (statuses a row past its expiry date leaves, the status it gets).
+# Visas follow Visa.save(), which expires any status once the date passed.
+EXPIRY_RULES = {
+    Visa: (tuple(status for status in Visa.Status.values if status != Visa.Status.EXPIRED), Visa.Status.EXPIRED),
+    Passport: (('valid',), 'expired'),
+}
+
+# Statuses counted in the expiring-soon buckets
+BUCKET_STATUSES = {
+    Visa: (Visa.Status.APPROVED, Visa.Status.ISSUED, Visa.Status.RELEASED),
+    Passport: ('valid',),
+}
+BUCKET_KINDS = {
+    Visa: ExpiryBucket.Kind.VISA,
+    Passport: ExpiryBucket.Kind.PASSPORT,
+}
+WINDOWS = (7, 30, 90)
+
+
+class ExpiryScanner:
+    """
+    Moves visas and passports past their expiry date to the expired
+    status, and writes the per-client expiring-soon buckets.
+
+    Both steps are range scans on the (status, expiry_date) indexes, so
+    a run reads only the rows that expire now or within the largest
+    window, however large the tables are. Rows are expired
+    ``batch_size`` at a time, each batch with one conditional
+    QuerySet.update() in its own transaction; ClientStats, the dashboard
+    cache and the visa report cache are brought up to date the way the
+    skipped save() signals would.
+    """
+    batch_size = 1000
+
+    def __init__(self, today=None, batch_size=None):
+        self.today = today or timezone.now().date()
+        if batch_size:
+            self.batch_size = batch_size
+
+    def expire(self, model):
+        """Expire the live rows of ``model`` past their date; returns how many changed"""
+        live, expired = EXPIRY_RULES[model]
+        due = model.objects.filter(status__in=live, expiry_date__lt=self.today)
+        tenant = f'{TENANT_PATHS[model]}_id'
+        changed = 0
+        while True:
+            with transaction.atomic():
+                rows = list(due.order_by('pk').values_list('pk', 'status', tenant)[:self.batch_size])
+                if not rows:
+                    return changed
+                # Still conditional on the status, in case a row was saved meanwhile
+                updated = due.filter(pk__in=[pk for pk, _, _ in rows]).update(
+                    status=expired, updated_at=timezone.now()
+                )
+                client_stats.transitioned(model, [(client_id, status) for _, status, client_id in rows], 'status', expired)
+                client_ids = {client_id for _, _, client_id in rows}
+                for client_id in client_ids:
+                    DashboardMetrics.invalidate(client_id)
+                    if model is Visa:
+                        transaction.on_commit(lambda client_id=client_id: visa_report.schedule_refresh(client_id))
+            changed += updated
+
+    def buckets(self, model):
+        """``{client_id: {window_days: count}}`` of live rows expiring within each window"""
+        last_day = {days: self.today + timedelta(days=days) for days in WINDOWS}
+        rows = (
+            model.objects
+            .filter(status__in=BUCKET_STATUSES[model], expiry_date__range=(self.today, last_day[max(WINDOWS)]))
+            .order_by()
+            .values(tenant=F(f'{TENANT_PATHS[model]}_id'))
+            .annotate(**{f'within_{days}': Count('pk', filter=Q(expiry_date__lte=last_day[days])) for days in WINDOWS})
+        )
+        return {row['tenant']: {days: row[f'within_{days}'] for days in WINDOWS} for row in rows}
+
+    @transaction.atomic
+    def summarize(self, model):
+        """Replace the ``model`` buckets of every client; returns the rows written"""
+        kind = BUCKET_KINDS[model]
+        ExpiryBucket.objects.filter(kind=kind).delete()
+        buckets = [
+            ExpiryBucket(client_id=client_id, kind=kind, window_days=days, count=count, scanned_on=self.today)
+            for client_id, counts in self.buckets(model).items() if client_id is not None
+            for days, count in counts.items()
+        ]
+        ExpiryBucket.objects.bulk_create(buckets, batch_size=500)
+        return len(buckets)
+
+    def run(self):
+        """Expire and summarize every model, returning ``{model name: (expired, buckets)}``"""
+        results = {}
+        for model in EXPIRY_RULES:
+            expired = self.expire(model)
+            results[model._meta.model_name] = (expired, self.summarize(model))
+        return results
+
@@ -4,12 +4,8 @@ from django.utils import timezone
 from django.conf import settings
 
 # Import models directly
-from data_pro.models.customers import Customer
-from data_pro.models.visas import Visa
-from data_pro.models.passports import Passport, PassportExtension
 from data_pro.models.invoices import Invoice
-from data_pro.models.vehicles import Vehicle
-from data_pro.models.transports import Transport
+from data_pro.system.metrics import DashboardMetrics
 
 class SystemLandingView(LoginRequiredMixin, TemplateView):
     """System dashboard view showing key metrics and quick actions"""
@@ -19,49 +15,35 @@ class SystemLandingView(LoginRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         user = self.request.user
-        today = timezone.now().date()
 
         # Safely check user_type with fallback
         user_type = getattr(user, 'user_type', None)
         
-        # Get filtered querysets based on user type
-        if user_type == 'admin':  # Now using the safely accessed user_type
-            customers = Customer.objects.all()
-            visas = Visa.objects.all()
-            passports = Passport.objects.all()
-            extensions = PassportExtension.objects.all()
-            vehicles = Vehicle.objects.all()
-            transports = Transport.objects.all()
+        # Get tenant scope based on user type
+        client_filter = {}
+        if user_type != 'admin' and hasattr(user, 'client'):
+            client_filter = {'client': user.client}
+
+        if user_type == 'admin' or client_filter:
+            metrics = DashboardMetrics(client_filter.get('client')).get()
         else:
-            # Add additional safety check for client attribute
-            client_filter = {}
-            if hasattr(user, 'client'):
-                client_filter = {'client': user.client}
-            
-            customers = Customer.objects.filter(**client_filter)
-            visas = Visa.objects.filter(customer__client=user.client) if hasattr(user, 'client') else Visa.objects.none()
-            passports = Passport.objects.filter(customer__client=user.client) if hasattr(user, 'client') else Passport.objects.none()
-            extensions = PassportExtension.objects.filter(passport__customer__client=user.client) if hasattr(user, 'client') else PassportExtension.objects.none()
-            vehicles = Vehicle.objects.filter(**client_filter)
-            transports = Transport.objects.filter(**client_filter)
+            metrics = dict.fromkeys(DashboardMetrics.counters, 0)
 
         # Prepare dashboard statistics
         context.update({
-            'total_customers': customers.count(),
-            'active_visas': visas.filter(status='approved').count(),
-            'pending_passports': passports.filter(status='pending').count(),
-            'pending_extensions': extensions.filter(released_date__isnull=True).count(),
-            'available_vehicles': vehicles.filter(status='available').count(),
-            'active_transports': transports.filter(
-                status__in=['scheduled', 'in_progress']
-            ).count(),
+            'total_customers': metrics['customers'],
+            'active_visas': metrics['active_visas'],
+            'pending_passports': metrics['pending_passports'],
+            'pending_extensions': metrics['pending_extensions'],
+            'available_vehicles': metrics['available_vehicles'],
+            'active_transports': metrics['active_transports'],
             'recent_invoices': Invoice.objects.filter(
                 **client_filter
             ).order_by('-issue_date')[:5] if hasattr(user, 'client') else Invoice.objects.none(),
         })
 
         # Prepare quick actions
-        context['quick_actions'] = self._get_quick_actions(user, passports.exists() if passports else False)
+        context['quick_actions'] = self._get_quick_actions(user, metrics['passports'] > 0)
 
         return context
 
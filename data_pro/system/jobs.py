@@ -0,0 +1,256 @@
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.db.models import F
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from data_pro.models.jobs import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+# Job kind -> task, called as task(job, progress) and returning the job's result dict.
+# BACKGROUND_JOB_TASKS adds to or overrides these.
+TASKS = {
+    'customer_import': 'data_pro.system.tasks.customer_import',
+    'visa_import': 'data_pro.system.tasks.visa_import',
+    'excel_import': 'data_pro.system.tasks.excel_import',
+    'visa_export': 'data_pro.system.tasks.visa_export',
+    'customer_export': 'data_pro.system.tasks.customer_export',
+}
+
+Status = BackgroundJob.StatusChoices
+
+
+class JobCancelled(Exception):
+    pass
+
+
+def get_task(kind):
+    tasks = {**TASKS, **getattr(settings, 'BACKGROUND_JOB_TASKS', {})}
+    if kind not in tasks:
+        raise ValueError(f'Unknown job kind: {kind}')
+    return import_string(tasks[kind])
+
+
+def enqueue(kind, user=None, file=None, **params):
+    """
+    Queue a ``kind`` job for run_workers, storing ``file`` (an upload) as
+    its input. ``params`` must be JSON serializable. The job runs before
+    this returns instead when BACKGROUND_JOBS_EAGER is set (e.g. in
+    development, without workers) or when ``file`` is no larger than
+    BACKGROUND_JOBS_INLINE_MAX_BYTES, which a request handles in time.
+    """
+    get_task(kind)
+    eager = getattr(settings, 'BACKGROUND_JOBS_EAGER', False) or (
+        file is not None and file.size <= getattr(settings, 'BACKGROUND_JOBS_INLINE_MAX_BYTES', 0)
+    )
+    job = BackgroundJob(kind=kind, initiated_by=user, params=params)
+    if file is not None:
+        job.input_file.save(os.path.basename(file.name), file, save=False)
+    if eager:
+        job.status = Status.PROCESSING
+        job.started_at = job.heartbeat_at = timezone.now()
+        job.attempts = 1
+    job.save()
+    if eager:
+        run(job)
+    return job
+
+
+def cancel(job):
+    """Cancel a pending job at once; a running one stops at its next progress update"""
+    now = timezone.now()
+    BackgroundJob.objects.filter(pk=job.pk, status=Status.PENDING).update(
+        status=Status.CANCELLED, cancel_requested=True, completed_at=now
+    )
+    BackgroundJob.objects.filter(pk=job.pk, status=Status.PROCESSING).update(cancel_requested=True)
+    job.refresh_from_db()
+    return job
+
+
+def job_payload(job):
+    """JSON-ready state of ``job`` for the polling endpoint"""
+    return {
+        'job_id': job.pk,
+        'kind': job.kind,
+        'status': job.status,
+        'status_display': job.get_status_display(),
+        'total_records': job.total_records,
+        'processed': job.processed,
+        'successful': job.successful,
+        'failed': job.failed,
+        'percent': round(100 * job.processed / job.total_records, 1) if job.total_records else None,
+        'result': job.result,
+        'error': job.error_log.strip().splitlines()[-1] if job.error_log.strip() else None,
+        'cancel_requested': job.cancel_requested,
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'completed_at': job.completed_at,
+        'status_url': reverse('data_pro:job-status', kwargs={'pk': job.pk}),
+        'cancel_url': reverse('data_pro:job-cancel', kwargs={'pk': job.pk}),
+    }
+
+
+class JobProgress:
+    """
+    Progress of a running job. update() only records it in memory; a
+    heartbeat thread writes it to the job row every ``interval`` seconds
+    on its own connection, so pollers see it while the task's transaction
+    is still open, and picks up cancellation requests, after which
+    update() raises JobCancelled.
+
+    On SQLite the heartbeat cannot write while the task holds the write
+    lock, so progress only shows between transactions there.
+    """
+    interval = 2.0
+
+    def __init__(self, job):
+        self.job = job
+        self.fields = {}
+        self.cancelled = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def update(self, **fields):
+        """Record ``total_records``, ``processed``, ``successful`` and/or ``failed``"""
+        with self._lock:
+            self.fields.update(fields)
+        if self.cancelled:
+            raise JobCancelled
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._beat, name=f'job-{self.job.pk}-heartbeat', daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def _beat(self):
+        try:
+            while not self._stop.wait(self.interval):
+                self._flush()
+        finally:
+            # Connections are per thread; close the ones this thread opened
+            connections.close_all()
+
+    def _flush(self):
+        with self._lock:
+            fields = dict(self.fields)
+        try:
+            BackgroundJob.objects.filter(pk=self.job.pk).update(heartbeat_at=timezone.now(), **fields)
+            if BackgroundJob.objects.filter(pk=self.job.pk, cancel_requested=True).exists():
+                self.cancelled = True
+        except DatabaseError as e:
+            logger.debug('Heartbeat of job %s skipped: %s', self.job.pk, e)
+
+
+def claim(worker, kinds=None):
+    """Mark the oldest pending job as ours and return it, or None"""
+    candidates = BackgroundJob.objects.filter(status=Status.PENDING)
+    if kinds:
+        candidates = candidates.filter(kind__in=kinds)
+    for pk in candidates.order_by('created_at', 'id').values_list('pk', flat=True)[:10]:
+        now = timezone.now()
+        # Conditional update, so two workers never both win a job
+        won = BackgroundJob.objects.filter(pk=pk, status=Status.PENDING).update(
+            status=Status.PROCESSING, worker=worker, started_at=now, heartbeat_at=now,
+            attempts=F('attempts') + 1,
+        )
+        if won:
+            return BackgroundJob.objects.get(pk=pk)
+    return None
+
+
+def run(job):
+    """Run a claimed job to completion, recording its outcome on the row"""
+    progress = JobProgress(job)
+    try:
+        with progress:
+            result = get_task(job.kind)(job, progress)
+    except JobCancelled:
+        job.status = Status.CANCELLED
+    except (KeyboardInterrupt, SystemExit):
+        # The worker is stopping: hand the job to the next one
+        BackgroundJob.objects.filter(pk=job.pk).update(status=Status.PENDING, worker='')
+        raise
+    except Exception:
+        logger.exception('Background job %s (%s) failed', job.pk, job.kind)
+        job.status = Status.FAILED
+        job.error_log = traceback.format_exc()
+    else:
+        job.status = Status.COMPLETED
+        job.result = result or {}
+
+    for name, value in progress.fields.items():
+        setattr(job, name, value)
+    job.completed_at = timezone.now()
+    job.save(update_fields=[
+        'status', 'result', 'error_log', 'completed_at', *progress.fields,
+    ])
+    logger.info('Background job %s (%s) %s', job.pk, job.kind, job.status.lower())
+    return job
+
+
+class Worker:
+    """
+    Claims and runs pending jobs one at a time. run_workers starts one per
+    process. Jobs whose heartbeat stopped for ``stale_after`` (a worker
+    died) are requeued, up to ``max_attempts`` runs.
+    """
+    stale_after = timedelta(minutes=10)
+    max_attempts = 3
+
+    def __init__(self, kinds=None, name=None):
+        self.kinds = kinds
+        self.name = name or f'{socket.gethostname()}:{os.getpid()}'
+
+    def requeue_stale(self):
+        now = timezone.now()
+        stale = BackgroundJob.objects.filter(status=Status.PROCESSING, heartbeat_at__lt=now - self.stale_after)
+        requeued = stale.filter(attempts__lt=self.max_attempts).update(status=Status.PENDING, worker='')
+        stale.update(
+            status=Status.FAILED, completed_at=now,
+            error_log=f'Worker stopped responding after {self.max_attempts} attempts',
+        )
+        return requeued
+
+    def run_pending(self):
+        """Run jobs until none are pending, returning how many ran"""
+        count = 0
+        self.requeue_stale()
+        while True:
+            job = claim(self.name, self.kinds)
+            if job is None:
+                return count
+            run(job)
+            count += 1
+
+    def run_forever(self, interval):
+        while True:
+            if not self.run_pending():
+                time.sleep(interval)
+
+
+def purge(older_than):
+    """Delete finished jobs older than ``older_than`` together with their input and output files"""
+    jobs = BackgroundJob.objects.filter(
+        completed_at__lt=timezone.now() - older_than,
+        status__in=[Status.COMPLETED, Status.FAILED, Status.CANCELLED],
+    )
+    for job in jobs.exclude(input_file='', output_file='').only('pk', 'input_file', 'output_file').iterator():
+        job.input_file.delete(save=False)
+        job.output_file.delete(save=False)
+    deleted, _ = jobs.delete()
+    return deleted
@@ -0,0 +1,79 @@
+import threading
+from bisect import bisect_right
+from typing import NamedTuple
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from data_pro.models.superuser import SystemMaintenanceWindow
+from data_pro.system.config import system_settings
+
+
+class Window(NamedTuple):
+    pk: int
+    title: str
+    start: object
+    end: object
+
+
+class MaintenanceSchedule:
+    """
+    The enabled SystemMaintenanceWindows that have not ended, loaded once
+    per process with one query and sorted by start, so active() is a
+    binary search instead of a query. Kept until the version counter,
+    bumped by the window signals once committed, moves; the middleware
+    reads it once per request, so edits reach every worker by its next
+    request. Windows that end are skipped, never reloaded.
+
+    The ``maintenance_mode`` system setting switches maintenance on
+    without a window.
+    """
+    version_key = 'maintenance-schedule:version'
+
+    _lock = threading.Lock()
+    _loaded = (None, [], [])
+
+    @classmethod
+    def invalidate(cls):
+        try:
+            cache.incr(cls.version_key)
+        except ValueError:
+            cache.set(cls.version_key, 1, None)
+
+    @classmethod
+    def windows(cls):
+        """``(windows, starts)`` sorted by start, reloaded when invalidated"""
+        version = cache.get_or_set(cls.version_key, 1, None)
+        if cls._loaded[0] != version:
+            with cls._lock:
+                if cls._loaded[0] != version:
+                    rows = (
+                        SystemMaintenanceWindow.objects.filter(is_active=True, end_time__gt=timezone.now())
+                        .order_by('start_time').values_list('pk', 'title', 'start_time', 'end_time')
+                    )
+                    windows = [Window(*row) for row in rows]
+                    cls._loaded = (version, windows, [window.start for window in windows])
+        return cls._loaded[1], cls._loaded[2]
+
+    @classmethod
+    def active(cls, now=None):
+        """The window in force at ``now`` that ends last, or None"""
+        now = now or timezone.now()
+        windows, starts = cls.windows()
+        # Windows starting after now are not in force; of the rest, few are still running
+        current = [window for window in windows[:bisect_right(starts, now)] if window.end >= now]
+        return max(current, key=lambda window: window.end, default=None)
+
+    @classmethod
+    def upcoming(cls, now=None):
+        now = now or timezone.now()
+        windows, starts = cls.windows()
+        return windows[bisect_right(starts, now):]
+
+    @classmethod
+    def in_maintenance(cls, now=None):
+        """``(True, window or None)`` during a window or with maintenance_mode set, else ``(False, None)``"""
+        window = cls.active(now)
+        if window is not None:
+            return True, window
+        return system_settings.maintenance_mode, None
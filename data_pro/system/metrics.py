@@ -0,0 +1,149 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from data_pro.models.client_stats import ClientStats
+from data_pro.models.customers import Customer
+from data_pro.models.passports import Passport, PassportExtension
+from data_pro.models.transports import Transport
+from data_pro.models.vehicles import Vehicle
+from data_pro.models.visas import Visa
+
+# Tenant path from each counted model to its owning Client
+TENANT_PATHS = {
+    Customer: 'client',
+    Visa: 'customer__client',
+    Passport: 'customer__client',
+    PassportExtension: 'passport__customer__client',
+    Transport: 'customer__client',
+}
+
+
+class DashboardMetrics:
+    """
+    Dashboard counters per tenant, cached for ``timeout`` seconds in the
+    shared cache and invalidated by the model signals in data_pro.signals,
+    so every process sees the change.
+
+    ``client`` is a Client instance or id; ``None`` means all tenants.
+    """
+    counters = (
+        'customers', 'active_visas', 'passports', 'pending_passports', 'expiring_passports',
+        'pending_extensions', 'available_vehicles', 'active_transports',
+    )
+    timeout = 60
+    key_prefix = 'dashboard-metrics'
+    version_key = f'{key_prefix}:version'
+
+    # Per-process cache effectiveness counters
+    hits = 0
+    misses = 0
+
+    def __init__(self, client=None):
+        self.client_id = getattr(client, 'pk', client)
+
+    @classmethod
+    def cache_key(cls, client_id, version=None):
+        # Vehicles are not tenant scoped, so their saves bump a global version
+        if version is None:
+            version = cache.get_or_set(cls.version_key, 1, None)
+        today = timezone.now().date().isoformat()
+        return f"{cls.key_prefix}:{version}:{client_id or 'all'}:{today}"
+
+    def _scoped(self, model):
+        queryset = model.objects.all()
+        if self.client_id is not None and model in TENANT_PATHS:
+            queryset = queryset.filter(**{f'{TENANT_PATHS[model]}_id': self.client_id})
+        return queryset
+
+    def compute(self):
+        # Status counters come from the ClientStats rollup; only the date
+        # window still needs a COUNT over the source table
+        stats = ClientStats.for_client(self.client_id)
+        today = timezone.now().date()
+        expiring_passports = self._scoped(Passport).filter(
+            expiry_date__range=(today, today + timedelta(days=30))
+        ).exclude(status='expired').count()
+        return {
+            'customers': stats['customers'],
+            'active_visas': stats['approved_visas'],
+            'passports': stats['passports'],
+            'pending_passports': stats['pending_passports'],
+            'expiring_passports': expiring_passports,
+            'pending_extensions': stats['pending_extensions'],
+            'available_vehicles': stats['available_vehicles'],
+            'active_transports': stats['active_transports'],
+        }
+
+    def get(self):
+        key = self.cache_key(self.client_id)
+        metrics = cache.get(key)
+        if metrics is None:
+            DashboardMetrics.misses += 1
+            metrics = self.compute()
+            cache.set(key, metrics, self.timeout)
+        else:
+            DashboardMetrics.hits += 1
+        return metrics
+
+    @classmethod
+    def invalidate(cls, client_id=None):
+        """Drop cached counters for one tenant (and the all-tenant view), or for everyone"""
+        if client_id is None:
+            try:
+                cache.incr(cls.version_key)
+            except ValueError:
+                cache.set(cls.version_key, 1, None)
+            return
+        version = cache.get_or_set(cls.version_key, 1, None)
+        cache.delete_many([cls.cache_key(client_id, version), cls.cache_key(None, version)])
+
+    @classmethod
+    def stats(cls):
+        total = cls.hits + cls.misses
+        return {
+            'hits': cls.hits,
+            'misses': cls.misses,
+            'hit_rate': cls.hits / total if total else None,
+        }
+
+
+def client_id_for(instance):
+    """
+    Owning Client id of a dashboard-counted instance, or None if not tenant
+    scoped. Resolved from the loaded parent when it is cached on the
+    instance, else with one query, and remembered on the instance (see
+    remember_client_id) so the other signals of the same save reuse it.
+    """
+    path = TENANT_PATHS.get(type(instance))
+    if path is None:
+        return None
+    parent, _, rest = path.partition('__')
+    parent_id = getattr(instance, f'{parent}_id')
+    if not rest:
+        return parent_id
+    known = getattr(instance, '_client_id', None)
+    if known is not None and known[0] == parent_id:
+        return known[1]
+    loaded = instance._state.fields_cache.get(parent)
+    if loaded is not None and loaded.pk == parent_id and rest == 'client':
+        client_id = loaded.client_id
+    else:
+        client_id = instance._meta.get_field(parent).related_model.objects.filter(
+            pk=parent_id
+        ).values_list(f'{rest}_id', flat=True).first()
+    remember_client_id(instance, client_id)
+    return client_id
+
+
+def remember_client_id(instance, client_id, parent_id=None):
+    """
+    Record ``client_id`` as the owner of ``instance`` for as long as its
+    parent link is ``parent_id`` (by default, its current value)
+    """
+    path = TENANT_PATHS.get(type(instance))
+    if path is not None:
+        if parent_id is None:
+            parent_id = getattr(instance, f"{path.split('__')[0]}_id")
+        instance._client_id = (parent_id, client_id)
@@ -0,0 +1,79 @@
+from datetime import datetime
+
+from data_pro.models.customers import Customer
+from data_pro.models.visas import Visa
+from data_pro.utils.csv_handlers import choice_display, datetime_format
+from data_pro.utils.report_cache import CachedReport
+from data_pro.utils.search import search
+
+
+def filter_visas(queryset, params):
+    """The visa list filters: ``search``, ``status`` and an issue date range"""
+    search_query = params.get('search')
+    if search_query:
+        queryset = search(queryset, search_query)
+
+    status_filter = params.get('status')
+    if status_filter:
+        queryset = queryset.filter(status=status_filter)
+
+    start_date = params.get('start_date')
+    end_date = params.get('end_date')
+    if start_date and end_date:
+        try:
+            start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+            end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+            queryset = queryset.filter(issue_date__range=[start_date, end_date])
+        except ValueError:
+            pass
+    return queryset
+
+
+# The customer's name is exported too, so customer edits change the version
+visa_report = CachedReport(
+    'visas',
+    Visa,
+    fields=[
+        'visa_number',
+        'customer__first_name',
+        'customer__last_name',
+        'visa_type',
+        'issue_date',
+        'expiry_date',
+        'unit_cost',
+        'status',
+        'notes',
+    ],
+    tenant_path='customer__client',
+    filter_queryset=filter_visas,
+    filter_keys=('search', 'status', 'start_date', 'end_date'),
+    timestamps=('updated_at', 'customer__updated_at'),
+)
+
+
+def customer_name(customer_type, first_name, last_name, organization_name):
+    """Mirror of Customer.name computed from exported columns"""
+    if customer_type == 'individual':
+        return f"{first_name} {last_name}"
+    return organization_name
+
+
+# Customer CSV exports: the admin list download and the API one
+CUSTOMER_EXPORT_COLUMNS = {
+    'list': [
+        ('ID', 'id'),
+        ('First Name', 'first_name'),
+        ('Last Name', 'last_name'),
+        ('Email', 'email'),
+        ('Phone', 'phone'),
+        ('Status', 'status', choice_display(Customer.STATUS_CHOICES)),
+        ('Client', 'client__name', lambda name: name or ''),
+        ('Created At', 'created_at', datetime_format('%Y-%m-%d %H:%M:%S')),
+    ],
+    'api': [
+        ('ID', 'id'),
+        ('Name', ('customer_type', 'first_name', 'last_name', 'organization_name'), customer_name),
+        ('Email', 'email'),
+        ('Phone', 'phone'),
+    ],
+}
@@ -0,0 +1,192 @@
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from typing import NamedTuple
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import BooleanField, DateTimeField, F, Func, Value
+from django.utils import timezone
+
+from data_pro.models.transports import Transport, TransportService
+from data_pro.models.vehicles import Vehicle
+
+# Booking model -> (start field, end field, statuses during which the booking holds its vehicle)
+BOOKINGS = {
+    Transport: ('pickup_time', 'dropoff_time', ('pending', 'in_progress')),
+    TransportService: ('scheduled_departure', 'scheduled_arrival', ('scheduled', 'in_transit', 'on_hold')),
+}
+
+
+class Booking(NamedTuple):
+    model: type
+    pk: int
+    vehicle_id: int
+    start: object
+    end: object
+
+    def __str__(self):
+        start, end = timezone.localtime(self.start), timezone.localtime(self.end)
+        return f"{self.model._meta.verbose_name} #{self.pk} ({start:%Y-%m-%d %H:%M} – {end:%Y-%m-%d %H:%M})"
+
+
+class _ColumnSpan(Func):
+    # Must match the expression of the GiST indexes created by migration 0011;
+    # LEAST/GREATEST keep rows with swapped times from failing the whole scan
+    template = "TSTZRANGE(LEAST(%(expressions)s), GREATEST(%(expressions)s), '[)')"
+    output_field = DateTimeField()
+
+
+class _Span(Func):
+    function = 'TSTZRANGE'
+    template = "%(function)s(%(expressions)s, '[)')"
+    output_field = DateTimeField()
+
+
+def _overlaps(model, start, end):
+    """``[start field, end field) && [start, end)`` in the form the GiST index serves"""
+    start_field, end_field, _ = BOOKINGS[model]
+    return Func(
+        _ColumnSpan(F(start_field), F(end_field)), _Span(Value(start), Value(end)),
+        template='%(expressions)s', arg_joiner=' && ', output_field=BooleanField(),
+    )
+
+
+class IntervalIndex:
+    """
+    The bookings of one vehicle sorted by start, with the running maximum
+    of their ends: the bookings overlapping ``[start, end)`` all lie
+    before the first one starting at or after ``end``, and one of them
+    overlaps iff the running maximum there is past ``start``. So
+    is_free() is one binary search.
+    """
+
+    def __init__(self, bookings):
+        self.bookings = sorted(bookings, key=lambda booking: booking.start)
+        self.starts = [booking.start for booking in self.bookings]
+        self.max_ends = []
+        for booking in self.bookings:
+            self.max_ends.append(max(booking.end, self.max_ends[-1]) if self.max_ends else booking.end)
+
+    def __len__(self):
+        return len(self.bookings)
+
+    def is_free(self, start, end):
+        i = bisect_left(self.starts, end)
+        return i == 0 or self.max_ends[i - 1] <= start
+
+
+class VehicleSchedule:
+    """
+    Vehicle availability over Transport and TransportService bookings.
+
+    A booking holds its vehicle over ``[start, end)`` while its status is
+    one of those in BOOKINGS. On PostgreSQL the overlap queries go to the
+    partial GiST indexes on ``(vehicle_id, tstzrange(start, end))``;
+    elsewhere free-vehicle queries use the live bookings loaded into one
+    IntervalIndex per vehicle, kept per process and rebuilt after
+    invalidate(), which the booking signals call once committed.
+
+    Both tables share the vehicles, so double bookings are checked here,
+    against the database, rather than with a database constraint.
+    """
+    version_key = 'vehicle-schedule:version'
+
+    _lock = threading.Lock()
+    _built = (None, {})
+
+    def __init__(self, use_database=None):
+        if use_database is None:
+            use_database = connection.vendor == 'postgresql'
+        self.use_database = use_database
+
+    @classmethod
+    def invalidate(cls):
+        try:
+            cache.incr(cls.version_key)
+        except ValueError:
+            cache.set(cls.version_key, 1, None)
+
+    @classmethod
+    def index(cls):
+        """``{vehicle_id: IntervalIndex}`` of the live bookings, rebuilt when invalidated"""
+        version = cache.get_or_set(cls.version_key, 1, None)
+        if cls._built[0] == version:
+            return cls._built[1]
+        with cls._lock:
+            if cls._built[0] != version:
+                bookings = defaultdict(list)
+                for model, (start_field, end_field, statuses) in BOOKINGS.items():
+                    rows = (
+                        model.objects.filter(vehicle__isnull=False, status__in=statuses)
+                        .order_by().values_list('pk', 'vehicle_id', start_field, end_field)
+                    )
+                    for pk, vehicle_id, start, end in rows.iterator():
+                        bookings[vehicle_id].append(Booking(model, pk, vehicle_id, min(start, end), max(start, end)))
+                cls._built = (version, {vehicle_id: IntervalIndex(items) for vehicle_id, items in bookings.items()})
+        return cls._built[1]
+
+    def _live(self, model, start, end):
+        start_field, end_field, statuses = BOOKINGS[model]
+        if self.use_database:
+            overlapping = model.objects.filter(_overlaps(model, start, end))
+        else:
+            overlapping = model.objects.filter(**{f'{start_field}__lt': end, f'{end_field}__gt': start})
+        return overlapping.filter(status__in=statuses).order_by()
+
+    def conflicts(self, vehicle_id, start, end, exclude=None):
+        """
+        Live bookings of the vehicle overlapping ``[start, end)``, other than
+        ``exclude`` (a booking instance). Always read from the database, so
+        the caller's own uncommitted bookings count.
+        """
+        found = []
+        for model, (start_field, end_field, _) in BOOKINGS.items():
+            rows = self._live(model, start, end).filter(vehicle_id=vehicle_id)
+            if exclude is not None and type(exclude) is model:
+                rows = rows.exclude(pk=exclude.pk)
+            found.extend(
+                Booking(model, pk, vehicle_id, booking_start, booking_end)
+                for pk, booking_start, booking_end in rows.values_list('pk', start_field, end_field)
+            )
+        return sorted(found, key=lambda booking: booking.start)
+
+    def busy_vehicle_ids(self, start, end):
+        if self.use_database:
+            busy = set()
+            for model in BOOKINGS:
+                busy.update(self._live(model, start, end).filter(vehicle__isnull=False).values_list('vehicle_id', flat=True))
+            return busy
+        return {vehicle_id for vehicle_id, index in self.index().items() if not index.is_free(start, end)}
+
+    def free_vehicles(self, start, end, vehicle_type=None, min_capacity=None):
+        """Vehicles out of maintenance with no live booking overlapping ``[start, end)``, smallest first"""
+        vehicles = Vehicle.objects.exclude(status='maintenance')
+        if vehicle_type:
+            vehicles = vehicles.filter(vehicle_type=vehicle_type)
+        if min_capacity:
+            vehicles = vehicles.filter(capacity__gte=min_capacity)
+        return vehicles.exclude(pk__in=self.busy_vehicle_ids(start, end)).order_by('capacity', 'pk')
+
+    def check(self, booking):
+        """
+        Raise ValidationError if ``booking`` (a Transport or TransportService)
+        would double book its vehicle. Inside a transaction the vehicle row
+        is locked first, so concurrent bookings of it are checked one at a time.
+        """
+        start_field, end_field, statuses = BOOKINGS[type(booking)]
+        start, end = getattr(booking, start_field), getattr(booking, end_field)
+        if not booking.vehicle_id or start is None or end is None:
+            return
+        if end <= start:
+            raise ValidationError({end_field: 'Must be after the start time.'})
+        if booking.status not in statuses:
+            return
+        if connection.in_atomic_block:
+            list(Vehicle.objects.select_for_update().filter(pk=booking.vehicle_id).values_list('pk'))
+        clashes = self.conflicts(booking.vehicle_id, start, end, exclude=booking if booking.pk else None)
+        if clashes:
+            raise ValidationError({
+                'vehicle': [f'Vehicle is already booked: {clash}.' for clash in clashes[:5]]
+            })
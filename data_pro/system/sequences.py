@@ -0,0 +1,160 @@
+import re
+from string import Formatter
+
+from django.apps import apps as django_apps
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from data_pro.models.sequences import Sequence
+
+
+class Block:
+    """``count`` consecutive values of a sequence, iterated as formatted numbers"""
+
+    def __init__(self, sequence, last, count):
+        self.sequence = sequence
+        self.first = last - count + 1
+        self.last = last
+
+    def __len__(self):
+        return self.last - self.first + 1
+
+    def __iter__(self):
+        for value in range(self.first, self.last + 1):
+            yield self.sequence.format_number(value)
+
+
+def _advance(client_id, name, count):
+    """Add ``count`` to the counter and return ``(last_value, format)``, or None if it has no row"""
+    # Stands in for UPDATE ... RETURNING support, which came with INSERT ... RETURNING
+    # everywhere Django has it (PostgreSQL, SQLite 3.35+, MariaDB 10.5+)
+    if connection.features.can_return_columns_from_insert:
+        quote = connection.ops.quote_name
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {quote(Sequence._meta.db_table)} "
+                f"SET {quote('last_value')} = {quote('last_value')} + %s, {quote('updated_at')} = %s "
+                f"WHERE {quote('client_id')} = %s AND {quote('name')} = %s "
+                f"RETURNING {quote('last_value')}, {quote('format')}",
+                [count, now, client_id, name],
+            )
+            return cursor.fetchone()
+    with transaction.atomic():
+        # The UPDATE locks the row, so the SELECT reads our own value
+        rows = Sequence.objects.filter(client_id=client_id, name=name)
+        if not rows.update(last_value=F('last_value') + count, updated_at=timezone.now()):
+            return None
+        return rows.values_list('last_value', 'format').get()
+
+
+def allocate(client, name, count=1):
+    """
+    Take the next ``count`` values of the ``name`` sequence of ``client``
+    (an instance or id) and return them as a Block, with one UPDATE ...
+    RETURNING (an UPDATE and a SELECT where that is missing). The counter
+    row is created on first use.
+
+    Sequences are per client, so writers of different clients never
+    wait on each other. Inside a transaction the row stays locked until
+    it ends and a rollback hands the values back, so numbers are
+    gap-free; writers of the same sequence queue only for the rest of
+    that transaction, so allocate as late as possible. Outside one the
+    UPDATE commits at once, and the values of a failed insert are lost.
+    Bulk paths take one block for all their rows.
+    """
+    client_id = getattr(client, 'pk', client)
+    # The UPDATE comes first: on SQLite a transaction that read before
+    # writing cannot wait for the write lock, and fails at once instead
+    advanced = _advance(client_id, name, count)
+    if advanced is None:
+        Sequence.objects.get_or_create(client_id=client_id, name=name)
+        advanced = _advance(client_id, name, count)
+    last, number_format = advanced
+    return Block(Sequence(client_id=client_id, name=name, last_value=last, format=number_format), last, count)
+
+
+def next_number(client, name):
+    return next(iter(allocate(client, name)))
+
+
+def assign(objects, field, name):
+    """
+    Give every object with an empty ``field`` a number of the ``name``
+    sequence of its client, taking one block per client. For
+    bulk_create paths; the objects need ``client_id``.
+    """
+    by_client = {}
+    for obj in objects:
+        if not getattr(obj, field):
+            by_client.setdefault(obj.client_id, []).append(obj)
+    for client_id, pending in by_client.items():
+        for obj, number in zip(pending, allocate(client_id, name, len(pending))):
+            setattr(obj, field, number)
+    return objects
+
+
+def lock(client, name):
+    """
+    The ``name`` counter of ``client``, locked until the surrounding
+    transaction ends, for callers that take numbers from it and set
+    last_value themselves.
+    """
+    if not transaction.get_connection().in_atomic_block:
+        raise transaction.TransactionManagementError('sequences.lock() needs a transaction')
+    block = allocate(client, name, 0)
+    return Sequence.objects.get(client_id=block.sequence.client_id, name=name)
+
+
+# Sequence name -> the model field numbered from it
+NUMBERED_FIELDS = {
+    'invoice': ('data_pro.Invoice', 'invoice_number'),
+    'transport_reference': ('data_pro.TransportService', 'reference_number'),
+    'tracking_code': ('data_pro.TransportService', 'tracking_code'),
+}
+
+
+def _pattern(number_format, client_id):
+    """Regex matching the numbers ``number_format`` gives ``client_id``, capturing the value"""
+    parts = []
+    for literal, field, spec, _conversion in Formatter().parse(number_format):
+        parts.append(re.escape(literal))
+        if field == 'number':
+            parts.append(r'(?P<number>\d+)')
+        elif field == 'client':
+            parts.append(re.escape(format(client_id, spec)))
+        elif field is not None:
+            parts.append(r'\d+' if field == 'year' else '.*?')
+    return re.compile(''.join(parts))
+
+
+def seed(apps=None):
+    """
+    Create or raise every client's counters to the highest number already
+    stored in the field they number, so numbers handed out next cannot
+    collide with rows written before the sequences existed. Numbers not in
+    the sequence's format (its own, else the SEQUENCE_FORMATS default) are
+    ignored. ``apps`` is the migration state when run from a migration.
+    """
+    sequence_model = Sequence if apps is None else apps.get_model('data_pro', 'Sequence')
+    for name, (label, field) in NUMBERED_FIELDS.items():
+        model = (apps or django_apps).get_model(label)
+        formats = dict(
+            sequence_model.objects.filter(name=name).exclude(format='').values_list('client_id', 'format')
+        )
+        patterns = {}
+        highest = {}
+        numbers = model.objects.exclude(**{f'{field}__isnull': True}).exclude(**{field: ''})
+        for client_id, number in numbers.values_list('client_id', field).iterator():
+            if client_id not in patterns:
+                patterns[client_id] = _pattern(formats.get(client_id) or Sequence.default_format(name), client_id)
+            match = patterns[client_id].fullmatch(number)
+            if match:
+                highest[client_id] = max(highest.get(client_id, 0), int(match['number']))
+        for client_id, value in highest.items():
+            sequence, created = sequence_model.objects.get_or_create(
+                client_id=client_id, name=name, defaults={'last_value': value}
+            )
+            if not created and sequence.last_value < value:
+                sequence_model.objects.filter(pk=sequence.pk).update(last_value=value)
@@ -0,0 +1,84 @@
+import tempfile
+
+from django.apps import apps
+from django.core.files import File
+from django.urls import reverse
+from django.utils.http import urlencode
+
+from data_pro.models.clients import Client
+from data_pro.models.customers import Customer
+from data_pro.models.jobs import BackgroundJob
+from data_pro.system.reports import CUSTOMER_EXPORT_COLUMNS, visa_report
+from data_pro.utils.csv_handlers import StreamingCSVExporter
+from data_pro.utils.customer_import import CustomerCSVImporter
+from data_pro.utils.excel_handlers import ExcelImporter
+from data_pro.utils.visa_import import VisaExcelImporter
+
+
+def customer_import(job, progress):
+    """CSV customer import; ``client_id`` limits the rows to one client"""
+    client_id = job.params.get('client_id')
+    with job.input_file.open('rb') as file:
+        progress.update(total_records=max(sum(1 for _ in file) - 1, 0))
+        file.seek(0)
+        importer = CustomerCSVImporter(
+            client=Client.objects.get(pk=client_id) if client_id else None,
+            batch_size=job.params.get('batch_size'),
+            progress=progress.update,
+        )
+        result = importer.import_file(file)
+    return result.as_dict()
+
+
+def visa_import(job, progress):
+    """Bulk Excel visa import; ``client_id`` limits the rows to that client's customers"""
+    client_id = job.params.get('client_id')
+    with job.input_file.open('rb') as file:
+        importer = VisaExcelImporter(
+            client=Client.objects.get(pk=client_id) if client_id else None,
+            batch_size=job.params.get('batch_size'),
+            dry_run=job.params.get('dry_run', False),
+            strict=job.params.get('strict', False),
+            progress=progress.update,
+        )
+        result = importer.import_file(file)
+    return result.as_dict()
+
+
+def excel_import(job, progress):
+    """ExcelImporter into the model labelled ``model`` (``app_label.ModelName``)"""
+    model = apps.get_model(job.params['model'])
+    with job.input_file.open('rb') as file:
+        created = ExcelImporter(model, job.initiated_by, job.params.get('batch_size')).import_from_excel(
+            file, progress=progress.update
+        )
+    progress.update(successful=len(created))
+    return {'created': len(created)}
+
+
+def visa_export(job, progress):
+    """Build the visa export in the report cache; the download URL then serves it at once"""
+    params = job.params
+    visa_report.build(params.get('client_id'), params.get('filters', {}), params['format'])
+    query = {**params.get('filters', {}), 'format': params['format']}
+    return {'download_url': f"{reverse('data_pro:visa-export')}?{urlencode(query)}"}
+
+
+def customer_export(job, progress):
+    """
+    Customer CSV export into the job's output file: ``columns`` names a
+    CUSTOMER_EXPORT_COLUMNS set, ``filters`` are the lookups scoping the rows
+    """
+    params = job.params
+    queryset = Customer.objects.filter(**params.get('filters', {}))
+    total = queryset.count()
+    progress.update(total_records=total)
+    filename = params['filename'] + ('.gz' if params.get('gzip') else '')
+    exporter = StreamingCSVExporter(queryset, CUSTOMER_EXPORT_COLUMNS[params['columns']])
+    with tempfile.TemporaryFile() as output:
+        exporter.write(output, params.get('gzip'), lambda rows: progress.update(processed=rows))
+        job.output_file.save(filename, File(output), save=False)
+    # run() only saves the progress and outcome fields
+    BackgroundJob.objects.filter(pk=job.pk).update(output_file=job.output_file.name)
+    progress.update(processed=total, successful=total)
+    return {'rows': total, 'download_url': reverse('data_pro:job-download', kwargs={'pk': job.pk})}
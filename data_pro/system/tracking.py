@@ -0,0 +1,141 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Case, DateTimeField, F, Q, Value, When
+from django.utils import timezone
+
+from data_pro.models.transports import TransportLocationPing, TransportService
+
+# Services per coalesced current_location UPDATE, keeping the CASE and
+# its parameters well under the database limits
+UPDATE_CHUNK = 200
+
+# prune_location_pings defaults
+KEEP_DAYS = 7
+DOWNSAMPLE_MINUTES = 5
+MAX_DAYS = 90
+
+
+def ingest(pings, queryset=None):
+    """
+    Store validated pings (dicts of ``service``, ``recorded_at`` and
+    ``location`` and/or ``latitude``/``longitude``) and move each
+    service's current_location to its newest ping.
+
+    The service ids are checked against ``queryset`` with one query,
+    the pings written with bulk_create, and current_location updated
+    with one ``UPDATE ... SET current_location = CASE ...`` per
+    UPDATE_CHUNK services. A service only takes a ping newer than its
+    location_updated_at, so late or out-of-order batches never move it
+    back. The services' updated_at is left alone: a position report is
+    not an edit.
+
+    Returns ``(pings stored, indexes of pings whose service is unknown,
+    services whose current_location changed)``.
+    """
+    queryset = TransportService.objects.all() if queryset is None else queryset
+    known = set(queryset.filter(pk__in={ping['service'] for ping in pings}).values_list('pk', flat=True))
+
+    rows, unknown, latest = [], [], {}
+    for index, ping in enumerate(pings):
+        if ping['service'] not in known:
+            unknown.append(index)
+            continue
+        row = TransportLocationPing(
+            service_id=ping['service'],
+            recorded_at=ping['recorded_at'],
+            latitude=ping.get('latitude'),
+            longitude=ping.get('longitude'),
+            location=ping.get('location') or '',
+        )
+        rows.append(row)
+        if row.service_id not in latest or row.recorded_at >= latest[row.service_id].recorded_at:
+            latest[row.service_id] = row
+
+    updated = 0
+    with transaction.atomic():
+        TransportLocationPing.objects.bulk_create(rows, batch_size=1000)
+        newest = list(latest.values())
+        for start in range(0, len(newest), UPDATE_CHUNK):
+            updated += _move(newest[start:start + UPDATE_CHUNK])
+    return len(rows), unknown, updated
+
+
+def _move(pings):
+    def newer(ping):
+        return Q(pk=ping.service_id) & (
+            Q(location_updated_at__isnull=True) | Q(location_updated_at__lt=ping.recorded_at)
+        )
+
+    # current_location is assigned first: MySQL evaluates SET left to right
+    return TransportService.objects.filter(
+        pk__in=[ping.service_id for ping in pings]
+    ).filter(
+        Q(location_updated_at__isnull=True)
+        | Q(location_updated_at__lt=max(ping.recorded_at for ping in pings))
+    ).update(
+        current_location=Case(
+            *(When(newer(ping), then=Value(ping.label[:255])) for ping in pings),
+            default=F('current_location'),
+        ),
+        location_updated_at=Case(
+            *(When(newer(ping), then=Value(ping.recorded_at)) for ping in pings),
+            default=F('location_updated_at'),
+            output_field=DateTimeField(),
+        ),
+    )
+
+
+def prune(keep_days=KEEP_DAYS, downsample_minutes=DOWNSAMPLE_MINUTES, max_days=MAX_DAYS, batch_size=5000):
+    """
+    Apply the ping retention policy: pings older than ``max_days`` are
+    deleted, and those between ``keep_days`` and ``max_days`` old thinned
+    to the first ping of each service per ``downsample_minutes``. Pings
+    younger than ``keep_days`` are kept at full resolution.
+
+    The thinned range is read in keyset pages of ``batch_size`` along the
+    (service, recorded_at) index and deleted page by page, so memory stays
+    flat however many pings there are. Returns ``(expired, downsampled)``.
+    """
+    now = timezone.now()
+    horizon = now - timedelta(days=max_days)
+
+    expired = 0
+    old = TransportLocationPing.objects.filter(recorded_at__lt=horizon)
+    while True:
+        pks = list(old.values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            break
+        expired += TransportLocationPing.objects.filter(pk__in=pks).delete()[0]
+
+    downsampled = 0
+    if downsample_minutes:
+        interval = downsample_minutes * 60
+        window = (
+            TransportLocationPing.objects
+            .filter(recorded_at__gte=horizon, recorded_at__lt=now - timedelta(days=keep_days))
+            .order_by('service_id', 'recorded_at', 'pk')
+        )
+        bucket = last = None
+        while True:
+            page = window
+            if last:
+                service_id, recorded_at, pk = last
+                page = page.filter(
+                    Q(service_id__gt=service_id)
+                    | Q(service_id=service_id, recorded_at__gt=recorded_at)
+                    | Q(service_id=service_id, recorded_at=recorded_at, pk__gt=pk)
+                )
+            rows = list(page.values_list('service_id', 'recorded_at', 'pk')[:batch_size])
+            if not rows:
+                break
+            surplus = []
+            for service_id, recorded_at, pk in rows:
+                key = (service_id, int(recorded_at.timestamp()) // interval)
+                if key == bucket:
+                    surplus.append(pk)
+                bucket = key
+            if surplus:
+                downsampled += TransportLocationPing.objects.filter(pk__in=surplus).delete()[0]
+            last = rows[-1]
+    return expired, downsampled
@@ -14,6 +14,8 @@ from data_pro.models.invoices import  *
 from data_pro.models.vehicles import  *
 from data_pro.models.transports import  *
 from data_pro.models.clients import  *
+from data_pro.models.client_stats import ClientStats
+from data_pro.system.metrics import DashboardMetrics
 
 
 class SuperAdminPanelView(LoginRequiredMixin, UserPassesTestMixin, TemplateView):
@@ -27,24 +29,23 @@ class SuperAdminPanelView(LoginRequiredMixin, UserPassesTestMixin, TemplateView)
         context = super().get_context_data(**kwargs)
         today = timezone.now().date()
         
-        # System-wide statistics
+        # System-wide statistics; record counters are summed from ClientStats
+        stats = ClientStats.for_client(None)
         context.update({
-            'total_clients': Client.objects.filter(is_active=True).count(),
+            'total_clients': Client.objects.filter(status=Client.StatusChoices.ACTIVE).count(),
             'system_users': Client.objects.count(),
-            'active_customers': Customer.objects.filter(is_active=True).count(),
+            'active_customers': stats['active_customers'],
             'revenue_this_month': Invoice.objects.filter(
                 issue_date__month=today.month,
                 issue_date__year=today.year
             ).aggregate(total=Sum('total_amount'))['total'] or 0,
             'pending_approvals': {
-                'visas': Visa.objects.filter(status='pending').count(),
-                'extensions': PassportExtension.objects.filter(released_date__isnull=True).count(),
+                'visas': stats['pending_visas'],
+                'extensions': stats['pending_extensions'],
             },
             'system_health': {
-                'active_transports': Transport.objects.filter(
-                    status__in=['scheduled', 'in_progress']
-                ).count(),
-                'available_vehicles': Vehicle.objects.filter(status='available').count(),
+                'active_transports': stats['active_transports'],
+                'available_vehicles': stats['available_vehicles'],
             }
         })
         return context
@@ -70,44 +71,32 @@ class SystemSettingsView(LoginRequiredMixin, UserPassesTestMixin, TemplateView):
 class SystemDashboardView(LoginRequiredMixin, TemplateView):
     """Main system dashboard view showing key metrics"""
     template_name = 'admin/dashboard.html'
+    query_budget = 10
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         user = self.request.user
-        today = timezone.now().date()
 
         # Base filter for client-specific data
         client_filter = {}
         if not (user.is_superuser or user.user_type == 'admin'):
             client_filter = {'client': user.client}
 
-        # Get counts for all metrics
+        # All counters come from one cached, tenant-scoped query
+        metrics = DashboardMetrics(client_filter.get('client')).get()
         context.update({
-            'customer_count': Customer.objects.filter(**client_filter).count(),
-            'active_visa_count': Visa.objects.filter(
-                status='approved',
-                **client_filter
-            ).count(),
-            'expiring_passports': Passport.objects.filter(
-                expiry_date__range=(today, today + timezone.timedelta(days=30)),
-                **client_filter
-            ).exclude(status='expired').count(),
-            'pending_extensions': PassportExtension.objects.filter(
-                released_date__isnull=True,
-                **client_filter
-            ).count(),
-            'available_vehicles': Vehicle.objects.filter(
-                status='available',
-                **client_filter
-            ).count(),
-            'active_transports': Transport.objects.filter(
-                status__in=['scheduled', 'in_progress'],
-                **client_filter
-            ).count(),
+            'customer_count': metrics['customers'],
+            'active_visa_count': metrics['active_visas'],
+            'expiring_passports': metrics['expiring_passports'],
+            'pending_extensions': metrics['pending_extensions'],
+            'available_vehicles': metrics['available_vehicles'],
+            'active_transports': metrics['active_transports'],
             'recent_invoices': Invoice.objects.filter(
                 **client_filter
             ).order_by('-issue_date')[:5],
         })
+        if user.is_superuser:
+            context['metrics_cache_stats'] = DashboardMetrics.stats()
         return context
 
 class PassportExtensionListView(LoginRequiredMixin, ListView):
@@ -154,21 +143,13 @@ class ClientDashboardView(LoginRequiredMixin, TemplateView):
             return context
             
         client = self.request.user.client
-        
+        stats = ClientStats.for_client(client.pk)
+
         context.update({
             'client': client,
-            'active_customers': Customer.objects.filter(
-                client=client,
-                is_active=True
-            ).count(),
-            'pending_visas': Visa.objects.filter(
-                customer__client=client,
-                status='pending'
-            ).count(),
-            'active_transports': Transport.objects.filter(
-                client=client,
-                status__in=['scheduled', 'in_progress']
-            ).count(),
+            'active_customers': stats['active_customers'],
+            'pending_visas': stats['pending_visas'],
+            'active_transports': stats['active_transports'],
         })
         return context
     
@@ -0,0 +1,56 @@
+import itertools
+from datetime import date, timedelta
+from decimal import Decimal
+
+from data_pro.models.clients import Client
+from data_pro.models.customers import Customer
+from data_pro.models.visas import Visa
+
+_numbers = itertools.count(1)
+
+
+def make_client(**fields):
+    """A Client written with bulk_create, which skips Client.clean()"""
+    n = next(_numbers)
+    values = {
+        'name': f'Client {n}',
+        'company_name': f'Test Client {n}',
+        'contact_person': 'Test Contact',
+        'phone': '+100000000',
+        'email': f'client-{n}@example.com',
+        'address_line1': '1 Test Road',
+        'city': 'Nairobi',
+        'state': 'Nairobi',
+        'postal_code': '00100',
+        **fields,
+    }
+    return Client.objects.bulk_create([Client(**values)])[0]
+
+
+def make_customer(client, **fields):
+    n = next(_numbers)
+    values = {
+        'customer_type': 'individual',
+        'first_name': 'Test',
+        'last_name': f'Customer {n}',
+        'email': f'customer-{n}@example.com',
+        'phone': f'+2547{n:08d}',
+        **fields,
+    }
+    return Customer.objects.create(client=client, **values)
+
+
+def make_visa(customer, **fields):
+    n = next(_numbers)
+    issue_date = date.today()
+    values = {
+        'visa_number': f'V{n:06d}',
+        'visa_type': Visa.VisaType.values[0],
+        'issuing_country': 'Kenya',
+        'issue_date': issue_date,
+        'expiry_date': issue_date + timedelta(days=90),
+        'duration_days': 90,
+        'unit_cost': Decimal('50.00'),
+        **fields,
+    }
+    return Visa.objects.create(customer=customer, **values)
@@ -0,0 +1,15 @@
+import io
+
+from django.core.management import call_command
+from django.test import TestCase
+
+
+class AdminChangelistQueryTests(TestCase):
+    def test_changelists_run_a_constant_number_of_queries(self):
+        output = io.StringIO()
+
+        # Raises CommandError, failing the test, when a changelist's query count grows with its rows
+        call_command('check_admin_queries', customers=40, stdout=output)
+
+        self.assertIn('Every changelist runs a constant number of queries', output.getvalue())
+        self.assertNotIn('FAIL', output.getvalue())
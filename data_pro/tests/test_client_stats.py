@@ -0,0 +1,120 @@
+from django.test import TestCase
+
+from data_pro.models.client_stats import ClientStats
+from data_pro.models.vehicles import Vehicle
+from data_pro.models.visas import Visa
+from data_pro.system import client_stats
+from data_pro.tests.factories import make_client, make_customer, make_visa
+
+
+def counters(client):
+    return ClientStats.objects.filter(client=client).values(*ClientStats.counter_names()).get()
+
+
+class ClientStatsCounterTests(TestCase):
+    def setUp(self):
+        self.client_org = make_client()
+        self.customer = make_customer(self.client_org, status='active')
+
+    def assertMatchesRebuild(self, client):
+        """The incrementally maintained row equals a recount from the source tables"""
+        maintained = counters(client)
+        client_stats.rebuild(client_ids=[client.pk])
+        self.assertEqual(maintained, counters(client))
+
+    def test_create_counts_toward_matching_counters(self):
+        make_customer(self.client_org, status='inactive')
+        make_visa(self.customer)
+        make_visa(self.customer, status=Visa.Status.APPROVED)
+
+        stats = counters(self.client_org)
+        self.assertEqual(
+            (stats['customers'], stats['active_customers'], stats['visas'], stats['pending_visas'],
+             stats['approved_visas']),
+            (2, 1, 2, 1, 1),
+        )
+        self.assertMatchesRebuild(self.client_org)
+
+    def test_status_change_moves_the_instance_between_counters(self):
+        visa = make_visa(self.customer)
+
+        visa.status = Visa.Status.APPROVED
+        visa.save()
+
+        stats = counters(self.client_org)
+        self.assertEqual((stats['visas'], stats['pending_visas'], stats['approved_visas']), (1, 0, 1))
+        self.assertMatchesRebuild(self.client_org)
+
+    def test_delete_decrements(self):
+        visa = make_visa(self.customer)
+
+        visa.delete()
+
+        stats = counters(self.client_org)
+        self.assertEqual((stats['visas'], stats['pending_visas']), (0, 0))
+        self.assertMatchesRebuild(self.client_org)
+
+    def test_moving_to_another_client_moves_the_counts(self):
+        other_client = make_client()
+        other_customer = make_customer(other_client)
+        visa = make_visa(self.customer)
+
+        visa.customer = other_customer
+        visa.save()
+
+        self.assertEqual(counters(self.client_org)['visas'], 0)
+        self.assertEqual(counters(other_client)['visas'], 1)
+        self.assertMatchesRebuild(self.client_org)
+        self.assertMatchesRebuild(other_client)
+
+    def test_missing_row_is_seeded_from_a_recount(self):
+        make_visa(self.customer)
+        ClientStats.objects.filter(client=self.client_org).delete()
+
+        make_visa(self.customer)
+
+        stats = counters(self.client_org)
+        self.assertEqual((stats['customers'], stats['visas'], stats['pending_visas']), (1, 2, 2))
+
+    def test_delete_without_a_row_never_goes_negative(self):
+        visa = make_visa(self.customer)
+        ClientStats.objects.filter(client=self.client_org).delete()
+
+        visa.delete()
+
+        self.assertFalse(ClientStats.objects.filter(client=self.client_org).exists())
+
+    def test_queryset_update_transitions(self):
+        visas = [make_visa(self.customer) for _ in range(3)]
+        rows = [(self.client_org.pk, Visa.Status.PROCESSING)] * 2
+        Visa.objects.filter(pk__in=[visa.pk for visa in visas[:2]]).update(status=Visa.Status.APPROVED)
+
+        client_stats.transitioned(Visa, rows, 'status', Visa.Status.APPROVED)
+
+        stats = counters(self.client_org)
+        self.assertEqual((stats['pending_visas'], stats['approved_visas']), (1, 2))
+        self.assertMatchesRebuild(self.client_org)
+
+    def test_shared_vehicle_counters(self):
+        vehicle = Vehicle.objects.create(
+            make='Toyota', model='Hiace', year=2020, license_plate='KAA 001A',
+            vehicle_type='van', capacity=14, status='available',
+        )
+        self.assertEqual(client_stats.ClientStats.for_client(self.client_org.pk)['available_vehicles'], 1)
+
+        vehicle.status = 'maintenance'
+        vehicle.save()
+
+        self.assertEqual(ClientStats.objects.get(client__isnull=True).available_vehicles, 0)
+
+    def test_rebuild_for_bulk_created_rows(self):
+        visas = Visa.objects.bulk_create([
+            Visa(customer=self.customer, visa_number=f'B{i}', visa_type=Visa.VisaType.values[0],
+                 issuing_country='Kenya', issue_date='2026-01-01', expiry_date='2099-01-01',
+                 duration_days=90, unit_cost=10, total_cost=10)
+            for i in range(3)
+        ])
+
+        client_stats.rebuild_for(Visa, [visa.pk for visa in visas])
+
+        self.assertEqual(counters(self.client_org)['visas'], 3)
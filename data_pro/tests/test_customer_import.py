@@ -0,0 +1,109 @@
+import io
+
+from django.test import TestCase
+
+from data_pro.models.client_stats import ClientStats
+from data_pro.models.customers import Customer
+from data_pro.models.outbox import OutboundEmail
+from data_pro.tests.factories import make_client, make_customer
+from data_pro.utils.customer_import import CustomerCSVImporter
+
+
+def csv_file(*lines):
+    return io.BytesIO(('\n'.join(lines) + '\n').encode('utf-8'))
+
+
+class CustomerCSVImporterTests(TestCase):
+    def setUp(self):
+        self.client_org = make_client()
+
+    def test_creates_new_customers(self):
+        result = CustomerCSVImporter(client=self.client_org).import_file(csv_file(
+            'first_name,last_name,email,phone',
+            'Ada,Lovelace,ada@example.com,+254700000001',
+            'Alan,Turing,alan@example.com,+254700000002',
+        ))
+
+        self.assertEqual((result.created, result.updated, result.error_count), (2, 0, 0))
+        self.assertEqual(
+            set(Customer.objects.filter(client=self.client_org).values_list('email', flat=True)),
+            {'ada@example.com', 'alan@example.com'},
+        )
+
+    def test_updates_existing_customer_matched_on_client_and_email(self):
+        existing = make_customer(self.client_org, email='ada@example.com', phone='+254700000009')
+        other_client = make_client()
+        other = make_customer(other_client, email='ada@example.com', phone='+254700000008')
+
+        result = CustomerCSVImporter(client=self.client_org).import_file(csv_file(
+            'first_name,last_name,email,phone',
+            'Ada,King,ada@example.com,+254700000001',
+        ))
+
+        self.assertEqual((result.created, result.updated), (0, 1))
+        existing.refresh_from_db()
+        self.assertEqual((existing.last_name, existing.phone), ('King', '+254700000001'))
+        other.refresh_from_db()
+        self.assertEqual(other.phone, '+254700000008')
+
+    def test_later_rows_for_the_same_email_win(self):
+        result = CustomerCSVImporter(client=self.client_org).import_file(csv_file(
+            'first_name,last_name,email,phone',
+            'Ada,First,ada@example.com,+254700000001',
+            'Ada,Second,ada@example.com,+254700000002',
+        ))
+
+        self.assertEqual(result.created, 1)
+        self.assertEqual(Customer.objects.get(email='ada@example.com').last_name, 'Second')
+
+    def test_upserts_across_batches(self):
+        lines = [f'Name{i},Last{i},c{i}@example.com,+2547000000{i:02d}' for i in range(5)]
+        CustomerCSVImporter(client=self.client_org, batch_size=2).import_file(
+            csv_file('first_name,last_name,email,phone', *lines)
+        )
+        lines[3] = 'Name3,Changed,c3@example.com,+254700000003'
+
+        result = CustomerCSVImporter(client=self.client_org, batch_size=2).import_file(
+            csv_file('first_name,last_name,email,phone', *lines)
+        )
+
+        self.assertEqual((result.created, result.updated), (0, 5))
+        self.assertEqual(Customer.objects.filter(client=self.client_org).count(), 5)
+        self.assertEqual(Customer.objects.get(email='c3@example.com').last_name, 'Changed')
+
+    def test_reports_invalid_rows_and_imports_the_rest(self):
+        result = CustomerCSVImporter().import_file(csv_file(
+            'client_id,first_name,last_name,email,phone',
+            f'{self.client_org.pk},Ada,Lovelace,ada@example.com,+254700000001',
+            '999999,Alan,Turing,alan@example.com,+254700000002',
+            f'{self.client_org.pk},Grace,Hopper,not-an-email,+254700000003',
+        ))
+
+        self.assertEqual((result.created, result.error_count), (1, 2))
+        self.assertEqual([error['row'] for error in result.errors], [3, 4])
+        self.assertIn('client_id', result.errors[0]['errors'])
+        self.assertIn('email', result.errors[1]['errors'])
+
+    def test_queues_welcome_emails_for_new_customers_only(self):
+        make_customer(self.client_org, email='ada@example.com')
+        OutboundEmail.objects.all().delete()
+
+        CustomerCSVImporter(client=self.client_org).import_file(csv_file(
+            'first_name,last_name,email,phone',
+            'Ada,Lovelace,ada@example.com,+254700000001',
+            'Alan,Turing,alan@example.com,+254700000002',
+        ))
+
+        self.assertEqual(
+            [email.recipients for email in OutboundEmail.objects.all()], [['alan@example.com']]
+        )
+
+    def test_rebuilds_client_stats(self):
+        CustomerCSVImporter(client=self.client_org).import_file(csv_file(
+            'first_name,last_name,email,phone,status',
+            'Ada,Lovelace,ada@example.com,+254700000001,active',
+            'Alan,Turing,alan@example.com,+254700000002,inactive',
+        ))
+
+        stats = ClientStats.objects.get(client=self.client_org)
+        self.assertEqual((stats.customers, stats.active_customers), (2, 1))
@@ -0,0 +1,83 @@
+import io
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pandas as pd
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from data_pro.models.client_stats import ClientStats
+from data_pro.models.visas import Visa
+from data_pro.tests.factories import make_client, make_customer
+from data_pro.utils.excel_handlers import ExcelImporter
+
+
+def workbook(rows):
+    output = io.BytesIO()
+    pd.DataFrame(rows).to_excel(output, index=False)
+    output.seek(0)
+    return output
+
+
+class ExcelImporterTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user('importer')
+        self.client_org = make_client()
+        self.customer = make_customer(self.client_org)
+
+    def visa_row(self, number, **fields):
+        today = date.today()
+        return {
+            'visa_number': number,
+            'customer': self.customer.pk,
+            'visa_type': Visa.VisaType.values[0],
+            'issuing_country': 'Kenya',
+            'issue_date': (today - timedelta(days=10)).isoformat(),
+            'expiry_date': (today + timedelta(days=80)).isoformat(),
+            'duration_days': 90,
+            'unit_cost': 40,
+            'service_fee': 10,
+            **fields,
+        }
+
+    def test_imports_in_batches_and_reports_progress(self):
+        calls = []
+        created = ExcelImporter(Visa, self.user, batch_size=2).import_from_excel(
+            workbook([self.visa_row(f'XL{i}') for i in range(5)]),
+            progress=lambda **fields: calls.append(fields),
+        )
+
+        self.assertEqual(len(created), 5)
+        self.assertEqual(Visa.objects.filter(customer=self.customer).count(), 5)
+        self.assertEqual([call['processed'] for call in calls], [2, 4, 5])
+        self.assertEqual({call['total_records'] for call in calls}, {5})
+
+    def test_coerces_columns_and_derives_what_save_would_set(self):
+        past = date.today() - timedelta(days=1)
+        ExcelImporter(Visa, self.user).import_from_excel(workbook([
+            self.visa_row('XL-LIVE'),
+            self.visa_row('XL-EXPIRED', expiry_date=past.isoformat()),
+        ]))
+
+        live = Visa.objects.get(visa_number='XL-LIVE')
+        self.assertEqual(live.customer, self.customer)
+        self.assertEqual(live.issue_date, date.today() - timedelta(days=10))
+        self.assertEqual(live.total_cost, Decimal('50'))
+        self.assertEqual(live.status, Visa.Status.PROCESSING)
+        self.assertEqual(Visa.objects.get(visa_number='XL-EXPIRED').status, Visa.Status.EXPIRED)
+
+    def test_rebuilds_client_stats(self):
+        ExcelImporter(Visa, self.user).import_from_excel(workbook([
+            self.visa_row('XL1'), self.visa_row('XL2', status=Visa.Status.APPROVED),
+        ]))
+
+        stats = ClientStats.objects.get(client=self.client_org)
+        self.assertEqual((stats.visas, stats.pending_visas, stats.approved_visas), (2, 1, 1))
+
+    def test_a_failing_batch_rolls_back_the_whole_import(self):
+        rows = [self.visa_row('XL1'), self.visa_row('XL2'), self.visa_row('XL1')]
+
+        with self.assertRaises(Exception):
+            ExcelImporter(Visa, self.user, batch_size=2).import_from_excel(workbook(rows))
+
+        self.assertFalse(Visa.objects.filter(visa_number__startswith='XL').exists())
@@ -0,0 +1,251 @@
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from data_pro.models.jobs import BackgroundJob
+from data_pro.system.jobs import JobCancelled, JobProgress, Worker, cancel, claim, enqueue, purge, run
+from data_pro.tests.factories import make_client, make_customer
+from data_pro.views.jobs import job_message
+
+Status = BackgroundJob.StatusChoices
+
+
+def succeed(job, progress):
+    progress.update(total_records=2, processed=2, successful=2)
+    return {'created': 2, 'echo': job.params.get('echo')}
+
+
+def explode(job, progress):
+    progress.update(total_records=1)
+    raise ValueError('bad row')
+
+
+def cancel_midway(job, progress):
+    progress.update(total_records=10, processed=3)
+    BackgroundJob.objects.filter(pk=job.pk).update(cancel_requested=True)
+    # What the heartbeat thread does every JobProgress.interval seconds
+    progress._flush()
+    progress.update(processed=4)
+    return {'created': 10}
+
+
+def read_input(job, progress):
+    with job.input_file.open('rb') as f:
+        return {'size': len(f.read())}
+
+
+TEST_TASKS = {
+    'test_ok': 'data_pro.tests.test_jobs.succeed',
+    'test_fail': 'data_pro.tests.test_jobs.explode',
+    'test_cancel': 'data_pro.tests.test_jobs.cancel_midway',
+    'test_input': 'data_pro.tests.test_jobs.read_input',
+}
+
+
+class JobTestCase(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(
+            MEDIA_ROOT=media_root, BACKGROUND_JOB_TASKS=TEST_TASKS, BACKGROUND_JOBS_INLINE_MAX_BYTES=16,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = get_user_model().objects.create_user('worker-test')
+
+
+class EnqueueTests(JobTestCase):
+    def test_queues_a_pending_job(self):
+        job = enqueue('test_ok', self.user, echo='hi')
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Status.PENDING)
+        self.assertEqual(job.params, {'echo': 'hi'})
+        self.assertEqual(job.attempts, 0)
+        self.assertEqual(job_message(job, 'Test'), f'Test queued as job #{job.pk}.')
+
+    def test_unknown_kind_is_rejected(self):
+        with self.assertRaises(ValueError):
+            enqueue('no_such_kind')
+        self.assertFalse(BackgroundJob.objects.exists())
+
+    @override_settings(BACKGROUND_JOBS_EAGER=True)
+    def test_eager_setting_runs_the_job_at_once(self):
+        job = enqueue('test_ok', self.user, echo='hi')
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Status.COMPLETED)
+        self.assertEqual(job.result, {'created': 2, 'echo': 'hi'})
+        self.assertEqual((job.total_records, job.processed, job.successful), (2, 2, 2))
+        self.assertEqual(job.attempts, 1)
+        self.assertIsNotNone(job.completed_at)
+        self.assertEqual(job_message(job, 'Test'), 'Test completed: 2 created.')
+
+    def test_small_files_run_inline_and_large_ones_queue(self):
+        small = enqueue('test_input', self.user, file=SimpleUploadedFile('small.csv', b'a,b\n'))
+        large = enqueue('test_input', self.user, file=SimpleUploadedFile('large.csv', b'a,b\n' * 10))
+
+        self.assertEqual(small.status, Status.COMPLETED)
+        self.assertEqual(small.result, {'size': 4})
+        self.assertEqual(large.status, Status.PENDING)
+        self.assertTrue(large.input_file.name.startswith('jobs/'))
+
+
+class ClaimAndRunTests(JobTestCase):
+    def test_claim_takes_the_oldest_pending_job_once(self):
+        first = enqueue('test_ok')
+        second = enqueue('test_fail')
+
+        claimed = claim('w1')
+        self.assertEqual(claimed.pk, first.pk)
+        self.assertEqual(claimed.status, Status.PROCESSING)
+        self.assertEqual(claimed.worker, 'w1')
+        self.assertEqual(claimed.attempts, 1)
+        self.assertIsNotNone(claimed.heartbeat_at)
+
+        self.assertEqual(claim('w2').pk, second.pk)
+        self.assertIsNone(claim('w3'))
+
+    def test_claim_filters_by_kind(self):
+        enqueue('test_ok')
+        failing = enqueue('test_fail')
+
+        self.assertEqual(claim('w1', kinds=['test_fail']).pk, failing.pk)
+        self.assertIsNone(claim('w1', kinds=['test_fail']))
+
+    def test_failure_is_recorded_with_its_traceback(self):
+        enqueue('test_fail')
+
+        with self.assertLogs('data_pro.system.jobs', 'ERROR'):
+            job = run(claim('w1'))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Status.FAILED)
+        self.assertIn('ValueError: bad row', job.error_log)
+        self.assertEqual(job.total_records, 1)
+        self.assertEqual(job_message(job, 'Test'), 'Test failed.')
+
+    def test_worker_runs_every_pending_job(self):
+        enqueue('test_ok')
+        enqueue('test_ok')
+        with self.assertLogs('data_pro.system.jobs', 'ERROR'):
+            enqueue('test_fail')
+            ran = Worker(name='w1').run_pending()
+
+        self.assertEqual(ran, 3)
+        self.assertEqual(
+            sorted(BackgroundJob.objects.values_list('status', flat=True)),
+            [Status.COMPLETED, Status.COMPLETED, Status.FAILED],
+        )
+
+
+class CancelTests(JobTestCase):
+    def test_pending_job_is_cancelled_at_once(self):
+        job = cancel(enqueue('test_ok'))
+
+        self.assertEqual(job.status, Status.CANCELLED)
+        self.assertIsNotNone(job.completed_at)
+        self.assertIsNone(claim('w1'))
+
+    def test_running_job_stops_at_its_next_progress_update(self):
+        enqueue('test_cancel')
+        job = run(claim('w1'))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Status.CANCELLED)
+        self.assertEqual(job.processed, 4)
+        self.assertEqual(job.result, {})
+
+    def test_cancel_only_flags_a_running_job(self):
+        enqueue('test_ok')
+
+        job = cancel(claim('w1'))
+        self.assertEqual(job.status, Status.PROCESSING)
+        self.assertTrue(job.cancel_requested)
+
+    def test_progress_update_raises_once_cancelled(self):
+        progress = JobProgress(enqueue('test_ok'))
+        progress.update(processed=1)
+        progress.cancelled = True
+        with self.assertRaises(JobCancelled):
+            progress.update(processed=2)
+        self.assertEqual(progress.fields, {'processed': 2})
+
+
+class StaleJobTests(JobTestCase):
+    def make_stale(self, attempts):
+        job = enqueue('test_ok')
+        BackgroundJob.objects.filter(pk=job.pk).update(
+            status=Status.PROCESSING, worker='gone', attempts=attempts,
+            heartbeat_at=timezone.now() - Worker.stale_after - timedelta(minutes=1),
+        )
+        return job
+
+    def test_stale_jobs_are_requeued_until_max_attempts(self):
+        retry = self.make_stale(attempts=1)
+        give_up = self.make_stale(attempts=Worker.max_attempts)
+        enqueue('test_ok')
+        alive = claim('w1')
+
+        self.assertEqual(Worker(name='w1').requeue_stale(), 1)
+
+        retry.refresh_from_db()
+        give_up.refresh_from_db()
+        self.assertEqual((retry.status, retry.worker), (Status.PENDING, ''))
+        self.assertEqual(give_up.status, Status.FAILED)
+        self.assertIn('stopped responding', give_up.error_log)
+        alive.refresh_from_db()
+        self.assertEqual(alive.status, Status.PROCESSING)
+
+
+class PurgeTests(JobTestCase):
+    def test_deletes_old_finished_jobs_and_their_files(self):
+        old = enqueue('test_input', file=SimpleUploadedFile('old.csv', b'x'))
+        recent = enqueue('test_ok', echo='recent')
+        run(claim('w1'))
+        pending = enqueue('test_ok')
+        BackgroundJob.objects.filter(pk=old.pk).update(completed_at=timezone.now() - timedelta(days=40))
+        storage, name = old.input_file.storage, old.input_file.name
+        self.assertTrue(storage.exists(name))
+
+        self.assertEqual(purge(timedelta(days=30)), 1)
+
+        self.assertFalse(storage.exists(name))
+        self.assertEqual(
+            set(BackgroundJob.objects.values_list('pk', flat=True)), {recent.pk, pending.pk}
+        )
+
+
+class CustomerExportJobTests(JobTestCase):
+    @override_settings(BACKGROUND_JOBS_EAGER=True)
+    def test_export_writes_only_the_filtered_rows_for_download(self):
+        client, other = make_client(), make_client()
+        make_customer(client, first_name='Mine')
+        make_customer(client, first_name='Also')
+        make_customer(other, first_name='Theirs')
+
+        job = enqueue(
+            'customer_export', self.user, columns='list', filters={'client_id': client.pk}, filename='customers.csv',
+        )
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Status.COMPLETED, job.error_log)
+        self.assertEqual(job.result['rows'], 2)
+        self.assertEqual((job.total_records, job.processed), (2, 2))
+
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('data_pro:job-download', kwargs={'pk': job.pk}))
+        content = b''.join(response.streaming_content).decode()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Mine', content)
+        self.assertNotIn('Theirs', content)
+
+        outsider = get_user_model().objects.create_user('outsider')
+        self.client.force_login(outsider)
+        self.assertEqual(self.client.get(reverse('data_pro:job-status', kwargs={'pk': job.pk})).status_code, 404)
@@ -0,0 +1,138 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from data_pro.models.clients import Client
+from data_pro.models.outbox import OutboundEmail
+from data_pro.tests.factories import make_client
+from data_pro.utils.notifications import BatchedNotifier, queue_email, queue_emails
+
+Status = OutboundEmail.Status
+
+
+def outbox_row(next_attempt_at=None, **fields):
+    email = OutboundEmail.objects.create(
+        subject='Subject', body='Body', from_email='from@example.com', recipients=['to@example.com'], **fields
+    )
+    if next_attempt_at is not None:
+        # auto_now_add ignores the value passed to create()
+        OutboundEmail.objects.filter(pk=email.pk).update(next_attempt_at=next_attempt_at)
+        email.next_attempt_at = next_attempt_at
+    return email
+
+
+class QueueEmailTests(TestCase):
+    def test_queues_a_pending_row(self):
+        email = queue_email('Hello', 'Body', ['a@example.com', ''])
+
+        self.assertEqual(email.status, Status.PENDING)
+        self.assertEqual(email.recipients, ['a@example.com'])
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_skips_messages_without_recipients(self):
+        self.assertIsNone(queue_email('Hello', 'Body', [None, '']))
+        self.assertEqual(len(queue_emails([('Hello', 'Body', ['']), ('Hi', 'Body', ['b@example.com'])])), 1)
+
+    def test_rolled_back_transaction_queues_nothing(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                queue_email('Hello', 'Body', ['a@example.com'])
+                raise RuntimeError
+
+        self.assertFalse(OutboundEmail.objects.exists())
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class BatchedNotifierTests(TestCase):
+    def test_claims_due_rows_in_order_and_pushes_them_back(self):
+        now = timezone.now()
+        later = outbox_row(next_attempt_at=now - timedelta(minutes=1))
+        first = outbox_row(next_attempt_at=now - timedelta(minutes=5))
+        outbox_row(next_attempt_at=now + timedelta(hours=1))
+        outbox_row(status=Status.SENT, next_attempt_at=now - timedelta(hours=1))
+
+        claimed = BatchedNotifier().claim()
+
+        self.assertEqual([email.pk for email in claimed], [first.pk, later.pk])
+        # A second worker claiming now gets nothing
+        self.assertEqual(BatchedNotifier().claim(), [])
+
+    def test_claims_at_most_one_batch(self):
+        for _ in range(3):
+            outbox_row(next_attempt_at=timezone.now())
+
+        self.assertEqual(len(BatchedNotifier(batch_size=2).claim()), 2)
+
+    def test_sends_and_marks_rows_sent(self):
+        email = outbox_row(next_attempt_at=timezone.now())
+
+        self.assertEqual(BatchedNotifier().drain(), (1, 0))
+
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts, email.last_error), (Status.SENT, 1, ''))
+        self.assertIsNotNone(email.sent_at)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['to@example.com'])
+
+    def test_failed_send_is_retried_with_exponential_backoff(self):
+        email = outbox_row(next_attempt_at=timezone.now())
+        notifier = BatchedNotifier()
+
+        with mock.patch('data_pro.utils.notifications.EmailMessage.send', side_effect=OSError('refused')), \
+                self.assertLogs('data_pro.utils.notifications', 'WARNING'):
+            self.assertEqual(notifier.send(notifier.claim()), (0, 1))
+            email.refresh_from_db()
+            self.assertEqual((email.status, email.attempts, email.last_error), (Status.PENDING, 1, 'refused'))
+            first_delay = email.next_attempt_at - timezone.now()
+
+            OutboundEmail.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+            notifier.send(notifier.claim())
+            email.refresh_from_db()
+            second_delay = email.next_attempt_at - timezone.now()
+
+        self.assertAlmostEqual(first_delay.total_seconds(), notifier.retry_backoff.total_seconds(), delta=5)
+        self.assertAlmostEqual(second_delay.total_seconds(), 2 * notifier.retry_backoff.total_seconds(), delta=5)
+
+    def test_gives_up_after_max_attempts(self):
+        email = outbox_row(next_attempt_at=timezone.now(), attempts=2)
+
+        with mock.patch('data_pro.utils.notifications.EmailMessage.send', side_effect=OSError('refused')), \
+                self.assertLogs('data_pro.utils.notifications', 'WARNING'):
+            BatchedNotifier(max_attempts=3).drain()
+
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), (Status.FAILED, 3))
+        self.assertEqual(BatchedNotifier().claim(), [])
+
+    def test_connection_failure_fails_the_whole_batch(self):
+        emails = [outbox_row(next_attempt_at=timezone.now()) for _ in range(2)]
+
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.open', side_effect=OSError('down')), \
+                self.assertLogs('data_pro.utils.notifications', 'WARNING'):
+            self.assertEqual(BatchedNotifier().drain(), (0, 2))
+
+        for email in emails:
+            email.refresh_from_db()
+            self.assertEqual((email.status, email.attempts, email.last_error), (Status.PENDING, 1, 'down'))
+
+
+class EmailReceiverTests(TestCase):
+    def test_new_user_gets_a_queued_welcome_email(self):
+        get_user_model().objects.create_user('newcomer', 'Newcomer@Example.com')
+
+        self.assertEqual(
+            list(OutboundEmail.objects.values_list('subject', 'recipients')),
+            [('Welcome to DataPro', ['newcomer@example.com'])],
+        )
+
+    def test_client_can_be_deleted(self):
+        client = make_client()
+
+        client.delete()
+
+        self.assertFalse(Client.objects.filter(pk=client.pk).exists())
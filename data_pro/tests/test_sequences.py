@@ -0,0 +1,155 @@
+from datetime import date
+from io import StringIO
+from unittest import skipIf
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+
+from data_pro.models.invoices import Invoice
+from data_pro.models.sequences import Sequence
+from data_pro.system import sequences
+from data_pro.tests.factories import make_client, make_customer
+
+
+def stored_invoices(customer, *numbers):
+    """Invoices written with bulk_create, which skips the numbering pre_save signal"""
+    today = date.today()
+    return Invoice.objects.bulk_create([
+        Invoice(
+            invoice_number=number, client_id=customer.client_id, customer=customer,
+            issue_date=today, due_date=today, amount=0, total_amount=0,
+        )
+        for number in numbers
+    ])
+
+
+class AllocateTests(TestCase):
+    def setUp(self):
+        self.client_a = make_client()
+        self.client_b = make_client()
+
+    def test_counter_is_created_on_first_use(self):
+        first = sequences.next_number(self.client_a, 'invoice')
+        second = sequences.next_number(self.client_a.pk, 'invoice')
+
+        self.assertEqual(first, f'INV-{self.client_a.pk}-000001')
+        self.assertEqual(second, f'INV-{self.client_a.pk}-000002')
+        self.assertEqual(Sequence.objects.get(client=self.client_a, name='invoice').last_value, 2)
+
+    def test_counters_are_per_client_and_name(self):
+        sequences.next_number(self.client_a, 'invoice')
+        sequences.next_number(self.client_a, 'invoice')
+
+        self.assertEqual(sequences.next_number(self.client_b, 'invoice'), f'INV-{self.client_b.pk}-000001')
+        self.assertEqual(sequences.next_number(self.client_a, 'transport_reference'), f'TS-{self.client_a.pk}-000001')
+
+    def test_block_holds_consecutive_numbers(self):
+        sequences.next_number(self.client_a, 'tracking_code')
+        block = sequences.allocate(self.client_a, 'tracking_code', 3)
+
+        self.assertEqual((block.first, block.last, len(block)), (2, 4, 3))
+        self.assertEqual(list(block), [f'TRK{self.client_a.pk:03d}{value:07d}' for value in (2, 3, 4)])
+
+    def test_client_format_overrides_the_default(self):
+        Sequence.objects.create(client=self.client_a, name='invoice', format='A-{number:03d}', last_value=41)
+
+        self.assertEqual(sequences.next_number(self.client_a, 'invoice'), 'A-042')
+        self.assertEqual(sequences.next_number(self.client_b, 'invoice'), f'INV-{self.client_b.pk}-000001')
+
+    def test_rollback_hands_the_values_back(self):
+        sequences.next_number(self.client_a, 'invoice')
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                sequences.allocate(self.client_a, 'invoice', 5)
+                raise RuntimeError
+
+        self.assertEqual(sequences.next_number(self.client_a, 'invoice'), f'INV-{self.client_a.pk}-000002')
+
+    def test_assign_fills_empty_fields_with_one_block_per_client(self):
+        customer_a, customer_b = make_customer(self.client_a), make_customer(self.client_b)
+        today = date.today()
+        invoices = [
+            Invoice(client_id=customer.client_id, customer=customer, invoice_number=number,
+                    issue_date=today, due_date=today, amount=0, total_amount=0)
+            for customer, number in [(customer_a, ''), (customer_b, ''), (customer_a, 'KEEP-1'), (customer_a, '')]
+        ]
+
+        sequences.assign(invoices, 'invoice_number', 'invoice')
+
+        self.assertEqual([invoice.invoice_number for invoice in invoices], [
+            f'INV-{self.client_a.pk}-000001', f'INV-{self.client_b.pk}-000001',
+            'KEEP-1', f'INV-{self.client_a.pk}-000002',
+        ])
+        self.assertEqual(Sequence.objects.get(client=self.client_a, name='invoice').last_value, 2)
+
+    def test_saved_invoice_is_numbered_from_the_sequence(self):
+        today = date.today()
+        invoice = Invoice.objects.create(
+            client=self.client_a, customer=make_customer(self.client_a),
+            issue_date=today, due_date=today, amount=10, total_amount=10,
+        )
+
+        self.assertEqual(invoice.invoice_number, f'INV-{self.client_a.pk}-000001')
+
+
+class SeedTests(TestCase):
+    def setUp(self):
+        self.client_a = make_client()
+        self.customer = make_customer(self.client_a)
+
+    def test_pattern_matches_only_the_client_numbers(self):
+        pattern = sequences._pattern('TRK{client:03d}{number:07d}', 7)
+
+        self.assertEqual(pattern.fullmatch('TRK0070000042')['number'], '0000042')
+        self.assertIsNone(pattern.fullmatch('TRK0080000042'))
+        self.assertEqual(sequences._pattern('{year}/{number}', 1).fullmatch('2026/15')['number'], '15')
+
+    def test_creates_counters_from_the_highest_stored_number(self):
+        client_id = self.client_a.pk
+        stored_invoices(self.customer, f'INV-{client_id}-000007', f'INV-{client_id}-000012', 'LEGACY-999', 'INV-x-000050')
+
+        sequences.seed()
+
+        self.assertEqual(Sequence.objects.get(client=self.client_a, name='invoice').last_value, 12)
+        self.assertEqual(sequences.next_number(self.client_a, 'invoice'), f'INV-{client_id}-000013')
+        self.assertFalse(Sequence.objects.filter(name='tracking_code').exists())
+
+    def test_raises_but_never_lowers_counters(self):
+        Sequence.objects.create(client=self.client_a, name='invoice', format='A-{number:03d}', last_value=3)
+        other = make_client()
+        Sequence.objects.create(client=other, name='invoice', last_value=500)
+        stored_invoices(self.customer, 'A-010', f'INV-{self.client_a.pk}-000900')
+        stored_invoices(make_customer(other), f'INV-{other.pk}-000020')
+
+        sequences.seed()
+
+        # Only numbers in the client's own format count
+        self.assertEqual(Sequence.objects.get(client=self.client_a, name='invoice').last_value, 10)
+        self.assertEqual(Sequence.objects.get(client=other, name='invoice').last_value, 500)
+
+
+class CommittedSequenceTests(TransactionTestCase):
+    def check_sequences(self, **options):
+        output = StringIO()
+        call_command('check_sequences', stdout=output, stderr=output, **options)
+        return output.getvalue()
+
+    def test_lock_needs_a_transaction(self):
+        client = make_client()
+        with self.assertRaises(transaction.TransactionManagementError):
+            sequences.lock(client, 'invoice')
+
+        with transaction.atomic():
+            sequence = sequences.lock(client, 'invoice')
+        self.assertEqual(sequence.last_value, 0)
+
+    def test_rolled_back_writes_leave_no_gaps(self):
+        # Writes under a scratch client, as the database has none
+        self.assertIn('No collisions and no gaps', self.check_sequences(writers=1, rounds=8, block=3))
+        self.assertFalse(Invoice.objects.exists())
+        self.assertFalse(Sequence.objects.exists())
+
+    @skipIf(connection.vendor == 'sqlite', "SQLite's in-memory test database fails concurrent writers at once")
+    def test_parallel_writers_leave_no_collisions_or_gaps(self):
+        self.assertIn('No collisions and no gaps', self.check_sequences(writers=8, rounds=6, block=5))
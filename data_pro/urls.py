@@ -8,6 +8,7 @@ from data_pro.views.passports import *
 from data_pro.views.transports import *
 from data_pro.views.vehicles import *
 from data_pro.views.visas import *
+from data_pro.views.jobs import *
 from data_pro.system.views import *
 
 
@@ -89,6 +90,10 @@ urlpatterns = [
     path('passports/<int:pk>/update/', PassportUpdateView.as_view(), name='passport-update'),
     path('passports/<int:pk>/delete/', PassportDeleteView.as_view(), name='passport-delete'),
     path('passports/<int:pk>/status/', PassportStatusView.as_view(), name='passport-status'),
-    
+
+    # Background Jobs
+    path('jobs/<int:pk>/', JobStatusView.as_view(), name='job-status'),
+    path('jobs/<int:pk>/cancel/', JobCancelView.as_view(), name='job-cancel'),
+    path('jobs/<int:pk>/download/', JobDownloadView.as_view(), name='job-download'),
 
 ]
\ No newline at end of file
@@ -0,0 +1,124 @@
+import csv
+import zlib
+
+from django.http import StreamingHttpResponse
+
+
+class _Echo:
+    """File-like object that hands back whatever csv.writer writes to it"""
+    def write(self, value):
+        return value
+
+
+def choice_display(choices):
+    """Build a formatter that renders a choice value as its display label"""
+    labels = {key: str(label) for key, label in choices}
+    return lambda value: labels.get(value, value)
+
+
+def datetime_format(fmt):
+    """Build a formatter that renders a date/datetime with strftime"""
+    return lambda value: value.strftime(fmt) if value else ''
+
+
+class StreamingCSVExporter:
+    """
+    Streams a queryset out as CSV without materialising model instances.
+
+    ``columns`` is a list of ``(header, lookup)`` or ``(header, lookup, formatter)``
+    tuples. ``lookup`` is a ``values_list`` lookup (joins such as ``client__name``
+    are resolved in SQL) or a tuple of lookups whose values are passed
+    positionally to ``formatter``.
+    """
+    chunk_size = 2000
+
+    def __init__(self, queryset, columns, chunk_size=None):
+        self.queryset = queryset
+        self.columns = columns
+        if chunk_size:
+            self.chunk_size = chunk_size
+
+    def _plan(self):
+        lookups = []
+        plan = []
+        for column in self.columns:
+            header, lookup = column[0], column[1]
+            formatter = column[2] if len(column) > 2 else None
+            names = lookup if isinstance(lookup, tuple) else (lookup,)
+            indexes = []
+            for name in names:
+                if name not in lookups:
+                    lookups.append(name)
+                indexes.append(lookups.index(name))
+            plan.append((indexes, formatter))
+        return lookups, plan
+
+    def rows(self):
+        """Yield each row as a list of cell values, header first"""
+        lookups, plan = self._plan()
+        yield [column[0] for column in self.columns]
+
+        values = self.queryset.values_list(*lookups).iterator(chunk_size=self.chunk_size)
+        for record in values:
+            row = []
+            for indexes, formatter in plan:
+                if formatter is None:
+                    row.append(record[indexes[0]])
+                else:
+                    row.append(formatter(*[record[i] for i in indexes]))
+            yield row
+
+    def chunks(self):
+        """Yield ``(data rows written so far, encoded CSV text)``, one chunk of ``chunk_size`` lines at a time"""
+        writer = csv.writer(_Echo())
+        buffer = []
+        # The header line is not a data row
+        written = -1
+        for row in self.rows():
+            buffer.append(writer.writerow(row))
+            written += 1
+            if len(buffer) >= self.chunk_size:
+                yield written, ''.join(buffer).encode('utf-8')
+                buffer = []
+        if buffer:
+            yield written, ''.join(buffer).encode('utf-8')
+
+    def lines(self):
+        """Yield encoded CSV text, one chunk of ``chunk_size`` rows at a time"""
+        for _written, chunk in self.chunks():
+            yield chunk
+
+    def gzip_lines(self):
+        compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+        for chunk in self.lines():
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
+    def write(self, file, compress=False, progress=None):
+        """
+        Write the CSV, gzip-compressed with ``compress``, to the binary
+        ``file``, calling ``progress(rows)`` after each chunk
+        """
+        compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if compress else None
+        for written, chunk in self.chunks():
+            file.write(compressor.compress(chunk) if compressor else chunk)
+            if progress is not None:
+                progress(written)
+        if compressor:
+            file.write(compressor.flush())
+
+    def response(self, filename, compress=False):
+        if compress:
+            response = StreamingHttpResponse(self.gzip_lines(), content_type='application/gzip')
+            filename = f'{filename}.gz'
+        else:
+            response = StreamingHttpResponse(self.lines(), content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+def wants_gzip(request):
+    """Whether the caller asked for a gzip-compressed export (?gzip=1)"""
+    return request.GET.get('gzip', '').lower() in ('1', 'true', 'yes')
@@ -0,0 +1,208 @@
+import codecs
+import csv
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from data_pro.models.clients import Client
+from data_pro.models.customers import Customer
+from data_pro.models.office import Office
+from data_pro.system import client_stats
+from data_pro.utils.notifications import queue_customer_welcome_emails
+
+# Header aliases accepted on top of the model field names
+COLUMN_ALIASES = {
+    'client': 'client_id',
+    'office': 'office_id',
+    'type': 'customer_type',
+}
+
+IMPORTABLE_FIELDS = (
+    'customer_type', 'first_name', 'last_name', 'organization_name',
+    'email', 'phone', 'nationality', 'status', 'office_id',
+)
+
+
+class CustomerImportResult:
+    """Outcome of a customer import, including a per-row error report"""
+    max_reported_errors = 1000
+
+    def __init__(self):
+        self.created = 0
+        self.updated = 0
+        self.error_count = 0
+        self.errors = []
+
+    def add_error(self, row_number, errors):
+        self.error_count += 1
+        if len(self.errors) < self.max_reported_errors:
+            self.errors.append({'row': row_number, 'errors': errors})
+
+    def as_dict(self):
+        return {
+            'created': self.created,
+            'updated': self.updated,
+            'failed': self.error_count,
+            'errors': self.errors,
+        }
+
+
+class CustomerCSVImporter:
+    """
+    Set-based customer CSV import.
+
+    The upload is decoded and parsed lazily, ``batch_size`` rows at a time.
+    Each batch resolves its client and office ids with one query per model,
+    matches existing customers on ``(client, email)`` with one query, and is
+    written with a single ``bulk_create(update_conflicts=True)``. The whole
+    import runs in one transaction, which also queues the welcome emails for
+    new customers in the outbox.
+
+    When ``client`` is given every row is assigned to it; otherwise each row
+    must carry a ``client_id`` column. ``progress``, if given, is called
+    after every batch with ``processed``, ``successful`` and ``failed``
+    keyword arguments.
+    """
+    batch_size = 1000
+
+    def __init__(self, client=None, batch_size=None, send_welcome_email=True, progress=None):
+        self.client = client
+        self.progress = progress
+        if batch_size:
+            self.batch_size = batch_size
+        self.send_welcome_email = send_welcome_email
+        self._clients = {client.pk: client} if client else {}
+        self._offices = {}
+
+    def read(self, file):
+        """Yield ``(row_number, row)`` pairs with normalised column names"""
+        reader = csv.reader(codecs.iterdecode(file, 'utf-8-sig'))
+        header = next(reader, None)
+        if not header:
+            return
+        columns = []
+        for name in header:
+            name = name.strip().lower().replace(' ', '_')
+            columns.append(COLUMN_ALIASES.get(name, name))
+        for row in reader:
+            if any(row):
+                yield reader.line_num, dict(zip(columns, (value.strip() for value in row)))
+
+    def import_file(self, file):
+        result = CustomerImportResult()
+        rows = self.read(file)
+        update_fields = None
+        processed = 0
+
+        with transaction.atomic():
+            while True:
+                batch = list(islice(rows, self.batch_size))
+                if not batch:
+                    break
+                if update_fields is None:
+                    update_fields = self._update_fields(batch[0][1])
+                created = self._import_batch(batch, update_fields, result)
+                if self.send_welcome_email:
+                    queue_customer_welcome_emails(created)
+                processed += len(batch)
+                if self.progress:
+                    self.progress(
+                        processed=processed,
+                        successful=result.created + result.updated,
+                        failed=result.error_count,
+                    )
+
+            # bulk_create bypasses the ClientStats signals
+            if result.created or result.updated:
+                client_stats.rebuild([pk for pk, client in self._clients.items() if client])
+
+        return result
+
+    def _update_fields(self, row):
+        fields = [field.replace('_id', '') for field in IMPORTABLE_FIELDS if field in row]
+        if 'name' in row and 'first_name' not in row:
+            fields += ['first_name', 'last_name']
+        return fields + ['updated_at']
+
+    def _resolve(self, cache, model, ids):
+        missing = {pk for pk in ids if pk not in cache}
+        if missing:
+            found = model.objects.in_bulk(missing)
+            for pk in missing:
+                cache[pk] = found.get(pk)
+
+    def _int(self, value):
+        try:
+            return int(value) if value else None
+        except ValueError:
+            return None
+
+    def _build(self, row):
+        errors = {}
+        values = {field: row[field] or None for field in IMPORTABLE_FIELDS if field in row}
+        if 'name' in row and 'first_name' not in row:
+            first, _, last = row['name'].partition(' ')
+            values['first_name'], values['last_name'] = first or None, last or None
+        values['customer_type'] = values.get('customer_type') or 'individual'
+        values['status'] = values.get('status') or 'active'
+        values['phone'] = values.get('phone') or ''
+
+        client = self.client
+        if client is None:
+            client = self._clients.get(self._int(row.get('client_id')))
+            if client is None:
+                errors['client_id'] = ['Unknown client %r' % row.get('client_id')]
+
+        office = None
+        if values.get('office_id'):
+            office = self._offices.get(self._int(values['office_id']))
+            if office is None:
+                errors['office_id'] = ['Unknown office %r' % values['office_id']]
+        values.pop('office_id', None)
+
+        customer = Customer(client=client, office=office, **values)
+        try:
+            customer.clean_fields(exclude=['client', 'office'])
+            customer.clean()
+        except ValidationError as e:
+            for field, messages in e.message_dict.items():
+                errors.setdefault(field, []).extend(messages)
+        return customer, errors
+
+    def _import_batch(self, batch, update_fields, result):
+        if self.client is None:
+            self._resolve(self._clients, Client, {self._int(row.get('client_id')) for _, row in batch} - {None})
+        self._resolve(self._offices, Office, {self._int(row.get('office_id')) for _, row in batch} - {None})
+
+        # Later rows for the same (client, email) win, like successive update_or_create calls
+        customers = {}
+        for row_number, row in batch:
+            customer, errors = self._build(row)
+            if errors:
+                result.add_error(row_number, errors)
+                continue
+            key = (customer.client_id, customer.email) if customer.email else row_number
+            customers[key] = customer
+
+        emails = {customer.email for customer in customers.values() if customer.email}
+        if emails:
+            existing = Customer.objects.filter(
+                client_id__in={customer.client_id for customer in customers.values()},
+                email__in=emails,
+            ).order_by().values_list('client_id', 'email', 'id')
+            for client_id, email, pk in existing:
+                if (client_id, email) in customers:
+                    customers[(client_id, email)].pk = pk
+
+        created = [customer for customer in customers.values() if customer.pk is None]
+        result.created += len(created)
+        result.updated += len(customers) - len(created)
+        Customer.objects.bulk_create(
+            list(customers.values()),
+            batch_size=self.batch_size,
+            update_conflicts=True,
+            unique_fields=['id'],
+            update_fields=update_fields,
+        )
+        return created
@@ -1,54 +1,137 @@
+import csv
+import datetime
+import tempfile
+
 import pandas as pd
-from django.db import transaction
+from django.db import models, transaction
+from django.http import FileResponse
+from django.utils import timezone
+from decimal import Decimal
+from functools import lru_cache
 from io import BytesIO
-from datetime import datetime
+
+from data_pro.system import client_stats
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Parquet export is optional
+    pyarrow = None
+
+
+class ModelFields:
+    """Field introspection an importer needs, computed once per model class"""
+    def __init__(self, model_class):
+        fields = [f for f in model_class._meta.get_fields() if f.concrete and not f.auto_created]
+        self.names = {f.name for f in fields} | {f.attname for f in fields}
+        self.date_fields = [f.name for f in fields if f.get_internal_type() == 'DateField']
+        self.decimal_fields = [f.name for f in fields if isinstance(f, models.DecimalField)]
+        self.fk_fields = [f for f in fields if f.is_relation and f.many_to_one]
+        self.has_created_by = 'created_by' in self.names
+        self.has_updated_by = 'updated_by' in self.names
+
+
+@lru_cache(maxsize=None)
+def model_fields(model_class):
+    return ModelFields(model_class)
+
+
+def _to_decimal(value):
+    return Decimal(str(value)) if value is not None else None
+
+
+def prepare_visa_frame(df):
+    """Column-wise equivalent of Visa.save(), which bulk_create does not call"""
+    today = timezone.now().date()
+    service_fee = df['service_fee'] if 'service_fee' in df else pd.Series(Decimal('0'), index=df.index)
+    df['service_fee'] = service_fee.map(lambda fee: fee if fee is not None else Decimal('0'))
+    df['total_cost'] = df['unit_cost'] + df['service_fee']
+
+    status = df['status'] if 'status' in df else pd.Series('processing', index=df.index)
+    status = status.where(status.notna(), 'processing')
+    if 'released_date' in df:
+        status = status.where(df['released_date'].isna(), 'released')
+    status = status.where(~df['expiry_date'].map(lambda d: d is not None and d < today), 'expired')
+    df['status'] = status
+    return df
+
+
+# Per-model hooks reproducing derived values that save() would normally set
+FRAME_PREPARERS = {
+    'data_pro.visa': prepare_visa_frame,
+}
+
 
 class ExcelImporter:
-    def __init__(self, model_class, user):
+    batch_size = 500
+
+    def __init__(self, model_class, user, batch_size=None):
         self.model_class = model_class
         self.user = user
-    
+        if batch_size:
+            self.batch_size = batch_size
+        self.fields = model_fields(model_class)
+
     @transaction.atomic
-    def import_from_excel(self, file):
-        df = pd.read_excel(file)
+    def import_from_excel(self, file, progress=None):
+        """
+        Import every row of the sheet; ``progress``, if given, is called
+        after each batch with ``total_records`` and ``processed``.
+        """
+        df = self.prepare_frame(pd.read_excel(file))
+
         created_objects = []
-        
-        for _, row in df.iterrows():
-            data = self.prepare_data(row.to_dict())
-            obj = self.model_class(**data)
+        for start in range(0, len(df), self.batch_size):
+            batch = [
+                self.build(row)
+                for row in df.iloc[start:start + self.batch_size].to_dict('records')
+            ]
+            created_objects.extend(self.model_class.objects.bulk_create(batch))
+            if progress:
+                progress(total_records=len(df), processed=len(created_objects))
+
+        # bulk_create bypasses the ClientStats signals
+        client_stats.rebuild_for(self.model_class, [obj.pk for obj in created_objects])
+        return created_objects
+
+    def build(self, row_data):
+        obj = self.model_class(**row_data)
+        if self.fields.has_created_by:
             obj.created_by = self.user
+        if self.fields.has_updated_by:
             obj.updated_by = self.user
-            obj.save()
-            created_objects.append(obj)
-        
-        return created_objects
-    
-    def prepare_data(self, row_data):
-        # Convert date strings to date objects
-        date_fields = [f.name for f in self.model_class._meta.get_fields() 
-                      if f.get_internal_type() == 'DateField']
-        
-        for field in date_fields:
-            if field in row_data and pd.notna(row_data[field]):
-                if isinstance(row_data[field], str):
-                    row_data[field] = datetime.strptime(row_data[field], '%Y-%m-%d').date()
-                elif pd.is_datetime64_any_dtype(row_data[field]):
-                    row_data[field] = row_data[field].to_pydatetime().date()
-        
-        # Handle foreign keys
-        fk_fields = [f for f in self.model_class._meta.get_fields() 
-                    if f.is_relation and f.many_to_one and not f.auto_created]
-        
-        for field in fk_fields:
-            if field.name in row_data and pd.notna(row_data[field.name]):
-                related_model = field.related_model
-                if isinstance(row_data[field.name], (int, str)):
-                    try:
-                        row_data[field.name] = related_model.objects.get(pk=row_data[field.name])
-                    except related_model.DoesNotExist:
-                        row_data[field.name] = None
-        
-        return row_data
+        return obj
+
+    def prepare_frame(self, df):
+        """Coerce a whole sheet to model-ready Python values, column by column"""
+        df = df[[column for column in df.columns if column in self.fields.names]]
+        df = df.astype(object).where(df.notna(), None)
+
+        # Convert date strings and timestamps to date objects
+        for field in self.fields.date_fields:
+            if field in df:
+                dates = pd.to_datetime(df[field], format='mixed')
+                df[field] = dates.dt.date.where(dates.notna(), None)
+
+        for field in self.fields.decimal_fields:
+            if field in df:
+                df[field] = df[field].map(_to_decimal)
+
+        # Handle foreign keys with one in_bulk() per related model
+        for field in self.fields.fk_fields:
+            column = field.name if field.name in df else field.attname if field.attname in df else None
+            if column is None:
+                continue
+            target = field.target_field
+            keys = df[column].map(lambda value: target.to_python(value) if value is not None else None)
+            related = field.related_model.objects.in_bulk(set(keys.dropna()))
+            df = df.drop(columns=[column])
+            df[field.name] = keys.map(related.get)
+
+        preparer = FRAME_PREPARERS.get(self.model_class._meta.label_lower)
+        if preparer:
+            df = preparer(df)
+        return df
 
 class ExcelExporter:
     @staticmethod
@@ -73,4 +156,129 @@ class ExcelExporter:
         output = BytesIO()
         df.to_excel(output, index=False)
         output.seek(0)
-        return output
\ No newline at end of file
+        return output
+
+    CONTENT_TYPES = {
+        'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        'csv': 'text/csv',
+        'parquet': 'application/vnd.apache.parquet',
+    }
+
+    @staticmethod
+    def default_fields(model):
+        return [f.attname for f in model._meta.get_fields()
+                if f.concrete and not f.many_to_many]
+
+    @classmethod
+    def export_to_path(cls, queryset, path, fields=None, file_format='xlsx', chunk_size=2000):
+        """
+        Columnar export: rows are pulled with values_list().iterator() and
+        written incrementally to ``path``, so memory stays flat whatever
+        the row count.
+        """
+        if file_format not in cls.CONTENT_TYPES:
+            raise ValueError(f'Unsupported export format: {file_format}')
+        if file_format == 'parquet' and pyarrow is None:
+            raise ValueError('Parquet export requires pyarrow')
+
+        fields = fields or cls.default_fields(queryset.model)
+        rows = queryset.values_list(*fields).iterator(chunk_size=chunk_size)
+        writer = getattr(cls, f'_write_{file_format}')
+        writer(str(path), queryset.model, fields, rows, chunk_size)
+
+    @classmethod
+    def export_to_file(cls, queryset, fields=None, file_format='xlsx', chunk_size=2000):
+        """
+        export_to_path() into an open temporary file, deleted once closed,
+        positioned at 0.
+        """
+        output = tempfile.NamedTemporaryFile(suffix=f'.{file_format}')
+        cls.export_to_path(queryset, output.name, fields, file_format, chunk_size)
+        output.seek(0)
+        return output
+
+    @classmethod
+    def file_response(cls, queryset, filename, fields=None, file_format='xlsx', chunk_size=2000):
+        output = cls.export_to_file(queryset, fields, file_format, chunk_size)
+        return FileResponse(
+            output,
+            as_attachment=True,
+            filename=f'{filename}.{file_format}',
+            content_type=cls.CONTENT_TYPES[file_format],
+        )
+
+    @staticmethod
+    def _write_xlsx(path, model, fields, rows, chunk_size):
+        import xlsxwriter
+
+        workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+        worksheet = workbook.add_worksheet(model._meta.verbose_name_plural.title()[:31])
+        header = workbook.add_format({'bold': True})
+        date_format = workbook.add_format({'num_format': 'yyyy-mm-dd'})
+        datetime_format = workbook.add_format({'num_format': 'yyyy-mm-dd hh:mm:ss'})
+
+        worksheet.write_row(0, 0, fields, header)
+        for row_number, row in enumerate(rows, start=1):
+            for column, value in enumerate(row):
+                if isinstance(value, datetime.datetime):
+                    if timezone.is_aware(value):
+                        value = timezone.make_naive(value, datetime.timezone.utc)
+                    worksheet.write_datetime(row_number, column, value, datetime_format)
+                elif isinstance(value, datetime.date):
+                    worksheet.write_datetime(row_number, column, value, date_format)
+                elif value is not None:
+                    worksheet.write(row_number, column, value)
+        workbook.close()
+
+    @staticmethod
+    def _write_csv(path, model, fields, rows, chunk_size):
+        with open(path, 'w', newline='', encoding='utf-8') as output:
+            writer = csv.writer(output)
+            writer.writerow(fields)
+            writer.writerows(rows)
+
+    @staticmethod
+    def _write_parquet(path, model, fields, rows, chunk_size):
+        schema = pyarrow.schema([
+            (field, _arrow_type(_lookup_field(model, field))) for field in fields
+        ])
+        with pyarrow.parquet.ParquetWriter(path, schema) as writer:
+            while True:
+                chunk = [row for _, row in zip(range(chunk_size), rows)]
+                if not chunk:
+                    break
+                columns = list(zip(*chunk))
+                writer.write_batch(pyarrow.record_batch(
+                    [pyarrow.array(column, type=schema.field(i).type) for i, column in enumerate(columns)],
+                    schema=schema,
+                ))
+
+
+def _lookup_field(model, lookup):
+    """Resolve a values() lookup such as ``customer__first_name`` to its model field"""
+    *relations, name = lookup.split('__')
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+    field = model._meta.get_field(name)
+    if field.is_relation:
+        field = field.target_field
+    return field
+
+
+def _arrow_type(field):
+    internal_type = field.get_internal_type()
+    if isinstance(field, models.DecimalField):
+        return pyarrow.decimal128(field.max_digits, field.decimal_places)
+    if internal_type in ('AutoField', 'BigAutoField', 'SmallAutoField', 'IntegerField',
+                         'BigIntegerField', 'SmallIntegerField', 'PositiveIntegerField',
+                         'PositiveSmallIntegerField', 'PositiveBigIntegerField'):
+        return pyarrow.int64()
+    if internal_type == 'FloatField':
+        return pyarrow.float64()
+    if internal_type == 'BooleanField':
+        return pyarrow.bool_()
+    if internal_type == 'DateField':
+        return pyarrow.date32()
+    if internal_type == 'DateTimeField':
+        return pyarrow.timestamp('us', tz='UTC')
+    return pyarrow.string()
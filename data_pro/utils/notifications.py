@@ -0,0 +1,192 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Count, Min, Q
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from data_pro.models.outbox import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+
+def _outbox_row(subject, message, recipient_list, from_email=None):
+    return OutboundEmail(
+        subject=subject[:255],
+        body=message,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipients=[recipient for recipient in recipient_list if recipient],
+    )
+
+
+def queue_email(subject, message, recipient_list, from_email=None):
+    """
+    Queue an email in the outbox instead of talking to SMTP inline.
+
+    The row is written in the caller's transaction, so mail for a rolled
+    back save is never sent; the send_queued_email worker delivers it once
+    the transaction has committed.
+    """
+    email = _outbox_row(subject, message, recipient_list, from_email)
+    if not email.recipients:
+        return None
+    email.save()
+    return email
+
+
+def queue_emails(messages, batch_size=500):
+    """Queue many ``(subject, message, recipient_list)`` tuples with bulk inserts"""
+    rows = [_outbox_row(*message) for message in messages]
+    return OutboundEmail.objects.bulk_create(
+        [row for row in rows if row.recipients], batch_size=batch_size
+    )
+
+
+class BatchedNotifier:
+    """
+    Sends outbox rows in batches over a single connection instead of
+    opening one SMTP session per message, recording success or failure
+    on each row.
+    """
+    batch_size = 100
+    max_attempts = 5
+    retry_backoff = timedelta(minutes=1)
+    max_retry_backoff = timedelta(hours=6)
+
+    def __init__(self, batch_size=None, max_attempts=None):
+        if batch_size:
+            self.batch_size = batch_size
+        if max_attempts:
+            self.max_attempts = max_attempts
+
+    def claim(self):
+        """Lock and return the next batch of due messages"""
+        with transaction.atomic():
+            emails = list(
+                OutboundEmail.objects.select_for_update(skip_locked=True)
+                .filter(status=OutboundEmail.Status.PENDING, next_attempt_at__lte=timezone.now())
+                .order_by('next_attempt_at', 'id')[:self.batch_size]
+            )
+            # Push claimed rows into the future so a concurrent worker skips them
+            OutboundEmail.objects.filter(pk__in=[email.pk for email in emails]).update(
+                next_attempt_at=timezone.now() + self.retry_backoff
+            )
+        return emails
+
+    def send(self, emails):
+        """Deliver claimed rows, returning ``(sent, failed)``"""
+        sent, failed = [], []
+        connection = get_connection()
+        try:
+            connection.open()
+            for email in emails:
+                message = EmailMessage(
+                    email.subject, email.body, email.from_email, email.recipients,
+                    connection=connection,
+                )
+                try:
+                    message.send()
+                except Exception as e:
+                    email.last_error = str(e)
+                    failed.append(email)
+                else:
+                    sent.append(email)
+        except Exception as e:
+            # Could not connect at all: every unsent message is retried
+            for email in emails:
+                if email not in sent and email not in failed:
+                    email.last_error = str(e)
+                    failed.append(email)
+        finally:
+            connection.close()
+
+        self._record(sent, failed)
+        return len(sent), len(failed)
+
+    def _record(self, sent, failed):
+        now = timezone.now()
+        for email in sent:
+            email.status = OutboundEmail.Status.SENT
+            email.sent_at = now
+            email.attempts += 1
+            email.last_error = ''
+        for email in failed:
+            email.attempts += 1
+            if email.attempts >= self.max_attempts:
+                email.status = OutboundEmail.Status.FAILED
+            backoff = min(self.retry_backoff * 2 ** (email.attempts - 1), self.max_retry_backoff)
+            email.next_attempt_at = now + backoff
+        OutboundEmail.objects.bulk_update(
+            sent + failed, ['status', 'sent_at', 'attempts', 'last_error', 'next_attempt_at']
+        )
+
+        for email in sent:
+            logger.info(
+                'Sent outbound email %s after %.3fs in queue',
+                email.pk, (email.sent_at - email.created_at).total_seconds()
+            )
+        for email in failed:
+            logger.warning(
+                'Outbound email %s failed (attempt %s): %s',
+                email.pk, email.attempts, email.last_error
+            )
+
+    def drain(self):
+        """Send due messages batch by batch until none are left"""
+        total_sent = total_failed = 0
+        while True:
+            emails = self.claim()
+            if not emails:
+                return total_sent, total_failed
+            sent, failed = self.send(emails)
+            total_sent += sent
+            total_failed += failed
+
+
+def outbox_stats(window=timedelta(hours=1)):
+    """Queue depth and send latency figures for monitoring"""
+    now = timezone.now()
+    counts = OutboundEmail.objects.aggregate(
+        pending=Count('id', filter=Q(status=OutboundEmail.Status.PENDING)),
+        failed=Count('id', filter=Q(status=OutboundEmail.Status.FAILED)),
+        oldest_pending=Min('created_at', filter=Q(status=OutboundEmail.Status.PENDING)),
+    )
+    latencies = sorted(
+        (sent_at - created_at).total_seconds()
+        for created_at, sent_at in OutboundEmail.objects.filter(
+            status=OutboundEmail.Status.SENT, sent_at__gte=now - window
+        ).values_list('created_at', 'sent_at').iterator()
+    )
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] if latencies else None
+
+    oldest = counts['oldest_pending']
+    return {
+        'pending': counts['pending'],
+        'failed': counts['failed'],
+        'oldest_pending_seconds': (now - oldest).total_seconds() if oldest else None,
+        'sent_last_window': len(latencies),
+        'latency_p50_seconds': percentile(0.5),
+        'latency_p95_seconds': percentile(0.95),
+    }
+
+
+def customer_welcome_email(customer):
+    """Subject and body of the welcome email sent to new customers"""
+    subject = 'Welcome to Our Service'
+    message = render_to_string('emails/customer_welcome.txt', {
+        'customer': customer,
+    })
+    return subject, message
+
+
+def queue_customer_welcome_emails(customers):
+    """Queue welcome emails for customers created outside of save(), e.g. by bulk_create"""
+    return queue_emails(
+        (*customer_welcome_email(customer), [customer.email])
+        for customer in customers if customer.email
+    )
@@ -0,0 +1,156 @@
+import base64
+import json
+from types import SimpleNamespace
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def keyset_ordering(model):
+    """The model's default ordering with ``id`` appended as a unique tie-breaker"""
+    ordering = [name for name in model._meta.ordering if isinstance(name, str) and name != '?']
+    if not any(name.lstrip('-') in ('id', 'pk') for name in ordering):
+        ordering.append('id')
+    return tuple(ordering)
+
+
+def estimated_count(queryset, cap=10000):
+    """
+    Cheap row count for cursor pages, returned as ``(count, exact)``.
+
+    PostgreSQL answers from the planner's row estimate; small results, and
+    other databases, are counted exactly up to ``cap`` rows.
+    """
+    queryset = queryset.order_by()
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimate = int(plan[0]['Plan']['Plan Rows'])
+        if estimate > cap:
+            return estimate, False
+    count = queryset[:cap + 1].count()
+    if count > cap:
+        return cap, False
+    return count, True
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for admin changelists of large tables. On PostgreSQL, big
+    results are counted from the planner's estimate (see estimated_count)
+    instead of a COUNT(*) over the whole table; other databases count
+    exactly.
+    """
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, 'query') or connections[queryset.db].vendor != 'postgresql':
+            return super().count
+        return estimated_count(queryset)[0]
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Cursor pagination that seeks past the last row seen instead of using
+    OFFSET, so any page costs the same as the first and no COUNT(*) runs.
+
+    ``ordering`` must end in a unique, non-null column (normally ``id``).
+    Cursors are opaque strings carrying the ordering values of the row
+    the page starts after, plus the direction of travel.
+    """
+    def __init__(self, queryset, ordering, per_page):
+        self.queryset = queryset
+        self.ordering = tuple(ordering)
+        self.per_page = int(per_page)
+        self.fields = []
+        for name in self.ordering:
+            field = queryset.model._meta.get_field(name.lstrip('-'))
+            if field.null:
+                raise ImproperlyConfigured(f'Cannot paginate on nullable column {field.name!r}')
+            self.fields.append(field)
+
+    def encode(self, obj, reverse):
+        if isinstance(obj, dict):
+            # values() rows
+            obj = SimpleNamespace(**obj)
+        # value_to_string keeps full precision (DjangoJSONEncoder drops microseconds)
+        values = [field.value_to_string(obj) for field in self.fields]
+        data = json.dumps({'v': values, 'r': reverse})
+        return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+    def decode(self, cursor):
+        try:
+            data = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+            values = [field.to_python(value) for field, value in zip(self.fields, data['v'], strict=True)]
+            return values, bool(data['r'])
+        except Exception as e:
+            raise InvalidCursor(cursor) from e
+
+    def _seek(self, values, reverse):
+        """Rows strictly after ``values`` in the ordering, or before it if ``reverse``"""
+        condition = Q()
+        for position, (name, field) in enumerate(zip(self.ordering, self.fields)):
+            lookup = 'gt' if name.startswith('-') == reverse else 'lt'
+            step = Q(**{f'{field.attname}__{lookup}': values[position]})
+            for earlier, value in zip(self.fields[:position], values[:position]):
+                step &= Q(**{earlier.attname: value})
+            condition |= step
+        return condition
+
+    def page(self, cursor=None):
+        values, reverse = self.decode(cursor) if cursor else (None, False)
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(name[1:] if name.startswith('-') else f'-{name}' for name in ordering)
+
+        queryset = self.queryset
+        if values is not None:
+            queryset = queryset.filter(self._seek(values, reverse))
+        rows = list(queryset.order_by(*ordering)[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if reverse:
+            rows.reverse()
+
+        # Arriving with a cursor means there is a page on the side we came from
+        has_next, has_previous = (values is not None, has_more) if reverse else (has_more, values is not None)
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = self.encode(rows[-1], reverse=False)
+        if rows and has_previous:
+            previous_cursor = self.encode(rows[0], reverse=True)
+        return KeysetPage(rows, next_cursor, previous_cursor)
@@ -0,0 +1,204 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Count, Max
+from django.http import FileResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from data_pro.utils.excel_handlers import ExcelExporter
+
+logger = logging.getLogger(__name__)
+
+
+def _digest(data):
+    return hashlib.sha256(json.dumps(data, default=str).encode()).hexdigest()[:20]
+
+
+class CachedReport:
+    """
+    Export files cached on disk under REPORT_CACHE_DIR/<name>.
+
+    A file is named by its identity (tenant, filters, format) and its
+    version: the newest of ``timestamps`` and the row count over the
+    filtered rows, taken in one aggregate query. Any insert, update or
+    delete gives a new version, so a stale file is never served. The
+    version doubles as the ETag and the newest timestamp as Last-Modified,
+    so repeat downloads get a 304 or the cached file.
+
+    Every identity served keeps a manifest; schedule_refresh() rebuilds the
+    ones downloaded in the last ``keep_days`` in a background thread after
+    the rows change, and drops the others.
+
+    ``client_id`` is a Client id, or None for all tenants. ``filter_queryset``
+    is called with the queryset and the cleaned filters.
+    """
+    keep_days = 7
+    refresh_delay = 2
+
+    def __init__(self, name, model, fields, tenant_path, filter_queryset=None,
+                 filter_keys=(), timestamps=('updated_at',)):
+        self.name = name
+        self.model = model
+        self.fields = list(fields)
+        self.tenant_path = tenant_path
+        self.filter_queryset = filter_queryset
+        self.filter_keys = tuple(filter_keys)
+        self.timestamps = tuple(timestamps)
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._worker = None
+
+    @property
+    def directory(self):
+        path = Path(getattr(settings, 'REPORT_CACHE_DIR', Path(settings.BASE_DIR) / 'cache' / 'reports')) / self.name
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def clean_filters(self, params):
+        """The ``filter_keys`` set in ``params`` (e.g. request.GET), as a plain dict"""
+        return {key: params[key] for key in self.filter_keys if params.get(key)}
+
+    def queryset(self, client_id, filters):
+        queryset = self.model.objects.all()
+        if client_id is not None:
+            queryset = queryset.filter(**{f'{self.tenant_path}_id': client_id})
+        if self.filter_queryset is not None:
+            queryset = self.filter_queryset(queryset, filters)
+        return queryset
+
+    def _identity(self, client_id, filters, file_format):
+        return _digest([self.name, client_id, sorted(filters.items()), self.fields, file_format])
+
+    def _version(self, queryset):
+        """(version, newest timestamp or None) of the rows behind ``queryset``"""
+        latest = {f'latest_{i}': Max(path) for i, path in enumerate(self.timestamps)}
+        stats = queryset.order_by().aggregate(rows=Count('pk'), **latest)
+        newest = max((stats[key] for key in latest if stats[key] is not None), default=None)
+        return _digest([stats[key] for key in sorted(stats)]), newest
+
+    def _locate(self, client_id, filters, file_format):
+        identity = self._identity(client_id, filters, file_format)
+        queryset = self.queryset(client_id, filters)
+        version, last_modified = self._version(queryset)
+        path = self.directory / f'{identity}-{version}.{file_format}'
+        return identity, queryset, path, version, last_modified
+
+    def _build(self, identity, queryset, path, file_format):
+        if path.exists():
+            return
+        # Written beside the target and renamed, so readers never see a partial file
+        fd, temporary = tempfile.mkstemp(dir=path.parent, suffix=f'.{file_format}.tmp')
+        os.close(fd)
+        try:
+            ExcelExporter.export_to_path(queryset, temporary, self.fields, file_format)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+        for stale in path.parent.glob(f'{identity}-*.{file_format}'):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+
+    def _remember(self, identity, client_id, filters, file_format):
+        manifest = self.directory / f'{identity}.json'
+        if manifest.exists():
+            manifest.touch()
+        else:
+            manifest.write_text(json.dumps({'client_id': client_id, 'filters': filters, 'format': file_format}))
+
+    def build(self, client_id, filters, file_format='xlsx'):
+        """Path of the current export, built now if needed, e.g. ahead of the download"""
+        identity, queryset, path, _, _ = self._locate(client_id, filters, file_format)
+        self._build(identity, queryset, path, file_format)
+        self._remember(identity, client_id, filters, file_format)
+        return path
+
+    def response(self, request, client_id, filters, file_format, filename):
+        """
+        The export as a download, or 304 Not Modified when the client's
+        If-None-Match/If-Modified-Since still match. A 304 never builds the file.
+        """
+        identity, queryset, path, version, last_modified = self._locate(client_id, filters, file_format)
+        self._remember(identity, client_id, filters, file_format)
+        etag = f'"{version}"'
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            self._build(identity, queryset, path, file_format)
+            response = FileResponse(
+                open(path, 'rb'), as_attachment=True, filename=f'{filename}.{file_format}',
+                content_type=ExcelExporter.CONTENT_TYPES[file_format],
+            )
+        response.headers['ETag'] = etag
+        if timestamp is not None:
+            response.headers['Last-Modified'] = http_date(timestamp)
+        # Tenant data: browsers may keep it but must revalidate every time
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def refresh(self, client_ids=None):
+        """
+        Rebuild the exports downloaded in the last ``keep_days`` that cover
+        ``client_ids`` (all when None; all-tenant exports always), and
+        delete the older ones with their files.
+        """
+        cutoff = time.time() - self.keep_days * 86400
+        rebuilt = 0
+        for manifest in self.directory.glob('*.json'):
+            identity = manifest.stem
+            if manifest.stat().st_mtime < cutoff:
+                for stale in manifest.parent.glob(f'{identity}-*'):
+                    stale.unlink(missing_ok=True)
+                manifest.unlink(missing_ok=True)
+                continue
+            spec = json.loads(manifest.read_text())
+            if client_ids is not None and spec['client_id'] is not None and spec['client_id'] not in client_ids:
+                continue
+            _, queryset, path, _, _ = self._locate(spec['client_id'], spec['filters'], spec['format'])
+            if not path.exists():
+                self._build(identity, queryset, path, spec['format'])
+                rebuilt += 1
+        return rebuilt
+
+    def schedule_refresh(self, client_id=None):
+        """
+        Queue refresh() of ``client_id``'s exports (None: every tenant's) on
+        a background thread. Calls within ``refresh_delay`` seconds share one
+        rebuild, so bulk changes do not rebuild once per row.
+        """
+        if not getattr(settings, 'REPORT_CACHE_BACKGROUND_REFRESH', True):
+            return
+        with self._lock:
+            self._pending.add(client_id)
+            if self._worker is not None:
+                return
+            self._worker = threading.Thread(
+                target=self._refresh_pending, name=f'report-refresh-{self.name}', daemon=True
+            )
+            self._worker.start()
+
+    def _refresh_pending(self):
+        try:
+            while True:
+                time.sleep(self.refresh_delay)
+                with self._lock:
+                    pending, self._pending = self._pending, set()
+                    if not pending:
+                        self._worker = None
+                        return
+                try:
+                    self.refresh(None if None in pending else pending)
+                except Exception:
+                    logger.exception('Refreshing the %s report cache failed', self.name)
+        finally:
+            connections.close_all()
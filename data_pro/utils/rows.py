@@ -0,0 +1,129 @@
+import json
+from datetime import date
+from decimal import Decimal
+from functools import lru_cache
+
+from django.db import models
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Coalesce, Concat
+from django.http import HttpResponse
+from django.urls import get_script_prefix, reverse
+from django.utils.translation import get_language
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_PK_PLACEHOLDER = 918273645
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def dumps(data):
+    """
+    Serialize ``data`` to JSON bytes, with orjson when it is installed.
+    Dates become ISO strings and decimals strings, as with DjangoJSONEncoder.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=_default)
+    return json.dumps(data, default=_default, separators=(',', ':')).encode()
+
+
+def json_response(data, status=200):
+    return HttpResponse(dumps(data), content_type='application/json', status=status)
+
+
+@lru_cache(maxsize=None)
+def _url_template(viewname, script_prefix):
+    url = reverse(viewname, kwargs={'pk': _PK_PLACEHOLDER})
+    prefix, suffix = url.split(str(_PK_PLACEHOLDER))
+    return prefix, suffix
+
+
+def url_template(viewname):
+    """``(prefix, suffix)`` around the pk of ``viewname``'s URL, so per-row URLs need no reverse()"""
+    return _url_template(viewname, get_script_prefix())
+
+
+@lru_cache(maxsize=None)
+def _choice_labels(field, language):
+    return {value: str(label) for value, label in field.flatchoices}
+
+
+def customer_display_name(path='customer'):
+    """Expression for Customer.name across ``path``, for values() rows"""
+    prefix = f'{path}__' if path else ''
+    return Case(
+        When(**{f'{prefix}customer_type': 'individual'}, then=Concat(
+            Coalesce(F(f'{prefix}first_name'), Value('')), Value(' '),
+            Coalesce(F(f'{prefix}last_name'), Value('')),
+        )),
+        default=Coalesce(F(f'{prefix}organization_name'), Value('')),
+        output_field=models.CharField(),
+    )
+
+
+class RowSerializer:
+    """
+    Turns a list page into JSON-ready dicts without model instances.
+
+    ``values()`` fetches only ``columns`` (model fields) and ``annotations``
+    (``{key: expression}``), plus ``id``. When serializing, fields in
+    ``display`` become their choice labels; dates and decimals are left
+    for dumps() to encode. ``actions`` is a sequence of
+    ``(viewname, button class, icon)`` rendered as action links from
+    precomputed URL templates.
+    """
+    def __init__(self, model, columns, display=(), annotations=None, actions=()):
+        self.model = model
+        self.columns = tuple(columns)
+        self.display = tuple(display)
+        self.annotations = annotations or {}
+        self.actions = tuple(actions)
+
+    def values(self, queryset):
+        """``queryset`` as the values() rows this serializer reads"""
+        names = dict.fromkeys(('id',) + self.columns)
+        return queryset.values(*names, **{f'_row_{key}': expression for key, expression in self.annotations.items()})
+
+    def _actions_parts(self):
+        """The action links' HTML split around the pk, to be joined with each row's pk"""
+        links = []
+        for viewname, button, icon in self.actions:
+            prefix, suffix = url_template(viewname)
+            links.append((prefix, f'{suffix}" class="btn btn-sm {button}"><i class="bi {icon}"></i></a>'))
+        parts = ['']
+        for prefix, rest in links:
+            parts[-1] += f'{" " if len(parts) > 1 else ""}<a href="{prefix}'
+            parts.append(rest)
+        return parts
+
+    def serialize(self, rows):
+        language = get_language()
+        labels = [
+            (name, _choice_labels(self.model._meta.get_field(name), language))
+            for name in self.display
+        ]
+        plain = [name for name in self.columns if name not in self.display]
+        annotations = [(key, f'_row_{key}') for key in self.annotations]
+        actions = self._actions_parts() if self.actions else None
+
+        data = []
+        for row in rows:
+            item = {name: row[name] for name in plain}
+            for name, choices in labels:
+                value = row[name]
+                item[name] = choices.get(value, value)
+            for key, alias in annotations:
+                item[key] = row[alias]
+            if actions is not None:
+                item['actions'] = str(row['id']).join(actions)
+            data.append(item)
+        return data
@@ -0,0 +1,146 @@
+import sqlite3
+
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from data_pro.models.customers import Customer
+from data_pro.models.passports import Passport
+from data_pro.models.visas import Visa
+
+# Columns matched by the list view search box, per model
+SEARCH_FIELDS = {
+    Customer: ('first_name', 'last_name', 'organization_name', 'email', 'phone'),
+    Visa: ('visa_number',),
+    Passport: ('passport_number', 'issuing_country'),
+}
+
+# Foreign keys whose target matching the term also matches the row,
+# e.g. a visa is found by its customer's name
+SEARCH_RELATED = {
+    Visa: ('customer',),
+    Passport: ('customer',),
+}
+
+
+class LikeSearchBackend:
+    """
+    OR'ed ``icontains`` over the search fields.
+
+    On PostgreSQL the 0006 migration adds pg_trgm GIN indexes on
+    ``UPPER(column)``, which is exactly what ``icontains`` compiles to, so
+    these lookups become bitmap index scans instead of sequential scans.
+    """
+    def matches(self, model, word):
+        condition = Q()
+        for field in SEARCH_FIELDS[model]:
+            condition |= Q(**{f'{field}__icontains': word})
+        return condition
+
+
+class SQLiteFTSSearchBackend(LikeSearchBackend):
+    """
+    Matches against the FTS5 trigram tables that mirror each searched table.
+
+    Trigram matching needs at least three characters, so shorter words
+    fall back to ``icontains``.
+    """
+    min_length = 3
+
+    def __init__(self, using='default'):
+        self.using = using
+        self._tables = None
+
+    @property
+    def connection(self):
+        return connections[self.using]
+
+    @staticmethod
+    def fts_table(model):
+        return f'{model._meta.db_table}_fts'
+
+    def has_index(self, model):
+        if self._tables is None:
+            self._tables = set(self.connection.introspection.table_names())
+        return self.fts_table(model) in self._tables
+
+    def matches(self, model, word):
+        if len(word) < self.min_length or not self.has_index(model):
+            return super().matches(model, word)
+        table = self.fts_table(model)
+        phrase = '"%s"' % word.replace('"', '""')
+        return Q(pk__in=RawSQL(f'SELECT rowid FROM {table} WHERE {table} MATCH %s', [phrase]))
+
+    def install(self):
+        """
+        Create the FTS5 tables and the triggers that keep them in sync.
+        Idempotent; any table missing a trigger (e.g. after a migration
+        rebuilt it) is reindexed from scratch.
+        """
+        with self.connection.cursor() as cursor:
+            for model, fields in SEARCH_FIELDS.items():
+                source, table = model._meta.db_table, self.fts_table(model)
+                columns = ', '.join(fields)
+                new = ', '.join(f'new.{field}' for field in fields)
+                old = ', '.join(f'old.{field}' for field in fields)
+                triggers = [f'{table}_ai', f'{table}_ad', f'{table}_au']
+                cursor.execute(
+                    "SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND name IN (%s, %s, %s)",
+                    triggers
+                )
+                in_sync = cursor.fetchone()[0] == len(triggers)
+
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5("
+                    f"{columns}, content='{source}', content_rowid='id', tokenize='trigram')"
+                )
+                cursor.execute(
+                    f"CREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT ON {source} BEGIN "
+                    f"INSERT INTO {table}(rowid, {columns}) VALUES (new.id, {new}); END"
+                )
+                cursor.execute(
+                    f"CREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE ON {source} BEGIN "
+                    f"INSERT INTO {table}({table}, rowid, {columns}) VALUES ('delete', old.id, {old}); END"
+                )
+                cursor.execute(
+                    f"CREATE TRIGGER IF NOT EXISTS {table}_au AFTER UPDATE ON {source} BEGIN "
+                    f"INSERT INTO {table}({table}, rowid, {columns}) VALUES ('delete', old.id, {old}); "
+                    f"INSERT INTO {table}(rowid, {columns}) VALUES (new.id, {new}); END"
+                )
+                if not in_sync:
+                    cursor.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+        self._tables = None
+
+
+_backends = {}
+
+
+def get_backend(using='default'):
+    """Search backend for a database alias, chosen by its vendor"""
+    if using not in _backends:
+        # The FTS5 trigram tokenizer arrived in SQLite 3.34
+        if connections[using].vendor == 'sqlite' and sqlite3.sqlite_version_info >= (3, 34):
+            _backends[using] = SQLiteFTSSearchBackend(using)
+        else:
+            _backends[using] = LikeSearchBackend()
+    return _backends[using]
+
+
+def search(queryset, term):
+    """
+    Filter ``queryset`` to rows matching every word of ``term`` in one of
+    the model's search fields or in a related model's search fields.
+    """
+    if not term or not term.strip():
+        return queryset
+    model = queryset.model
+    backend = get_backend(queryset.db)
+    for word in term.split():
+        condition = backend.matches(model, word)
+        for field in SEARCH_RELATED.get(model, ()):
+            related = model._meta.get_field(field).related_model
+            condition |= Q(**{
+                f'{field}__in': related.objects.filter(backend.matches(related, word)).values('pk')
+            })
+        queryset = queryset.filter(condition)
+    return queryset
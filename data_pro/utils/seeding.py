@@ -0,0 +1,197 @@
+import random
+from collections import Counter
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+
+from data_pro.models.clients import Client
+from data_pro.models.customers import Customer
+from data_pro.models.invoices import Invoice
+from data_pro.models.passports import Passport, PassportExtension
+from data_pro.models.transports import Transport, TransportService
+from data_pro.models.vehicles import Vehicle
+from data_pro.models.visas import Visa
+
+FIRST_NAMES = [
+    'James', 'Amina', 'Wei', 'Olga', 'Carlos', 'Priya', 'Kwame', 'Sofia', 'Hiro', 'Fatima',
+    'Liam', 'Chen', 'Ana', 'Omar', 'Grace', 'Ivan', 'Mei', 'Diego', 'Zanele', 'Noah',
+]
+LAST_NAMES = [
+    'Okafor', 'Schmidt', 'Nakamura', 'Haddad', 'Moreau', 'Kowalski', 'Mensah', 'Rossi', 'Iyer',
+    'Lindqvist', 'Silva', 'Nguyen', 'Kariuki', 'Novak', 'Fischer', 'Tanaka', 'Abebe', 'Costa',
+]
+COUNTRIES = ['Kenya', 'Uganda', 'France', 'India', 'China', 'Brazil', 'Nigeria', 'Germany', 'Japan', 'Egypt']
+
+
+def _weighted(rng, weights):
+    """Pick a key of ``{value: weight}``"""
+    return rng.choices(list(weights), list(weights.values()))[0]
+
+
+class BenchmarkDataGenerator:
+    """
+    Generates synthetic tenants and their records with bulk_create.
+
+    Customers are spread over clients with a Zipf-like skew (client ``i``
+    gets weight ``1 / (i + 1) ** skew``), so a few large tenants sit next
+    to a long tail of small ones, as in production. Records are written
+    ``chunk_size`` customers at a time to keep memory flat. ``tag`` keeps
+    the unique columns of separate runs apart. After ``generate()``,
+    ``clients`` holds the new clients, largest tenant first.
+
+    bulk_create skips save() and signals; callers rebuild ClientStats.
+    """
+    chunk_size = 5000
+    batch_size = 1000
+
+    def __init__(self, clients, customers, skew=1.1, seed=0, tag=None, chunk_size=None):
+        self.client_count = clients
+        self.customer_count = customers
+        self.skew = skew
+        self.rng = random.Random(seed)
+        self.tag = tag or timezone.now().strftime('%y%m%d%H%M%S')
+        if chunk_size:
+            self.chunk_size = chunk_size
+        self.counts = Counter()
+        self.today = date.today()
+        self.now = timezone.now()
+
+    def generate(self, progress=None):
+        """Write everything and return the number of rows created per model"""
+        self.clients = clients = self.create_clients()
+        vehicles = self.create_vehicles()
+        weights = [1 / (rank + 1) ** self.skew for rank in range(len(clients))]
+
+        created = 0
+        while created < self.customer_count:
+            size = min(self.chunk_size, self.customer_count - created)
+            owners = self.rng.choices(clients, weights, k=size)
+            self.create_chunk(owners, vehicles, offset=created)
+            created += size
+            if progress:
+                progress(created, dict(self.counts))
+        return dict(self.counts)
+
+    def _bulk(self, model, objs):
+        objs = model.objects.bulk_create(objs, batch_size=self.batch_size)
+        self.counts[model.__name__] += len(objs)
+        return objs
+
+    def _days_ago(self, low, high):
+        return self.today - timedelta(days=self.rng.randint(low, high))
+
+    def create_clients(self):
+        return self._bulk(Client, [
+            Client(
+                name=f'Benchmark {self.tag} {i}',
+                company_name=f'Benchmark {self.tag} Client {i}',
+                contact_person=f'{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}',
+                phone='+100000000',
+                email=f'bench-{self.tag}-{i}@example.com',
+                address_line1='1 Benchmark Road', city='Nairobi', state='Nairobi', postal_code='00100',
+                status=_weighted(self.rng, {'active': 90, 'inactive': 5, 'pending': 4, 'suspended': 1}),
+            )
+            for i in range(self.client_count)
+        ])
+
+    def create_vehicles(self):
+        return self._bulk(Vehicle, [
+            Vehicle(
+                make=self.rng.choice(['Toyota', 'Nissan', 'Isuzu', 'Mercedes']),
+                model=self.rng.choice(['Hiace', 'Urvan', 'NQR', 'Sprinter']),
+                year=self.rng.randint(2010, 2025),
+                license_plate=f'B{self.tag}{i}',
+                vehicle_type=self.rng.choice(['car', 'van', 'bus', 'truck']),
+                capacity=self.rng.choice([4, 7, 14, 33]),
+                status=_weighted(self.rng, {'available': 50, 'in_use': 40, 'maintenance': 10}),
+            )
+            for i in range(max(10, self.customer_count // 50))
+        ])
+
+    def create_chunk(self, owners, vehicles, offset):
+        rng = self.rng
+        customers = []
+        for i, client in enumerate(owners, start=offset):
+            individual = rng.random() < 0.85
+            customers.append(Customer(
+                client=client,
+                customer_type='individual' if individual else 'organization',
+                first_name=rng.choice(FIRST_NAMES) if individual else None,
+                last_name=rng.choice(LAST_NAMES) if individual else None,
+                organization_name=None if individual else f'{rng.choice(LAST_NAMES)} Holdings {i}',
+                email=f'customer-{self.tag}-{i}@example.com' if rng.random() < 0.9 else None,
+                phone=f'+2547{i:08d}',
+                nationality=rng.choice(COUNTRIES),
+                status=_weighted(rng, {'active': 80, 'inactive': 12, 'pending': 8}),
+            ))
+        customers = self._bulk(Customer, customers)
+
+        passports, visas, invoices, transports, services = [], [], [], [], []
+        for customer in customers:
+            key = f'{self.tag}-{customer.pk}'
+            for n in range(_weighted(rng, {0: 10, 1: 85, 2: 5})):
+                issue_date = self._days_ago(0, 3650)
+                passports.append(Passport(
+                    customer=customer, passport_number=f'P{key}-{n}', issuing_country=customer.nationality,
+                    issue_date=issue_date, expiry_date=issue_date + timedelta(days=3650),
+                    status=_weighted(rng, {'valid': 80, 'expired': 10, 'in_process': 8, 'lost': 2}),
+                ))
+            for n in range(_weighted(rng, {0: 30, 1: 35, 2: 20, 3: 10, 5: 5})):
+                issue_date = self._days_ago(0, 1095)
+                duration = rng.choice([30, 90, 180, 365])
+                unit_cost = Decimal(rng.choice([50, 80, 120, 250]))
+                visas.append(Visa(
+                    customer=customer, visa_number=f'V{key}-{n}',
+                    visa_type=rng.choice([choice for choice, _ in Visa.VisaType.choices]),
+                    issuing_country=rng.choice(COUNTRIES), issue_date=issue_date,
+                    expiry_date=issue_date + timedelta(days=duration), duration_days=duration,
+                    unit_cost=unit_cost, service_fee=Decimal('15.00'), total_cost=unit_cost + Decimal('15.00'),
+                    status=_weighted(rng, {'processing': 10, 'approved': 25, 'issued': 25, 'released': 20,
+                                           'rejected': 10, 'expired': 10}),
+                ))
+            for n in range(_weighted(rng, {0: 25, 1: 40, 2: 20, 4: 15})):
+                amount = Decimal(rng.randint(20, 2000))
+                issue_date = self._days_ago(0, 1095)
+                invoices.append(Invoice(
+                    invoice_number=f'I{key}-{n}', client_id=customer.client_id, customer=customer,
+                    issue_date=issue_date, due_date=issue_date + timedelta(days=30),
+                    amount=amount, tax=amount * Decimal('0.16'), total_amount=amount * Decimal('1.16'),
+                    status=_weighted(rng, {'draft': 10, 'sent': 20, 'paid': 65, 'cancelled': 5}),
+                ))
+            if rng.random() < 0.4:
+                for n in range(rng.randint(1, 3)):
+                    pickup = self.now - timedelta(hours=rng.randint(-72, 24 * 365))
+                    transports.append(Transport(
+                        customer=customer, vehicle=rng.choice(vehicles),
+                        pickup_location='Airport', dropoff_location='Downtown',
+                        pickup_time=pickup, dropoff_time=pickup + timedelta(hours=1),
+                        distance=Decimal(rng.randint(5, 60)), fare=Decimal(rng.randint(10, 120)),
+                        status=_weighted(rng, {'pending': 10, 'in_progress': 5, 'completed': 80, 'cancelled': 5}),
+                    ))
+            if rng.random() < 0.2:
+                for n in range(rng.randint(1, 2)):
+                    departure = self.now - timedelta(hours=rng.randint(-72, 24 * 365))
+                    services.append(TransportService(
+                        reference_number=f'T{key}-{n}', customer=customer, client_id=customer.client_id,
+                        vehicle=rng.choice(vehicles), origin='Mombasa', destination='Nairobi',
+                        scheduled_departure=departure, scheduled_arrival=departure + timedelta(hours=8),
+                        distance_km=Decimal('480.00'), estimated_duration_hours=Decimal('8.00'),
+                        base_fare=Decimal(rng.randint(50, 500)),
+                        status=_weighted(rng, {'scheduled': 15, 'in_transit': 5, 'delivered': 70, 'cancelled': 5,
+                                               'on_hold': 5}),
+                    ))
+
+        passports = self._bulk(Passport, passports)
+        self._bulk(Visa, visas)
+        self._bulk(Invoice, invoices)
+        self._bulk(Transport, transports)
+        self._bulk(TransportService, services)
+        self._bulk(PassportExtension, [
+            PassportExtension(
+                passport=passport, duration=rng.choice([1, 3, 6, 12, 24]), cost=Decimal(rng.choice([40, 90, 150])),
+                apply_date=self._days_ago(0, 365),
+                released_date=None if rng.random() < 0.15 else self._days_ago(0, 30),
+            )
+            for passport in passports if rng.random() < 0.3
+        ])
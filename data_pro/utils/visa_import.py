@@ -0,0 +1,285 @@
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+import openpyxl
+import pandas as pd
+from django.db import transaction
+from django.template.loader import render_to_string
+
+from data_pro.models.customers import Customer
+from data_pro.models.visas import Visa
+from data_pro.system import client_stats
+from data_pro.system.metrics import DashboardMetrics
+from data_pro.system.reports import visa_report
+from data_pro.utils.excel_handlers import prepare_visa_frame
+from data_pro.utils.notifications import queue_emails
+
+REQUIRED_COLUMNS = (
+    'visa_number', 'customer_id', 'visa_type', 'issuing_country',
+    'issue_date', 'expiry_date', 'unit_cost',
+)
+OPTIONAL_COLUMNS = (
+    'status', 'service_fee', 'duration_days', 'entry_type',
+    'released_date', 'picked_by', 'notes',
+)
+# Header aliases accepted on top of the field names
+COLUMN_ALIASES = {
+    'customer': 'customer_id',
+    'type': 'visa_type',
+    'country': 'issuing_country',
+}
+
+_CENT = Decimal('0.01')
+
+
+class _DryRun(Exception):
+    pass
+
+
+class VisaImportResult:
+    """Outcome of a visa import, including a per-row error report"""
+    max_reported_errors = 1000
+
+    def __init__(self, dry_run=False):
+        self.dry_run = dry_run
+        self.rows = 0
+        self.created = 0
+        self.error_count = 0
+        self.errors = []
+
+    def add_error(self, row_number, errors):
+        self.error_count += 1
+        if len(self.errors) < self.max_reported_errors:
+            self.errors.append({'row': row_number, 'errors': errors})
+
+    def as_dict(self):
+        return {
+            'rows': self.rows,
+            'created': self.created,
+            'failed': self.error_count,
+            'dry_run': self.dry_run,
+            'errors': self.errors,
+        }
+
+
+def _text(value):
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    value = str(value).strip()
+    return value or None
+
+
+def _money(value):
+    if value is None or value == '':
+        return None
+    try:
+        return Decimal(str(value)).quantize(_CENT)
+    except InvalidOperation:
+        return pd.NA
+
+
+class VisaExcelImporter:
+    """
+    Set-based visa import from an .xlsx workbook.
+
+    The first sheet is streamed with openpyxl in read-only mode,
+    ``batch_size`` rows at a time. Each batch is coerced and validated
+    column by column with pandas; ``total_cost``, ``duration_days`` and
+    the date-driven status that Visa.save() would set are derived the
+    same way. Customer ids are checked with one query per batch (limited
+    to ``client`` when given), and visa numbers against existing rows
+    with one ``IN`` query per batch and against earlier rows of the file.
+    Valid rows are written with bulk_create, and the status emails for
+    them queued in the outbox, batch by batch.
+
+    The whole import is one transaction. Invalid rows are reported and
+    skipped, or with ``strict`` roll back the whole import; ``dry_run``
+    validates everything and rolls back. ``progress``, if given, is
+    called after every batch with ``total_records``, ``processed``,
+    ``successful`` and ``failed`` keyword arguments.
+    """
+    batch_size = 1000
+
+    def __init__(self, client=None, batch_size=None, dry_run=False, strict=False, progress=None):
+        self.client = client
+        if batch_size:
+            self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.strict = strict
+        self.progress = progress
+        self._seen_numbers = {}
+        self._client_ids = set()
+
+    def read(self, file):
+        """``(total rows or None, iterator of (row_number, row dict))``"""
+        workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+        sheet = workbook.worksheets[0]
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if not header:
+            return 0, iter(())
+        columns = []
+        for name in header:
+            name = str(name or '').strip().lower().replace(' ', '_')
+            columns.append(COLUMN_ALIASES.get(name, name))
+        missing = [column for column in REQUIRED_COLUMNS if column not in columns]
+        if missing:
+            raise ValueError(f"Missing column(s): {', '.join(missing)}")
+        total = sheet.max_row - 1 if sheet.max_row else None
+
+        def iterate():
+            for row_number, values in enumerate(rows, start=2):
+                if any(value not in (None, '') for value in values):
+                    yield row_number, dict(zip(columns, values))
+        return total, iterate()
+
+    def import_file(self, file):
+        result = VisaImportResult(self.dry_run)
+        total, rows = self.read(file)
+        try:
+            with transaction.atomic():
+                while True:
+                    batch = list(islice(rows, self.batch_size))
+                    if not batch:
+                        break
+                    self._import_batch(batch, result)
+                    if self.progress:
+                        self.progress(
+                            total_records=total or result.rows, processed=result.rows,
+                            successful=result.created, failed=result.error_count,
+                        )
+                if self.dry_run or (self.strict and result.error_count):
+                    raise _DryRun
+                self._finish()
+        except _DryRun:
+            if not self.dry_run:
+                result.created = 0
+        return result
+
+    def _finish(self):
+        """What the per-row signals would have done"""
+        # bulk_create bypasses the ClientStats, dashboard and report cache signals
+        client_stats.rebuild(self._client_ids)
+        for client_id in self._client_ids:
+            DashboardMetrics.invalidate(client_id)
+            transaction.on_commit(lambda client_id=client_id: visa_report.schedule_refresh(client_id))
+
+    def _frame(self, batch):
+        df = pd.DataFrame([row for _, row in batch], index=[number for number, _ in batch])
+        for column in REQUIRED_COLUMNS + OPTIONAL_COLUMNS:
+            if column not in df:
+                df[column] = None
+        return df.astype(object).where(df.notna(), None)
+
+    def _validate(self, df):
+        """``({row_number: {field: [messages]}}, {pk: customer})`` for the batch, coercing ``df`` in place"""
+        errors = {}
+
+        def fail(mask, field, message):
+            for row_number in mask.index[mask.fillna(False).astype(bool)]:
+                errors.setdefault(row_number, {}).setdefault(field, []).append(message)
+
+        for column in ('visa_number', 'issuing_country', 'visa_type', 'status', 'entry_type', 'picked_by', 'notes'):
+            df[column] = df[column].map(_text)
+        for column in REQUIRED_COLUMNS:
+            fail(df[column].isna(), column, 'This field cannot be blank.')
+
+        fail(df['visa_number'].str.len() > 50, 'visa_number', 'Ensure this value has at most 50 characters.')
+        fail(df['issuing_country'].str.len() > 100, 'issuing_country', 'Ensure this value has at most 100 characters.')
+        df['visa_type'] = df['visa_type'].str.lower()
+        fail(df['visa_type'].notna() & ~df['visa_type'].isin(Visa.VisaType.values), 'visa_type', 'Unknown visa type.')
+        df['status'] = df['status'].str.lower()
+        fail(df['status'].notna() & ~df['status'].isin(Visa.Status.values), 'status', 'Unknown status.')
+        df['entry_type'] = df['entry_type'].fillna('single').str.lower()
+        fail(~df['entry_type'].isin(['single', 'multiple']), 'entry_type', 'Unknown entry type.')
+
+        for column in ('issue_date', 'expiry_date', 'released_date'):
+            dates = pd.to_datetime(df[column], errors='coerce', format='mixed')
+            fail(df[column].notna() & dates.isna(), column, 'Enter a valid date.')
+            df[column] = dates.dt.date.astype(object).where(dates.notna(), None)
+
+        for column in ('unit_cost', 'service_fee'):
+            money = df[column].map(_money)
+            invalid = money.isna() & df[column].notna()
+            fail(invalid, column, 'Enter a number.')
+            money = money.where(~invalid, None)
+            fail(money.map(lambda value: value is not None and value < 0), column, 'Ensure this value is greater than or equal to 0.')
+            df[column] = money
+
+        duration = pd.to_numeric(df['duration_days'], errors='coerce')
+        fail(df['duration_days'].notna() & (duration.isna() | (duration < 0)), 'duration_days', 'Enter a whole number.')
+        derived = pd.Series(
+            [(expiry - issue).days if issue and expiry else None for issue, expiry in zip(df['issue_date'], df['expiry_date'])],
+            index=df.index, dtype=object,
+        )
+        duration = duration.map(lambda days: int(days) if pd.notna(days) else None).astype(object)
+        df['duration_days'] = duration.where(duration.notna(), derived)
+        fail(df['duration_days'].map(lambda days: days is not None and days < 0), 'duration_days',
+             'Expiry date is before the issue date.')
+
+        customer_ids = pd.to_numeric(df['customer_id'], errors='coerce')
+        df['customer_id'] = customer_ids.astype(object).where(customer_ids.notna(), None)
+        customers = Customer.objects.filter(pk__in=set(customer_ids.dropna().astype(int)))
+        if self.client is not None:
+            customers = customers.filter(client=self.client)
+        customers = customers.only('id', 'client_id', 'email', 'customer_type', 'first_name', 'last_name', 'organization_name').in_bulk()
+        df['customer_id'] = df['customer_id'].map(lambda pk: int(pk) if pk is not None else None)
+        fail(df['customer_id'].notna() & ~df['customer_id'].isin(list(customers)), 'customer_id', 'Unknown customer.')
+
+        # Numbers seen earlier in the file belong to rows this import inserts
+        numbers = set(df['visa_number'].dropna()) - self._seen_numbers.keys()
+        existing = set(Visa.objects.filter(visa_number__in=numbers).values_list('visa_number', flat=True))
+        fail(df['visa_number'].isin(existing), 'visa_number', 'Visa with this Visa Number already exists.')
+        for row_number, number in df['visa_number'].items():
+            if number is None or number in existing:
+                continue
+            first = self._seen_numbers.get(number)
+            if first is not None:
+                errors.setdefault(row_number, {}).setdefault('visa_number', []).append(
+                    f'Duplicate of row {first}.'
+                )
+            elif row_number not in errors:
+                # Only rows that get inserted claim their number; a rejected
+                # row must not make a later valid row a duplicate
+                self._seen_numbers[number] = row_number
+        return errors, customers
+
+    def _import_batch(self, batch, result):
+        df = self._frame(batch)
+        errors, customers = self._validate(df)
+        result.rows += len(df)
+        for row_number in sorted(errors):
+            result.add_error(row_number, errors[row_number])
+
+        df = df.drop(index=list(errors))
+        if df.empty:
+            return
+        df = df.astype(object).where(df.notna(), None)
+        df = prepare_visa_frame(df)
+
+        fields = [column for column in REQUIRED_COLUMNS + OPTIONAL_COLUMNS if column != 'customer_id']
+        visas = []
+        for row in df.to_dict('records'):
+            values = {field: row[field] for field in fields if row[field] is not None}
+            visa = Visa(customer=customers[row['customer_id']], total_cost=row['total_cost'], **values)
+            visas.append(visa)
+        Visa.objects.bulk_create(visas, batch_size=self.batch_size)
+        result.created += len(visas)
+
+        self._client_ids.update(visa.customer.client_id for visa in visas)
+        if not self.dry_run:
+            self._queue_notifications(visas)
+
+    def _queue_notifications(self, visas):
+        """The status emails of visa_post_save, queued per batch in the import's transaction"""
+        queue_emails(
+            (
+                f'Visa Application Update: {visa.get_status_display()}',
+                render_to_string('emails/visa_status_update.txt', {'visa': visa}),
+                [visa.customer.email],
+            )
+            for visa in visas
+            if visa.status in (Visa.Status.APPROVED, Visa.Status.REJECTED) and visa.customer.email
+        )
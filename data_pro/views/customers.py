@@ -8,19 +8,22 @@ from django.contrib import messages
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from django.http import HttpResponse, HttpResponseRedirect
-from django.db.models import Q
-import csv
-import io
 
 from data_pro.models.customers import Customer
 from data_pro.models.clients import Client
 from data_pro.forms.customers import CustomerForm
+from data_pro.system.jobs import enqueue
+from data_pro.views.jobs import job_response
+from data_pro.utils.search import search
+from data_pro.system.reports import CUSTOMER_EXPORT_COLUMNS
+from data_pro.utils.csv_handlers import StreamingCSVExporter, wants_gzip
 
 class CustomerListView(LoginRequiredMixin, ListView):
     model = Customer
     template_name = 'admin/customers/list.html'
     context_object_name = 'customers'
     paginate_by = 25
+    query_budget = 8
 
 
     def get_queryset(self):
@@ -31,12 +34,7 @@ class CustomerListView(LoginRequiredMixin, ListView):
         # Search functionality
         search_query = self.request.GET.get('search')
         if search_query:
-            queryset = queryset.filter(
-                Q(first_name__icontains=search_query) |
-                Q(last_name__icontains=search_query) |
-                Q(email__icontains=search_query) |
-                Q(phone__icontains=search_query)
-            )
+            queryset = search(queryset, search_query)
         
         return queryset.select_related('client')
 
@@ -107,55 +105,33 @@ class CustomerImportView(LoginRequiredMixin, View):
             if not csv_file.name.endswith('.csv'):
                 return JsonResponse({'error': 'File must be a CSV'}, status=400)
             
-            data_set = csv_file.read().decode('UTF-8')
-            io_string = io.StringIO(data_set)
-            reader = csv.DictReader(io_string)
-            
-            for row in reader:
-                Customer.objects.create(
-                    first_name=row.get('first_name', ''),
-                    last_name=row.get('last_name', ''),
-                    email=row.get('email', ''),
-                    phone=row.get('phone', ''),
-                    client=request.user.client if not request.user.is_superuser else Client.objects.get(id=row.get('client_id')),
-                    status=row.get('status', 'active'),
-                    created_by=request.user
-                )
-            
-            return JsonResponse({'message': 'Customers imported successfully'}, status=200)
+            job = enqueue(
+                'customer_import', request.user, csv_file,
+                client_id=None if request.user.is_superuser else request.user.client.pk,
+                batch_size=int(request.POST.get('batch_size') or 0) or None,
+            )
+            return job_response(job, 'Customer import')
         
         except Exception as e:
             return JsonResponse({'error': str(e)}, status=500)
 
 class CustomerExportView(LoginRequiredMixin, View):
+    query_budget = 8
+    columns = CUSTOMER_EXPORT_COLUMNS['list']
+
     def get(self, request, *args, **kwargs):
         try:
-            response = HttpResponse(content_type='text/csv')
-            response['Content-Disposition'] = 'attachment; filename="customers_export.csv"'
-            
-            writer = csv.writer(response)
-            writer.writerow([
-                'ID', 'First Name', 'Last Name', 'Email', 'Phone', 
-                'Status', 'Client', 'Created At'
-            ])
-            
-            queryset = Customer.objects.all()
-            if not request.user.is_superuser:
-                queryset = queryset.filter(client=request.user.client)
-            
-            for customer in queryset:
-                writer.writerow([
-                    customer.id,
-                    customer.first_name,
-                    customer.last_name,
-                    customer.email,
-                    customer.phone,
-                    customer.get_status_display(),
-                    customer.client.name if customer.client else '',
-                    customer.created_at.strftime('%Y-%m-%d %H:%M:%S')
-                ])
-            
-            return response
+            filters = {} if request.user.is_superuser else {'client_id': request.user.client.pk}
+            if request.GET.get('background'):
+                job = enqueue(
+                    'customer_export', request.user, columns='list', filters=filters,
+                    filename='customers_export.csv', gzip=wants_gzip(request),
+                )
+                return job_response(job, 'Customer export')
+
+            queryset = Customer.objects.filter(**filters)
+            exporter = StreamingCSVExporter(queryset, self.columns)
+            return exporter.response('customers_export.csv', compress=wants_gzip(request))
         
         except Exception as e:
             return JsonResponse({'error': str(e)}, status=500)
@@ -0,0 +1,62 @@
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import FileResponse, Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views import View
+
+from data_pro.models.jobs import BackgroundJob
+from data_pro.system.jobs import cancel, job_payload
+
+
+def job_message(job, label):
+    """``label`` ('Visa import') with what happened to the job: queued, or how an eager run ended"""
+    if not job.finished:
+        return f'{label} queued as job #{job.pk}.'
+    message = f'{label} {job.get_status_display().lower()}'
+    result = job.result or {}
+    counts = ', '.join(f'{result[name]} {name}' for name in ('created', 'updated', 'failed') if name in result)
+    return f'{message}: {counts}.' if counts else f'{message}.'
+
+
+def job_response(job, label=None):
+    """202 Accepted with the job's state and polling URL; 200 once an eager job has finished"""
+    payload = job_payload(job)
+    if label:
+        payload['message'] = job_message(job, label)
+    return JsonResponse(payload, status=200 if job.finished else 202)
+
+
+
+class JobAccessMixin(LoginRequiredMixin):
+    """Jobs are visible to the user who started them and to superusers"""
+    def get_job(self, pk):
+        queryset = BackgroundJob.objects.all()
+        if not self.request.user.is_superuser:
+            queryset = queryset.filter(initiated_by=self.request.user)
+        return get_object_or_404(queryset, pk=pk)
+
+
+class JobStatusView(JobAccessMixin, View):
+    query_budget = 4
+
+    def get(self, request, pk, *args, **kwargs):
+        return JsonResponse(job_payload(self.get_job(pk)))
+
+
+class JobCancelView(JobAccessMixin, View):
+    def post(self, request, pk, *args, **kwargs):
+        job = self.get_job(pk)
+        if job.finished:
+            return JsonResponse({'error': 'Job has already finished', **job_payload(job)}, status=409)
+        return JsonResponse(job_payload(cancel(job)))
+
+
+class JobDownloadView(JobAccessMixin, View):
+    """The file an export job wrote"""
+    def get(self, request, pk, *args, **kwargs):
+        job = self.get_job(pk)
+        if not job.output_file:
+            raise Http404('Job has no output file')
+        return FileResponse(
+            job.output_file.open('rb'), as_attachment=True,
+            filename=job.output_file.name.rsplit('/', 1)[-1],
+        )
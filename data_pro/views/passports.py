@@ -6,20 +6,31 @@ from django.urls import reverse_lazy
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib import messages
 from django.utils.translation import gettext_lazy as _
-from django.http import JsonResponse
-from django.db.models import Q
 from django.utils import timezone
 
 from data_pro.models.passports import *
 from data_pro.forms.passports import *
 from data_pro.models.customers import *
+from data_pro.utils.search import search
+from data_pro.mixins.pagination import KeysetPaginationMixin
+from data_pro.mixins.rows import JSONRowsMixin
+from data_pro.utils.rows import RowSerializer, customer_display_name
 
 
-class PassportListView(ListView):
+class PassportListView(JSONRowsMixin, KeysetPaginationMixin, ListView):
     model = Passport
     paginate_by = 20
     template_name = 'admin/passports/list.html'
     context_object_name = 'passports'
+    keyset_ordering = ('-issue_date', 'id')
+    query_budget = 8
+    rows_key = 'passports'
+    row_serializer = RowSerializer(
+        Passport,
+        columns=('id', 'passport_number', 'issue_date', 'expiry_date', 'issuing_country', 'status'),
+        annotations={'customer': customer_display_name()},
+        actions=(('data_pro:passport-update', 'btn-warning', 'bi-pencil'),),
+    )
 
     def get_queryset(self):
         queryset = super().get_queryset().select_related('customer')
@@ -27,11 +38,7 @@ class PassportListView(ListView):
         # Search functionality
         search_query = self.request.GET.get('search')
         if search_query:
-            queryset = queryset.filter(
-                Q(passport_number__icontains=search_query) |
-                Q(customer__first_name__icontains=search_query) |
-                Q(customer__last_name__icontains=search_query) |
-                Q(issuing_country__icontains=search_query))
+            queryset = search(queryset, search_query)
         
         # Status filter
         status_filter = self.request.GET.get('status')
@@ -49,33 +56,11 @@ class PassportListView(ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['total_passports'] = self.get_queryset().count()
+        # Reuse the paginator's count rather than running COUNT(*) again
+        paginator = context.get('paginator')
+        context['total_passports'] = paginator.count if paginator else None
         return context
 
-    def render_to_response(self, context, **response_kwargs):
-        if self.request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-            passports = context['object_list']
-            data = [{
-                'id': passport.id,
-                'passport_number': passport.passport_number,
-                'customer': str(passport.customer),
-                'issue_date': passport.issue_date.strftime('%Y-%m-%d') if passport.issue_date else None,
-                'expiry_date': passport.expiry_date.strftime('%Y-%m-%d') if passport.expiry_date else None,
-                'issuing_country': passport.issuing_country,
-                'service_cost_usd': str(passport.service_cost_usd),
-                'status': passport.status,
-                'actions': f'<a href="{reverse_lazy("data_pro:passport-update", kwargs={"pk": passport.id})}" class="btn btn-sm btn-warning"><i class="bi bi-pencil"></i></a> '
-                          f'<a href="{reverse_lazy("data_pro:passport-detail", kwargs={"pk": passport.id})}" class="btn btn-sm btn-info"><i class="bi bi-eye"></i></a>'
-            } for passport in passports]
-            
-            return JsonResponse({
-                'passports': data,
-                'count': context['paginator'].count,
-                'page': context['page_obj'].number,
-                'total_pages': context['paginator'].num_pages
-            })
-        return super().render_to_response(context, **response_kwargs)
-
 
 class PassportExtensionListView(LoginRequiredMixin, ListView):
     model = PassportExtension
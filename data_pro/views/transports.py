@@ -7,6 +7,8 @@ from django.views.generic import View
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.db import transaction
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -186,6 +188,8 @@ class TransportListView(LoginRequiredMixin, ListView):
     context_object_name = 'transports'
     paginate_by = 10
 
+# Transport.clean() locks the booked vehicle, so double-booking checks of it run one at a time
+@method_decorator(transaction.atomic, name='post')
 class TransportCreateView(LoginRequiredMixin, CreateView):
     model = Transport
     form_class = TransportForm
@@ -197,6 +201,7 @@ class TransportDetailView(LoginRequiredMixin, DetailView):
     template_name = 'admin/transports/detail.html'
     context_object_name = 'transport'
 
+@method_decorator(transaction.atomic, name='post')
 class TransportUpdateView(LoginRequiredMixin, UpdateView):
     model = Transport
     form_class = TransportForm
@@ -3,79 +3,50 @@ from django.views.generic import (
     DetailView, DeleteView
 )
 from django.urls import reverse_lazy
+from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib import messages
 from django.utils.translation import gettext_lazy as _
 from django.http import JsonResponse, HttpResponse
-from django.db.models import Q
-from django.utils import timezone
 
 from data_pro.models.visas import Visa
 from data_pro.forms.visas import VisaForm
+from data_pro.utils.excel_handlers import ExcelExporter
+from data_pro.middleware.queries import query_budget
+from data_pro.mixins.pagination import KeysetPaginationMixin
+from data_pro.mixins.rows import JSONRowsMixin
+from data_pro.system.jobs import enqueue
+from data_pro.system.reports import filter_visas, visa_report
+from data_pro.utils.rows import RowSerializer, customer_display_name
+from data_pro.views.jobs import job_message, job_response
 import pandas as pd
 from io import BytesIO
 from django.shortcuts import redirect
 
-class VisaListView(LoginRequiredMixin, ListView):
+class VisaListView(LoginRequiredMixin, JSONRowsMixin, KeysetPaginationMixin, ListView):
     model = Visa
     template_name = 'admin/visas/list.html'
     paginate_by = 20
     context_object_name = 'visas'
+    keyset_ordering = ('-issue_date', 'id')
+    query_budget = 8
+    rows_key = 'visas'
+    row_serializer = RowSerializer(
+        Visa,
+        columns=('id', 'visa_number', 'visa_type', 'issue_date', 'expiry_date', 'unit_cost', 'status'),
+        display=('visa_type', 'status'),
+        annotations={'customer': customer_display_name()},
+        actions=(
+            ('data_pro:visa-update', 'btn-warning', 'bi-pencil'),
+            ('data_pro:visa-detail', 'btn-info', 'bi-eye'),
+        ),
+    )
 
     def get_queryset(self):
         queryset = super().get_queryset().select_related('customer')
-        
-        # Search functionality
-        search_query = self.request.GET.get('search')
-        if search_query:
-            queryset = queryset.filter(
-                Q(visa_number__icontains=search_query) |
-                Q(customer__first_name__icontains=search_query) |
-                Q(customer__last_name__icontains=search_query)
-            )
-        
-        # Status filter
-        status_filter = self.request.GET.get('status')
-        if status_filter:
-            queryset = queryset.filter(status=status_filter)
-        
-        # Date range filter
-        start_date = self.request.GET.get('start_date')
-        end_date = self.request.GET.get('end_date')
-        if start_date and end_date:
-            try:
-                start_date = timezone.datetime.strptime(start_date, '%Y-%m-%d').date()
-                end_date = timezone.datetime.strptime(end_date, '%Y-%m-%d').date()
-                queryset = queryset.filter(issue_date__range=[start_date, end_date])
-            except ValueError:
-                pass
-        
+        queryset = filter_visas(queryset, self.request.GET)
         return queryset.order_by('-issue_date')
 
-    def render_to_response(self, context, **response_kwargs):
-        if self.request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-            visas = context['object_list']
-            data = [{
-                'id': visa.id,
-                'visa_number': visa.visa_number,
-                'customer': str(visa.customer),
-                'visa_type': visa.get_visa_type_display(),
-                'issue_date': visa.issue_date.strftime('%Y-%m-%d') if visa.issue_date else None,
-                'expiry_date': visa.expiry_date.strftime('%Y-%m-%d') if visa.expiry_date else None,
-                'unit_cost': str(visa.unit_cost),
-                'status': visa.get_status_display(),
-                'actions': f'<a href="{reverse_lazy("data_pro:visa-update", kwargs={"pk": visa.id})}" class="btn btn-sm btn-warning"><i class="bi bi-pencil"></i></a> '
-                          f'<a href="{reverse_lazy("data_pro:visa-detail", kwargs={"pk": visa.id})}" class="btn btn-sm btn-info"><i class="bi bi-eye"></i></a>'
-            } for visa in visas]
-            
-            return JsonResponse({
-                'visas': data,
-                'count': context['paginator'].count,
-                'page': context['page_obj'].number,
-                'total_pages': context['paginator'].num_pages
-            })
-        return super().render_to_response(context, **response_kwargs)
-
 class VisaCreateView(LoginRequiredMixin, CreateView):
     model = Visa
     form_class = VisaForm
@@ -150,32 +121,19 @@ class VisaDeleteView(LoginRequiredMixin, DeleteView):
             })
         return response
 
+@login_required
+@query_budget(8)
 def visa_export(request):
-    queryset = Visa.objects.all().select_related('customer')
-    df = pd.DataFrame(list(queryset.values(
-        'visa_number',
-        'customer__first_name',
-        'customer__last_name',
-        'visa_type',
-        'issue_date',
-        'expiry_date',
-        'unit_cost',
-        'status',
-        'notes'
-    )))
-    
-    output = BytesIO()
-    writer = pd.ExcelWriter(output, engine='xlsxwriter')
-    df.to_excel(writer, sheet_name='Visas', index=False)
-    writer.close()
-    output.seek(0)
-    
-    response = HttpResponse(
-        output.getvalue(),
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    )
-    response['Content-Disposition'] = 'attachment; filename=visas_export.xlsx'
-    return response
+    file_format = request.GET.get('format', 'xlsx')
+    if file_format not in ExcelExporter.CONTENT_TYPES:
+        return HttpResponse(f'Unsupported export format: {file_format}', status=400)
+
+    client_id = None if request.user.is_superuser else request.user.client.pk
+    filters = visa_report.clean_filters(request.GET)
+    if request.GET.get('background'):
+        job = enqueue('visa_export', request.user, client_id=client_id, filters=filters, format=file_format)
+        return job_response(job, 'Visa export')
+    return visa_report.response(request, client_id, filters, file_format, 'visas_export')
 
 def visa_template(request):
     # Create template DataFrame with required columns
@@ -183,9 +141,11 @@ def visa_template(request):
         'visa_number',
         'customer_id',
         'visa_type',
+        'issuing_country',
         'issue_date',
         'expiry_date',
         'unit_cost',
+        'service_fee',
         'status',
         'notes'
     ])
@@ -205,31 +165,28 @@ def visa_template(request):
 
 
 
+@login_required
 def visa_import(request):
     if request.method == 'POST':
         try:
-            excel_file = request.FILES['excel_file']
-            df = pd.read_excel(excel_file)
-            
-            # Process and validate the imported data
-            for index, row in df.iterrows():
-                Visa.objects.create(
-                    visa_number=row['visa_number'],
-                    customer_id=row['customer_id'],
-                    visa_type=row['visa_type'],
-                    issuing_country=row['issuing_country'],
-                    issue_date=row['issue_date'],
-                    expiry_date=row['expiry_date'],
-                    status=row.get('status', 'processing'),
-                    unit_cost=row['unit_cost'],
-                    service_fee=row.get('service_fee', 0),
-                )
-            
-            messages.success(request, 'Visas imported successfully!')
-            return redirect('data_pro:visa-list')
-            
+            job = enqueue(
+                'visa_import', request.user, request.FILES['excel_file'],
+                client_id=None if request.user.is_superuser else request.user.client.pk,
+                dry_run=bool(request.POST.get('dry_run')),
+                strict=bool(request.POST.get('strict')),
+            )
         except Exception as e:
+            if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+                return JsonResponse({'error': f'Error importing visas: {e}'}, status=400)
             messages.error(request, f'Error importing visas: {str(e)}')
             return redirect('data_pro:visa-list')
-    
-    return redirect('data_pro:visa-list')
\ No newline at end of file
+
+        if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+            return job_response(job, 'Visa import')
+        if job.status == job.StatusChoices.FAILED:
+            messages.error(request, job_message(job, 'Visa import'))
+        else:
+            messages.success(request, job_message(job, 'Visa import'))
+        return redirect('data_pro:visa-list')
+
+    return redirect('data_pro:visa-list')
@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'datapro.settings')
 
 application = get_asgi_application()
+
+# Load the system configuration before the first request
+from data_pro.system.config import warm  # noqa: E402
+
+warm()
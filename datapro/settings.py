@@ -31,11 +31,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'data_pro.middleware.config.SystemConfigMiddleware',
+    'data_pro.middleware.queries.QueryInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'data_pro.middleware.maintenance.MaintenanceMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -71,6 +74,25 @@ DATABASES = {
     }
 }
 
+# Cache shared by every process, so the version counters that invalidate
+# per-process state (dashboard metrics, vehicle schedule) reach all workers.
+# Redis when REDIS_URL is set; otherwise a table that migrate creates.
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'data_pro_cache',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }
+
 CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap5"
 CRISPY_TEMPLATE_PACK = "bootstrap5"
 
@@ -123,6 +145,44 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 20
 }
 
+# Query instrumentation (data_pro.middleware.queries)
+QUERY_TIMING_HEADER = DEBUG
+QUERY_DUPLICATE_THRESHOLD = 5
+# Raise QueryBudgetExceeded when a view runs more queries than its query_budget
+QUERY_BUDGET_ENFORCE = False
+
+# Cached export files (data_pro.utils.report_cache)
+REPORT_CACHE_DIR = BASE_DIR / 'cache' / 'reports'
+# Rebuild recently downloaded exports in a background thread when their rows change
+REPORT_CACHE_BACKGROUND_REFRESH = True
+
+# Background jobs (data_pro.system.jobs), run by the run_workers command
+# (python manage.py run_workers --loop --processes N, beside the web server).
+# When eager, enqueued jobs run inside the request instead, e.g. without workers;
+# uploads up to BACKGROUND_JOBS_INLINE_MAX_BYTES always do.
+BACKGROUND_JOBS_EAGER = False
+BACKGROUND_JOBS_INLINE_MAX_BYTES = 1024 * 1024
+
+# Billing runs (data_pro.system.billing)
+BILLING_TAX_RATE = '0.16'
+BILLING_PAYMENT_TERMS_DAYS = 30
+
+# Default formats of the generated document numbers (data_pro.system.sequences),
+# overridable per client on its Sequence rows
+SEQUENCE_FORMATS = {
+    'invoice': 'INV-{client}-{number:06d}',
+    'transport_reference': 'TS-{client}-{number:06d}',
+    'tracking_code': 'TRK{client:03d}{number:07d}',
+}
+
+# Keys of SystemConfiguration each process keeps cached (data_pro.system.config)
+SYSTEM_CONFIG_CACHE_SIZE = 1024
+
+# Maintenance windows (data_pro.middleware.maintenance): refuse only writes, or
+# every request, except from superusers and under these path prefixes
+MAINTENANCE_READ_ONLY = True
+MAINTENANCE_EXEMPT_PATHS = ('/system-admin/', '/auth/')
+
 # Internationalization
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
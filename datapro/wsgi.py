@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'datapro.settings')
 
 application = get_wsgi_application()
+
+# Load the system configuration before the first request
+from data_pro.system.config import warm  # noqa: E402
+
+warm()
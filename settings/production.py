@@ -17,4 +17,23 @@ DATABASES = {
 }
 
 STATIC_URL = '/static/'
-STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
\ No newline at end of file
+STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+
+# Cache shared by every process, so the version counters that invalidate
+# per-process state (dashboard metrics, vehicle schedule) reach all workers.
+# Redis when REDIS_URL is set; otherwise a table that migrate creates.
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'data_pro_cache',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }